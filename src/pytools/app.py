@@ -1,9 +1,16 @@
-from textual.app import App, ComposeResult
+import functools
+
+from textual.app import App, ComposeResult, UnknownModeError
+from textual.screen import Screen
 from textual.theme import Theme
 
+from pytools.config.manager import ConfigError, ConfigUpdate, get_config
 from pytools.config.settings import settings
 from pytools.screens.main import MainScreen
 from pytools.screens.settings import SettingsScreen
+from pytools.services.data import DataService
+from pytools.services.plugins import get_registry
+from pytools.utils.tracing import tracer
 
 
 class ToolsApp(App):
@@ -22,6 +29,23 @@ class ToolsApp(App):
         # self.dark = settings.ui.theme == "dark"
         super().__init__()
         self.settings = settings
+        self.config_manager = get_config()
+        self.data_service = DataService()
+        self.pending_switch: tuple[str, float] | None = None
+        tracer.enabled = settings.ui.show_debug
+        # Plugin screens are imported when their mode is first entered;
+        # screens from module plugins are added then too, see switch_mode
+        for name in get_registry().names("screen"):
+            if name not in self.MODES:
+                self.add_mode(name, functools.partial(self._plugin_screen, name))
+
+    @staticmethod
+    def _plugin_screen(name: str) -> Screen:
+        """Instantiate a plugin screen"""
+        screen_class = get_registry().get("screen", name)
+        if screen_class is None:
+            raise RuntimeError(f"Screen plugin {name!r} failed to load")
+        return screen_class()
 
     def compose(self) -> ComposeResult:
         """Compose the application"""
@@ -30,6 +54,44 @@ class ToolsApp(App):
     def on_mount(self) -> None:
         """Called when the app is mounted"""
         self.switch_mode(settings.ui.default_screen)
+        self.config_manager.subscribe(self._apply_config)
+        reload = settings.reload
+        if reload.watch and self.config_manager.loaded:
+            self.set_interval(reload.interval, self.check_config)
+
+    def check_config(self) -> None:
+        """Publish edits to the config files made since the last check"""
+        try:
+            self.config_manager.check()
+        except ConfigError as e:
+            self.notify(str(e), title="Configuration", severity="error", timeout=10)
+
+    def _apply_config(self, update: ConfigUpdate) -> None:
+        self.settings = update.settings
+        if update.changed("ui", "show_debug"):
+            tracer.enabled = update.settings.ui.show_debug
+
+    def switch_mode(self, mode: str):
+        """Switch mode, timing until the target screen resumes
+
+        A mode that is not known yet may be a screen registered by a module
+        plugin, which are only imported now.
+        """
+        start = tracer.start()
+        if start is not None:
+            self.pending_switch = (mode, start)
+        try:
+            return super().switch_mode(mode)
+        except UnknownModeError:
+            if get_registry().get("screen", mode) is None:
+                raise
+        self.add_mode(mode, functools.partial(self._plugin_screen, mode))
+        return super().switch_mode(mode)
+
+    async def on_unmount(self) -> None:
+        """Release shared resources on shutdown"""
+        self.config_manager.unsubscribe(self._apply_config)
+        await self.data_service.aclose()
 
     # def get_css_variables(self) -> dict:
     #     """Get CSS variables based on current theme"""
@@ -2,12 +2,29 @@ import sys
 from pathlib import Path
 import click
 
-from pytools.config.settings import settings, Settings
-from pytools.app import ToolsApp
+# Heavy modules (Textual, the app, services) are imported inside the
+# commands that need them so `show-config` and friends start quickly.
+
+
+def _print_version(ctx: click.Context, param: click.Parameter, value: bool) -> None:
+    """Print the configured version and exit"""
+    if not value or ctx.resilient_parsing:
+        return
+    from pytools.config.settings import get_settings
+
+    click.echo(f"{ctx.find_root().info_name}, version {get_settings().version}")
+    ctx.exit()
 
 
 @click.group()
-@click.version_option(settings.version)
+@click.option(
+    "--version",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_print_version,
+    help="Show the version and exit.",
+)
 def cli():
     """My Textual App CLI"""
     pass
@@ -20,22 +37,32 @@ def cli():
 @click.option("--debug", "-d", is_flag=True, help="Enable debug mode")
 def run(config, debug):
     """Run the Textual application"""
-    if config:
-        # Load configuration from file
-        config_path = Path(config)
-        if config_path.suffix.lower() == ".yaml":
-            settings = Settings.from_yaml(config_path)
-        else:
-            click.echo("Unsupported config file format. Use YAML.")
-            sys.exit(1)
+    from pytools.config.manager import ConfigError, ConfigManager, set_config
+
+    # Without --config, config.yaml in the data directory is used if present
+    config_path = Path(config) if config else None
+    if config_path is not None and config_path.suffix.lower() != ".yaml":
+        click.echo("Unsupported config file format. Use YAML.")
+        sys.exit(1)
+    manager = ConfigManager(config_path)
+    try:
+        settings = manager.load()
+    except ConfigError as e:
+        click.echo(str(e), err=True)
+        sys.exit(1)
+    set_config(manager)
 
     if debug:
-        settings.debug = True
+        # A runtime override, so it survives reloads but is not saved
+        manager.update({"debug": True}, persist=False)
+        settings = manager.settings
 
     # Ensure data directory exists
     settings.data_dir.mkdir(parents=True, exist_ok=True)
 
     # Run the application
+    from pytools.app import ToolsApp
+
     app = ToolsApp()
     app.run()
 
@@ -46,8 +73,10 @@ def run(config, debug):
 )
 def generate_config(output):
     """Generate default configuration file"""
+    from pytools.config.settings import get_settings
+
     output_path = Path(output)
-    settings.save_to_yaml(output_path)
+    get_settings().save_to_yaml(output_path)
     click.echo(f"Configuration saved to {output_path}")
 
 
@@ -56,9 +85,316 @@ def show_config():
     """Show current configuration"""
     import json
 
-    config_dict = settings.model_dump()
+    from pytools.config.settings import get_settings
+
+    config_dict = get_settings().model_dump()
     click.echo(json.dumps(config_dict, indent=2, default=str))
 
 
+@cli.command("exec")
+@click.argument("source", type=click.File("r"), default="-")
+@click.option(
+    "--concurrency", "-j", default=8, show_default=True, help="Commands in flight"
+)
+@click.option(
+    "--output", "-o", type=click.File("w"), default="-", help="NDJSON results file"
+)
+@click.option(
+    "--format",
+    "input_format",
+    type=click.Choice(["auto", "text", "ndjson"]),
+    default="auto",
+    show_default=True,
+    help="Input format",
+)
+def exec_commands(source, concurrency, output, input_format):
+    """Run commands from a file or stdin without the TUI"""
+    import asyncio
+
+    from pytools.services.batch import read_commands, run_batch_to_stream
+    from pytools.services.history import get_history
+
+    history = get_history()
+    commands = history.record(read_commands(source, input_format))
+    try:
+        stats = asyncio.run(run_batch_to_stream(commands, concurrency, output))
+    finally:
+        history.close()
+    click.echo(stats.summary(), err=True)
+    if stats.errors:
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "fmt",
+    type=click.Choice(["ndjson", "csv", "json", "parquet", "ipc"]),
+    help="Default: from suffix",
+)
+@click.option("--replace", is_flag=True, help="Drop existing records first")
+@click.option("--workers", "-j", type=int, help="Parser threads [default: CPUs]")
+@click.option("--chunk-size", type=int, help="Chunk size in MiB [default: 64]")
+def ingest(source, fmt, replace, workers, chunk_size):
+    """Merge a large NDJSON, CSV or JSON file into the dataset by id"""
+    import asyncio
+
+    import polars as pl
+
+    from pytools.config.settings import get_settings
+    from pytools.services.data import DataService
+
+    settings = get_settings()
+    overrides = {}
+    if workers is not None:
+        overrides["workers"] = workers
+    if chunk_size is not None:
+        overrides["chunk_size"] = chunk_size * 2**20
+    settings = settings.model_copy(
+        update={"ingest": settings.ingest.model_copy(update=overrides)}
+    )
+
+    def show(progress, diff) -> None:
+        click.echo(f"\r{progress.summary()}", nl=False, err=True)
+
+    async def load():
+        service = DataService(settings=settings)
+        try:
+            await service.get_data()
+            return await service.ingest(Path(source), fmt, replace, show)
+        finally:
+            await service.aclose()
+
+    try:
+        progress = asyncio.run(load())
+    except (ValueError, pl.exceptions.PolarsError) as e:
+        click.echo(f"\nIngest failed: {e}")
+        sys.exit(1)
+    click.echo("", err=True)
+    click.echo(
+        f"Ingested {progress.rows} rows in {progress.elapsed:.1f}s "
+        f"({progress.inserted} new, {progress.updated} updated, "
+        f"{progress.invalid} invalid)"
+    )
+
+
+@cli.command()
+@click.argument("text", required=False)
+@click.option("--limit", "-n", default=20, show_default=True, help="Entries to show")
+def history(text, limit):
+    """Show recent commands, or those containing TEXT"""
+    from pytools.services.history import get_history
+
+    commands = get_history()
+    commands.load()
+    if text is None:
+        matches = commands.entries()[-limit:] if limit > 0 else []
+    else:
+        matches, before = [], None
+        while len(matches) < limit:
+            match = commands.search(text, before)
+            if match is None:
+                break
+            before, command = match
+            matches.append(command)
+        matches.reverse()
+    for command in matches:
+        click.echo(command)
+
+
+@cli.command()
+@click.option(
+    "--output", "-o", type=click.Path(), default="report.pdf", help="Output PDF path"
+)
+@click.option("--split-by", "-s", help="Render one PDF per value of this column")
+def report(output, split_by):
+    """Render the dataset to PDF"""
+    import asyncio
+
+    from pytools.services.data import DataService
+    from pytools.services.schema import COLUMNS
+
+    if split_by is not None and split_by not in COLUMNS:
+        raise click.BadParameter(
+            f"{split_by!r} is not one of {', '.join(COLUMNS)}",
+            param_hint="--split-by",
+        )
+
+    async def build():
+        service = DataService()
+        try:
+            await service.get_data()
+            return await service.export_report(Path(output), split_by)
+        finally:
+            await service.aclose()
+
+    for path in asyncio.run(build()):
+        click.echo(f"Report written to {path}")
+
+
+@cli.command()
+@click.option("--json", "as_json", is_flag=True, help="Print JSON for scripting")
+@click.option("--days", "-d", default=14, show_default=True, help="Histogram days")
+def summary(as_json, days):
+    """Show totals, counts per status and recent updates"""
+    import asyncio
+    import json
+
+    from pytools.services.data import DataService
+
+    async def build():
+        service = DataService()
+        try:
+            await service.get_data()
+            return service.summary
+        finally:
+            await service.aclose()
+
+    result = asyncio.run(build())
+    if as_json:
+        click.echo(json.dumps(result.as_dict(days), indent=2))
+    else:
+        click.echo(result.format(days))
+
+
+FORMAT_CHOICE = click.Choice(["parquet", "ipc", "csv"])
+
+
+@cli.command("export")
+@click.argument("output", type=click.Path(dir_okay=False))
+@click.option("--format", "fmt", type=FORMAT_CHOICE, help="Default: from suffix")
+def export_data(output, fmt):
+    """Export the dataset to Parquet, Arrow IPC or CSV"""
+    import asyncio
+
+    from pytools.services.data import DataService
+
+    async def export():
+        service = DataService()
+        try:
+            await service.get_data()
+            return service.row_count, await service.export_data(Path(output), fmt)
+        finally:
+            await service.aclose()
+
+    try:
+        rows, path = asyncio.run(export())
+    except ValueError as e:
+        click.echo(str(e))
+        sys.exit(1)
+    click.echo(f"Exported {rows} rows to {path}")
+
+
+@cli.command("import")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.option("--format", "fmt", type=FORMAT_CHOICE, help="Default: from suffix")
+def import_data(source, fmt):
+    """Import a dataset file into the local store (or snapshot)"""
+    import asyncio
+
+    from pytools.services.data import DataService
+
+    async def load():
+        service = DataService()
+        try:
+            await service.import_data(Path(source), fmt)
+            await service.refresh()
+            if service.store is not None:
+                return service.row_count, service.store.directory
+            return service.row_count, service.data_file
+        finally:
+            await service.aclose()
+
+    try:
+        rows, path = asyncio.run(load())
+    except ValueError as e:
+        click.echo(str(e))
+        sys.exit(1)
+    click.echo(f"Imported {rows} rows into {path}")
+
+
+@cli.command()
+@click.option("--load", "-l", is_flag=True, help="Import every plugin and time it")
+def plugins(load):
+    """List plugins from settings and entry points"""
+    from pytools.services.plugins import get_registry
+
+    registry = get_registry()
+    registry.discover()
+    specs = (
+        registry.load_all()
+        if load
+        else registry.modules + list(registry.specs.values())
+    )
+    click.echo(
+        f"Discovered {len(specs)} plugin(s) in {registry.discovery_time * 1000:.1f} ms"
+    )
+    for spec in sorted(specs, key=lambda s: -(s.load_time or 0)):
+        timing = f"{spec.load_time * 1000:8.1f} ms" if spec.loaded else "       -   "
+        line = f"{timing}  {spec.kind:<7} {spec.name:<20} {spec.target} ({spec.origin})"
+        if spec.error:
+            line += f"  FAILED: {spec.error}"
+        click.echo(line)
+    if any(spec.error for spec in specs):
+        sys.exit(1)
+
+
+@cli.command()
+@click.option(
+    "--sizes",
+    default="1000,100000,1000000",
+    show_default=True,
+    help="Comma separated dataset sizes",
+)
+@click.option("--commands", "-n", default=500, show_default=True, help="Commands run")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="JSON results")
+@click.option(
+    "--baseline", "-b", type=click.Path(exists=True, dir_okay=False), help="Compare"
+)
+@click.option(
+    "--tolerance", "-t", default=0.2, show_default=True, help="Allowed slowdown"
+)
+def bench(sizes, commands, output, baseline, tolerance):
+    """Benchmark startup, table loading, refresh and command throughput"""
+    from pytools.utils.bench import BenchReport, run_benchmarks
+
+    try:
+        size_list = [int(size) for size in sizes.split(",") if size.strip()]
+    except ValueError:
+        click.echo(f"Invalid sizes: {sizes}")
+        sys.exit(1)
+
+    report = run_benchmarks(size_list, commands=commands)
+    base = BenchReport.from_json(Path(baseline).read_text()) if baseline else None
+    click.echo(report.format(base))
+    if output:
+        Path(output).write_text(report.to_json())
+        click.echo(f"Results written to {output}")
+    if base is not None:
+        regressions = report.compare(base, tolerance)
+        for regression in regressions:
+            click.echo(f"REGRESSION {regression.format()}")
+        if regressions:
+            sys.exit(1)
+
+
+@cli.command()
+@click.argument("args", nargs=-1)
+@click.option("--top", "-n", default=15, show_default=True, help="Modules to list")
+@click.option(
+    "--repeat", "-r", default=3, show_default=True, help="Runs; the fastest is shown"
+)
+def startup_profile(args, top, repeat):
+    """Profile import time of a subcommand (default: show-config)"""
+    from pytools.utils.profiling import profile_imports
+
+    try:
+        report = profile_imports(list(args) or ["show-config"], repeat=repeat)
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    click.echo(report.format(top))
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,396 @@
+import os
+import pickle
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from pytools.config.settings import Settings, get_settings, set_settings
+
+# Bump when the cache layout changes
+CACHE_VERSION = 1
+_MISSING = object()
+
+FileStat = Optional[Tuple[int, int, int]]
+
+
+class ConfigError(Exception):
+    """Raised when a changed config file cannot be read or validated"""
+
+
+@dataclass(frozen=True)
+class ConfigUpdate:
+    """A newly published settings snapshot and the sections that changed"""
+
+    settings: Settings
+    previous: Settings
+    sections: FrozenSet[str]
+    version: int
+
+    def fields(self, section: str) -> Set[str]:
+        """Names of the fields of a section whose values changed"""
+        if section not in self.sections:
+            return set()
+        old, new = getattr(self.previous, section), getattr(self.settings, section)
+        if not isinstance(new, BaseModel):
+            return {section}
+        return {
+            name
+            for name in type(new).model_fields
+            if getattr(old, name) != getattr(new, name)
+        }
+
+    def changed(self, section: str, *fields: str) -> bool:
+        """Whether a section, or any of the given fields of it, changed"""
+        if not fields:
+            return section in self.sections
+        return not self.fields(section).isdisjoint(fields)
+
+
+Subscriber = Callable[[ConfigUpdate], None]
+
+
+def _stat(path: Optional[Path]) -> FileStat:
+    if path is None:
+        return None
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    # The inode catches editors that save by replacing the file
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def _environ() -> Tuple[Tuple[str, str], ...]:
+    """Environment variables that can set a field"""
+    return tuple(
+        sorted(
+            (key, value)
+            for key, value in os.environ.items()
+            if key.lower().split("__")[0] in Settings.model_fields
+        )
+    )
+
+
+def _merge(*sources: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep merge dicts, later ones winning"""
+    merged: Dict[str, Any] = {}
+    for source in sources:
+        for key, value in source.items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                value = _merge(merged[key], value)
+            merged[key] = value
+    return merged
+
+
+@lru_cache(maxsize=None)
+def _adapter(name: str) -> TypeAdapter:
+    return TypeAdapter(Settings.model_fields[name].annotation)
+
+
+def validate_section(name: str, value: Any = _MISSING) -> Any:
+    """Validate one top-level setting, falling back to its default"""
+    field = Settings.model_fields.get(name)
+    if field is None:
+        raise ConfigError(f"Unknown setting: {name}")
+    if value is _MISSING:
+        return field.get_default(call_default_factory=True)
+    return _adapter(name).validate_python(value)
+
+
+def _read_yaml(path: Optional[Path]) -> Dict[str, Any]:
+    if path is None or not path.exists():
+        return {}
+    import yaml
+
+    try:
+        with open(path, "r") as f:
+            data = yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise ConfigError(f"Could not parse {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ConfigError(f"{path} must contain a mapping")
+    return data
+
+
+def _read_dotenv(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    from pydantic_settings import DotEnvSettingsSource
+
+    return DotEnvSettingsSource(Settings, env_file=path)()
+
+
+def _read_environ() -> Dict[str, Any]:
+    from pydantic_settings import EnvSettingsSource
+
+    return EnvSettingsSource(Settings)()
+
+
+class ConfigManager:
+    """Loads settings from YAML, .env and the environment, and keeps them current
+
+    Settings come from the .env file, then environment variables, then the
+    YAML file, each overriding the last; runtime overrides passed to
+    update(persist=False) sit on top of all three. Each top-level field (the app
+    options and sections like api or database) is validated on its own, so
+    when check() finds a file changed only the fields whose raw values
+    differ are validated again. A new snapshot shares the unchanged section
+    objects with the previous one and is handed to every subscriber; a
+    published snapshot is never modified by the manager.
+
+    The validated snapshot is pickled next to the YAML file, keyed on the
+    stat of both files, the relevant environment variables and the settings
+    module, so a start with nothing changed skips YAML parsing and
+    validation. The cache is only trusted if it belongs to the current user,
+    and is not written while runtime overrides are in effect.
+    """
+
+    def __init__(self, path: Optional[Path] = None, env_file: Optional[Path] = None):
+        self.path = path
+        self.env_file = env_file or Path(Settings.model_config["env_file"])
+        self.version = 0
+        self.loaded = False
+        self.from_cache = False
+        self._settings: Optional[Settings] = None
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._raw: Dict[str, Any] = {}
+        self._stats: Tuple[FileStat, FileStat] = (None, None)
+        self._subscribers: List[Subscriber] = []
+
+    @property
+    def settings(self) -> Settings:
+        """The current snapshot"""
+        return self._settings if self._settings is not None else get_settings()
+
+    @property
+    def cache_path(self) -> Optional[Path]:
+        if self.path is None:
+            return None
+        return self.path.with_name(f".{self.path.name}.cache")
+
+    def _cache_key(self) -> Tuple[Any, ...]:
+        return (
+            CACHE_VERSION,
+            str(self.path.resolve()) if self.path else None,
+            str(self.env_file.resolve()),
+            self._stats,
+            _environ(),
+            _stat(Path(__file__).with_name("settings.py")),
+        )
+
+    def load(self) -> Settings:
+        """Build the settings, from the cache when nothing has changed
+
+        Without a path the YAML file is config.yaml in the data directory
+        named by .env or the environment.
+        """
+        if self.path is None:
+            environ = _merge(_read_dotenv(self.env_file), _read_environ())
+            data_dir = validate_section("data_dir", environ.get("data_dir", _MISSING))
+            self.path = data_dir / "config.yaml"
+        self._stats = (_stat(self.path), _stat(self.env_file))
+        key = self._cache_key()
+        cached = self._read_cache(key)
+        if cached is not None:
+            self._sources, self._raw, settings = cached
+            self.from_cache = True
+        else:
+            self._sources = self._initial_sources()
+            self._raw = self._merged(self._sources)
+            try:
+                settings = Settings.model_construct(
+                    **{
+                        name: validate_section(name, self._raw.get(name, _MISSING))
+                        for name in set(Settings.model_fields) | set(self._raw)
+                    }
+                )
+            except ValidationError as e:
+                raise ConfigError(f"Invalid configuration in {self.path}:\n{e}") from e
+            self._write_cache(key, settings)
+        self._settings = settings
+        self.loaded = True
+        set_settings(settings)
+        return settings
+
+    @staticmethod
+    def _merged(sources: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        return _merge(
+            sources["dotenv"],
+            sources["environ"],
+            sources["yaml"],
+            sources.get("overrides", {}),
+        )
+
+    def _read_cache(self, key: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+        path = self.cache_path
+        try:
+            if path is None or path.stat().st_uid != getattr(os, "getuid", lambda: 0)():
+                return None
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+            if payload["key"] != key:
+                return None
+            return payload["sources"], payload["raw"], payload["settings"]
+        except Exception:
+            # A stale or unreadable cache is rebuilt from the files
+            return None
+
+    def _write_cache(self, key: Tuple[Any, ...], settings: Settings) -> None:
+        path = self.cache_path
+        if path is None or not self.path.exists() or self._sources.get("overrides"):
+            return
+        payload = {
+            "key": key,
+            "sources": self._sources,
+            "raw": self._raw,
+            "settings": settings,
+        }
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+        except OSError:
+            pass
+
+    def subscribe(self, callback: Subscriber) -> None:
+        """Call callback with every update published from now on"""
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def check(self) -> Optional[ConfigUpdate]:
+        """Reload the YAML and .env files if either changed on disk
+
+        Raises ConfigError when a changed file is invalid; the previous
+        snapshot stays current and the file is not read again until it
+        changes once more.
+        """
+        if not self.loaded:
+            return None
+        stats = (_stat(self.path), _stat(self.env_file))
+        if stats == self._stats:
+            return None
+        old_stats, self._stats = self._stats, stats
+        sources = dict(self._sources)
+        try:
+            if stats[0] != old_stats[0]:
+                sources["yaml"] = _read_yaml(self.path)
+            if stats[1] != old_stats[1]:
+                sources["dotenv"] = _read_dotenv(self.env_file)
+        except OSError as e:
+            raise ConfigError(f"Could not read configuration: {e}") from e
+        return self._apply(sources)
+
+    def update(
+        self, changes: Dict[str, Any], persist: bool = True
+    ) -> Optional[ConfigUpdate]:
+        """Apply changed setting values and publish them
+
+        With persist the values are written to the YAML file. Otherwise
+        they are runtime overrides: published the same way and kept across
+        reloads, but never saved.
+        """
+        if persist and self.path is None:
+            self.path = self.settings.data_dir / "config.yaml"
+        sources = dict(self._sources or self._initial_sources())
+        key = "yaml" if persist else "overrides"
+        sources[key] = _merge(sources.get(key, {}), changes)
+        # Validate before writing so a bad value never reaches the file
+        raw = self._merged(sources)
+        try:
+            for name in changes:
+                validate_section(name, raw.get(name, _MISSING))
+        except ValidationError as e:
+            raise ConfigError(f"Invalid configuration:\n{e}") from e
+        if not persist:
+            return self._apply(sources)
+
+        import yaml
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            yaml.safe_dump(
+                sources["yaml"], f, default_flow_style=False, sort_keys=False
+            )
+        tmp_path.replace(self.path)
+        self._stats = (_stat(self.path), _stat(self.env_file))
+        self.loaded = True
+        return self._apply(sources)
+
+    def _initial_sources(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "dotenv": _read_dotenv(self.env_file),
+            "environ": _read_environ(),
+            "yaml": _read_yaml(self.path),
+        }
+
+    def _apply(self, sources: Dict[str, Dict[str, Any]]) -> Optional[ConfigUpdate]:
+        """Validate the fields whose raw values changed and build a snapshot"""
+        raw = self._merged(sources)
+        names = {
+            name
+            for name in set(raw) | set(self._raw)
+            if raw.get(name, _MISSING) != self._raw.get(name, _MISSING)
+        }
+        current = self.settings
+        try:
+            values = {
+                name: validate_section(name, raw.get(name, _MISSING)) for name in names
+            }
+        except ValidationError as e:
+            raise ConfigError(f"Invalid configuration in {self.path}:\n{e}") from e
+        self._sources, self._raw = sources, raw
+        changed = {
+            name for name, value in values.items() if value != getattr(current, name)
+        }
+        if not changed:
+            self._write_cache(self._cache_key(), current)
+            return None
+
+        settings = current.model_copy(update={name: values[name] for name in changed})
+        self.version += 1
+        update = ConfigUpdate(settings, current, frozenset(changed), self.version)
+        self._publish(update)
+        return update
+
+    def _publish(self, update: ConfigUpdate) -> None:
+        self._settings = update.settings
+        set_settings(update.settings)
+        self._write_cache(self._cache_key(), update.settings)
+
+        from pytools.utils.logger import get_logger
+
+        logger = get_logger(__name__)
+        sections = ", ".join(sorted(update.sections))
+        logger.info(f"Configuration v{update.version}: {sections} changed")
+        for callback in list(self._subscribers):
+            try:
+                callback(update)
+            except Exception:
+                logger.exception(f"Config subscriber {callback!r} failed")
+
+
+_manager: Optional[ConfigManager] = None
+
+
+def get_config() -> ConfigManager:
+    """The process-wide config manager"""
+    global _manager
+    if _manager is None:
+        _manager = ConfigManager()
+    return _manager
+
+
+def set_config(manager: ConfigManager) -> None:
+    """Replace the process-wide config manager"""
+    global _manager
+    _manager = manager
@@ -1,36 +1,124 @@
 from pathlib import Path
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-import yaml
 
 
-class DatabaseConfig(BaseModel):
+class Section(BaseModel):
+    """A settings section; frozen, so a published snapshot never changes"""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class DatabaseConfig(Section):
     host: str = "localhost"
     port: int = 5432
     name: str = "myapp"
     username: str = "user"
     password: str = Field(default="", exclude=True)
+    driver: str = "sqlite"  # "sqlite" or "postgresql" (needs psycopg)
+    sqlite_path: str = "records.db"
+    table: str = "records"
+    pool_size: int = 4
+    fetch_size: int = 50000
+    batch_size: int = 1000
 
 
-class APISettings(BaseModel):
+class APISettings(Section):
     base_url: str = "https://api.example.com"
     timeout: int = 30
     retries: int = 3
     api_key: Optional[str] = Field(default=None, exclude=True)
-
-
-class UISettings(BaseModel):
+    records_path: str = "/records"
+    updated_since_param: str = "updated_since"
+    page_size: int = 1000
+    max_connections: int = 10
+    max_hosts: int = 4
+    max_concurrency: int = 8
+    multiplexed: bool = True
+    retry_backoff: float = 0.2
+    retry_max_backoff: float = 5.0
+    hedge: bool = True
+    hedge_quantile: float = 0.95
+    hedge_min_samples: int = 20
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+
+
+class CacheSettings(Section):
+    enabled: bool = True
+    memory_max_entries: int = 256
+    # Seconds to serve from memory without revalidating; 0 keeps polls live
+    memory_ttl: float = 0.0
+    disk_enabled: bool = True
+    disk_dir: str = "cache"
+    disk_max_bytes: int = 256 * 1024 * 1024
+    disk_ttl: float = 7 * 24 * 3600
+
+
+class UISettings(Section):
     # theme: str = "dark"
     refresh_rate: float = 0.5
     show_debug: bool = False
     default_screen: str = "main"
+    page_size: int = 100
+    prefetch_rows: int = 50
+    filter_debounce: float = 0.15
+    auto_refresh: bool = True
+    refresh_max_interval: float = 30.0
+    refresh_backoff: float = 2.0
+    # Every Nth auto-refresh re-reads everything so deletions show; 0 never
+    refresh_full_every: int = 20
+
+
+class SchedulerSettings(Section):
+    workers: int = 4
+    max_queue: int = 100
+
+
+class ReportSettings(Section):
+    chunk_size: int = 5000
+    workers: int = 2
+    # Larger reports or sections are split into part files; fpdf2 keeps
+    # every page of a file in memory
+    part_rows: int = 100000
+
+
+class StoreSettings(Section):
+    dir: str = "store"
+    compact_threshold: int = 10000
+    fsync: bool = False
+
+
+class IngestSettings(Section):
+    workers: int = 0  # parser threads, 0 for one per CPU
+    chunk_size: int = 64 * 1024 * 1024
 
 
-class LoggingConfig(BaseModel):
+class HistorySettings(Section):
+    file: str = "history"
+    max_entries: int = 200000
+    flush_interval: float = 1.0
+
+
+class ReloadSettings(Section):
+    watch: bool = True  # apply edits to the YAML and .env files while running
+    interval: float = 1.0
+
+
+class LoggingConfig(Section):
     level: str = "INFO"
     format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     file_path: Optional[Path] = None
+    format_type: str = "text"  # "text" or "json" (JSON lines)
+    console: bool = True
+    queue_size: int = 10000
+    batch_size: int = 256
+    flush_interval: float = 0.5
+    sample_rate: int = 10
+    max_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 5
+    rotate_interval: Optional[float] = None
 
 
 class Settings(BaseSettings):
@@ -39,16 +127,25 @@ class Settings(BaseSettings):
         env_file_encoding="utf-8",
         env_nested_delimiter="__",
         case_sensitive=False,
+        frozen=True,
     )
 
     app_name: str = "pyTools"
     version: str = "0.1.0"
     debug: bool = False
     data_dir: Path = Field(default_factory=lambda: Path.home() / ".toolsapp")
+    data_source: str = "store"  # "store", "sample", "api", "snapshot" or "database"
 
     database: DatabaseConfig = DatabaseConfig()
     api: APISettings = APISettings()
+    cache: CacheSettings = CacheSettings()
     ui: UISettings = UISettings()
+    scheduler: SchedulerSettings = SchedulerSettings()
+    report: ReportSettings = ReportSettings()
+    store: StoreSettings = StoreSettings()
+    ingest: IngestSettings = IngestSettings()
+    history: HistorySettings = HistorySettings()
+    reload: ReloadSettings = ReloadSettings()
     logging: LoggingConfig = LoggingConfig()
 
     # Additional configuration
@@ -58,6 +155,8 @@ class Settings(BaseSettings):
     @classmethod
     def from_yaml(cls, yaml_path: Path) -> "Settings":
         """Load configuration from YAML file"""
+        import yaml
+
         if yaml_path.exists():
             with open(yaml_path, "r") as f:
                 config_data = yaml.safe_load(f)
@@ -66,10 +165,37 @@ class Settings(BaseSettings):
 
     def save_to_yaml(self, yaml_path: Path) -> None:
         """Save current configuration to YAML file"""
+        import yaml
+
         yaml_path.parent.mkdir(parents=True, exist_ok=True)
-        config_dict = self.model_dump()
+        config_dict = self.model_dump(mode="json")
         with open(yaml_path, "w") as f:
             yaml.dump(config_dict, f, default_flow_style=False, indent=2)
 
 
-settings = Settings()
+_settings: Optional[Settings] = None
+
+
+def get_settings() -> Settings:
+    """Get the process-wide settings, building them on first use"""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def set_settings(new_settings: Settings) -> None:
+    """Replace the process-wide settings
+
+    Must be called before importing modules that bind ``settings`` at
+    import time (the app, screens and services).
+    """
+    global _settings
+    _settings = new_settings
+
+
+def __getattr__(name: str) -> Any:
+    # Build `settings` lazily so importing this module stays cheap
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
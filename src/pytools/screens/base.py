@@ -1,20 +1,33 @@
+import time
+
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.widgets import Header, Footer
 from textual.containers import Container
 
-from pytools.config.settings import settings
+from pytools.config.manager import ConfigUpdate, get_config
+from pytools.utils.tracing import tracer
+from pytools.widgets.coalescer import UpdateCoalescer
+from pytools.widgets.debug import DebugPanel
 from pytools.widgets.status import StatusBar
 
 
 class BaseScreen(Screen):
     """Base screen class with common functionality"""
 
+    BINDINGS = [
+        ("f12", "toggle_debug", "Debug"),
+        ("f11", "export_trace", "Export trace"),
+    ]
+
     def __init__(
         self, name: str | None = None, id: str | None = None, classes: str | None = None
     ):
         super().__init__(name=name, id=id, classes=classes)
-        self.app_settings = settings
+        self.app_settings = get_config().settings
+        self._created_at = tracer.start()
+        # Status and notification changes are applied once per refresh period
+        self.updates = UpdateCoalescer(self, self.app_settings.ui.refresh_rate)
 
     def compose(self) -> ComposeResult:
         """Compose base screen elements"""
@@ -22,6 +35,9 @@ class BaseScreen(Screen):
         yield from self.compose_content()
         yield Footer()
         yield StatusBar()
+        debug_panel = DebugPanel(id="debug-panel")
+        debug_panel.display = self.app_settings.ui.show_debug
+        yield debug_panel
 
     def compose_content(self) -> ComposeResult:
         """Override this method to add screen-specific content"""
@@ -29,15 +45,47 @@ class BaseScreen(Screen):
 
     async def on_mount(self) -> None:
         """Called when the screen is mounted"""
+        tracer.finish(f"screen.mount:{self.__class__.__name__}", self._created_at)
         await self.update_status(f"Loaded {self.__class__.__name__}")
+        get_config().subscribe(self._apply_config)
+
+    def on_unmount(self) -> None:
+        get_config().unsubscribe(self._apply_config)
+
+    def _apply_config(self, update: ConfigUpdate) -> None:
+        """Switch to a new settings snapshot"""
+        self.app_settings = update.settings
+        self.updates.frame = update.settings.ui.refresh_rate
+        if update.changed("ui", "show_debug"):
+            self.query_one(DebugPanel).set_visible(update.settings.ui.show_debug)
+
+    def on_screen_resume(self) -> None:
+        """Finish timing a mode switch that landed on this screen"""
+        switch = getattr(self.app, "pending_switch", None)
+        if switch is not None:
+            mode, start = switch
+            tracer.finish(f"mode_switch:{mode}", start)
+            self.app.pending_switch = None
+        self.query_one(DebugPanel).set_visible(self.app_settings.ui.show_debug)
 
     async def update_status(self, message: str) -> None:
         """Update the status bar"""
-        status_bar = self.query_one(StatusBar, None)
-        if status_bar:
-            status_bar.update_status(message)
+        self.updates.set_status(message)
 
     def action_toggle_debug(self) -> None:
-        """Toggle debug mode"""
-        self.app_settings.debug = not self.app_settings.debug
-        self.notify(f"Debug mode: {'ON' if self.app_settings.debug else 'OFF'}")
+        """Toggle debug mode and the performance overlay"""
+        debug = not self.app_settings.debug
+        # Published to every subscriber, which shows the overlay, but not saved
+        get_config().update(
+            {"debug": debug, "ui": {"show_debug": debug}}, persist=False
+        )
+        self.notify(f"Debug mode: {'ON' if debug else 'OFF'}")
+
+    def action_export_trace(self) -> None:
+        """Export recorded spans as a Chrome trace file"""
+        path = self.app_settings.data_dir / f"trace-{int(time.time())}.json"
+        try:
+            count = tracer.export_chrome_trace(path)
+            self.notify(f"Exported {count} spans to {path}")
+        except OSError as e:
+            self.notify(f"Error exporting trace: {e}", severity="error")
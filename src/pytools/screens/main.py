@@ -1,11 +1,33 @@
+import asyncio
+from dataclasses import replace
+from pathlib import Path
+from typing import Optional
+
+import polars as pl
+
 from textual.app import ComposeResult
 from textual.containers import Vertical, Horizontal
-from textual.widgets import Button, Static, Input, DataTable
+from textual.widgets import Button, Static, Input
 from textual.screen import Screen
 
+from pytools.config.manager import ConfigUpdate
 from pytools.screens.base import BaseScreen
+from pytools.utils.tracing import tracer
 from pytools.widgets.input import CustomInput
+from pytools.widgets.summary import SummaryPanel
+from pytools.widgets.table import PagedDataTable
 from pytools.services.data import DataService
+from pytools.services.diff import DataDiff
+from pytools.services.ingest import IngestProgress
+from pytools.services.refresher import AutoRefresher
+from pytools.services.query import DataView, ViewQuery, parse_query, parse_sort
+from pytools.services.scheduler import (
+    CommandJob,
+    CommandScheduler,
+    JobState,
+    SchedulerStatus,
+)
+from pytools.services.schema import COLUMNS, COLUMN_LABELS
 
 
 class MainScreen(BaseScreen):
@@ -16,12 +38,43 @@ class MainScreen(BaseScreen):
         ("s", "switch_to_settings", "Settings"),
         ("q", "quit", "Quit"),
         ("r", "refresh_data", "Refresh"),
+        ("p", "report", "Report"),
+        ("m", "toggle_summary", "Summary"),
+        ("escape", "cancel_commands", "Cancel"),
     ]
 
     def __init__(self):
         super().__init__(name="main")
-        self.data_service = DataService()
-        self.data_table = DataTable()
+        self.data_service: DataService = self.app.data_service
+        self.view = DataView(self.data_service)
+        # The query last applied, and the one being evaluated if any
+        self._requested_query = ViewQuery()
+        self._running_query: Optional[ViewQuery] = None
+        self._filter_timer = None
+        self.data_table = PagedDataTable(
+            self.view,
+            page_size=self.app_settings.ui.page_size,
+            prefetch=self.app_settings.ui.prefetch_rows,
+        )
+        self.scheduler = CommandScheduler(
+            self.data_service,
+            workers=self.app_settings.scheduler.workers,
+            max_queue=self.app_settings.scheduler.max_queue,
+            on_change=self._on_scheduler_change,
+            on_finished=self._on_command_finished,
+        )
+        ui = self.app_settings.ui
+        self.refresher = AutoRefresher(
+            self._refresh,
+            self.show_diff,
+            interval=ui.refresh_rate if ui.auto_refresh else None,
+            max_interval=ui.refresh_max_interval,
+            backoff=ui.refresh_backoff,
+            on_error=lambda e: self.updates.notify(
+                f"Error loading data: {e}", severity="error"
+            ),
+            full_every=ui.refresh_full_every,
+        )
 
     def compose_content(self) -> ComposeResult:
         """Compose the main screen content"""
@@ -32,36 +85,91 @@ class MainScreen(BaseScreen):
                 yield CustomInput(placeholder="Enter command...", id="command-input")
                 yield Button("Execute", variant="primary", id="execute-btn")
 
-            yield self.data_table
+            yield Input(
+                placeholder=(
+                    "Filter: status=active id>=10 name~foo sort:-updated or text"
+                ),
+                id="filter-input",
+            )
+
+            with Horizontal(id="table-area"):
+                yield self.data_table
+                yield SummaryPanel(id="summary-panel")
 
     async def on_mount(self) -> None:
         """Initialize the screen when mounted"""
         await super().on_mount()
         await self.update_status("Ready")
+        self.scheduler.start()
         await self.setup_data_table()
+        self.refresher.start()
+
+    async def on_unmount(self) -> None:
+        """Stop running commands when the screen goes away"""
+        await self.refresher.stop()
+        await self.scheduler.stop()
+
+    def _apply_config(self, update: ConfigUpdate) -> None:
+        """Retime auto-refresh when its settings change"""
+        super()._apply_config(update)
+        ui = update.settings.ui
+        if update.changed(
+            "ui",
+            "refresh_rate",
+            "auto_refresh",
+            "refresh_max_interval",
+            "refresh_backoff",
+            "refresh_full_every",
+        ):
+            self.refresher.reconfigure(
+                ui.refresh_rate if ui.auto_refresh else None,
+                ui.refresh_max_interval,
+                ui.refresh_backoff,
+                ui.refresh_full_every,
+            )
+
+    def on_screen_suspend(self) -> None:
+        """Stop auto-refresh while another screen is shown"""
+        self.refresher.pause()
+
+    def on_screen_resume(self) -> None:
+        """Resume auto-refresh, catching up straight away"""
+        super().on_screen_resume()
+        self.refresher.resume()
 
     async def setup_data_table(self) -> None:
         """Setup the data table"""
         self.data_table.cursor_type = "row"
         self.data_table.zebra_stripes = True
-        self.data_table.add_columns("ID", "Name", "Status", "Updated")
+        for name in COLUMNS:
+            self.data_table.add_column(COLUMN_LABELS[name], key=name)
         await self.load_data()
 
     async def load_data(self) -> None:
         """Load data into the table"""
         try:
-            data = await self.data_service.get_data()
-            self.data_table.clear()
-            for row in data:
-                self.data_table.add_row(
-                    str(row.get("id", "")),
-                    row.get("name", ""),
-                    row.get("status", ""),
-                    row.get("updated", ""),
-                )
-            await self.update_status(f"Loaded {len(data)} items")
+            self.show_diff(await self.data_service.refresh())
         except Exception as e:
-            self.notify(f"Error loading data: {e}", severity="error")
+            self.updates.notify(f"Error loading data: {e}", severity="error")
+
+    async def _refresh(self, full: bool) -> DataDiff:
+        """Refresh for the auto-refresher: a delta poll unless full"""
+        if full:
+            return await self.data_service.refresh()
+        return await self.data_service.poll()
+
+    @tracer.traced("screen.show_diff")
+    def show_diff(self, diff: DataDiff) -> None:
+        """Apply a data change to the table, summary and status"""
+        if diff.is_empty() and self.data_table.total_rows == self.view.row_count:
+            return
+        if self.view.query.is_empty():
+            self.data_table.apply_diff(diff)
+        else:
+            # Changed rows may enter, leave or move within the view
+            self.data_table.reload()
+        self.query_one(SummaryPanel).update_summary(self.data_service.summary)
+        self.updates.set_status(f"Loaded {self._count_text()} items ({diff.summary()})")
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses"""
@@ -73,29 +181,175 @@ class MainScreen(BaseScreen):
         if event.input.id == "command-input":
             await self.execute_command()
 
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Debounce typing in the filter bar"""
+        if event.input.id != "filter-input":
+            return
+        if self._filter_timer is not None:
+            self._filter_timer.stop()
+        self._filter_timer = self.set_timer(
+            self.app_settings.ui.filter_debounce, self._apply_filter_text
+        )
+
+    def _apply_filter_text(self) -> None:
+        """Parse the filter bar and update the view"""
+        self._filter_timer = None
+        text = self.query_one("#filter-input", Input).value
+        try:
+            query = parse_query(text)
+        except ValueError as e:
+            self.notify(str(e), severity="warning")
+            return
+        self._run_query(query)
+
+    @property
+    def _latest_query(self) -> ViewQuery:
+        """The query being evaluated, else the one last applied"""
+        if self._running_query is not None:
+            return self._running_query
+        return self._requested_query
+
+    def _run_query(self, query: ViewQuery) -> None:
+        """Evaluate a query off the event loop, dropping stale ones"""
+        if query == self._latest_query:
+            return
+        self._running_query = query
+        self.run_worker(self._update_view(query), exclusive=True, group="view")
+
+    @tracer.traced("screen.update_view")
+    async def _update_view(self, query: ViewQuery) -> None:
+        """Show the rows matching a query"""
+        try:
+            result = await asyncio.to_thread(self.view.compute, query)
+        except (ValueError, pl.exceptions.PolarsError) as e:
+            self.notify(f"Invalid filter: {e}", severity="error")
+            return
+        finally:
+            if self._running_query is query:
+                self._running_query = None
+        self._requested_query = query
+        self.view.commit(result)
+        self.data_table.reset()
+        await self.update_status(f"Showing {self._count_text()} items")
+
+    def _count_text(self) -> str:
+        total = self.data_service.row_count
+        if not self.view.query.is_filtered():
+            return f"{total}"
+        return f"{self.view.row_count} of {total}"
+
+    def _view_command(self, command: str) -> None:
+        """Handle `filter COND...`, `sort COLUMN [asc|desc]` and `search TEXT`"""
+        word, _, rest = command.partition(" ")
+        args = rest.split()
+        query = self._latest_query
+        try:
+            if word.lower() == "filter":
+                conditions = [parse_query(arg).conditions for arg in args]
+                if not all(conditions):
+                    raise ValueError("Expected COLUMN<op>VALUE, e.g. status=active")
+                if args:
+                    query = query.with_conditions([c[0] for c in conditions])
+                else:
+                    query = replace(query, conditions=())
+            elif word.lower() == "sort":
+                query = replace(query, sort=parse_sort(*args[:2]) if args else None)
+            else:
+                query = replace(query, search=rest.strip())
+        except ValueError as e:
+            self.notify(str(e), severity="warning")
+            return
+        self.query_one("#filter-input", Input).value = query.to_text()
+        self._run_query(query)
+
+    async def on_custom_input_submitted(self, event: CustomInput.Submitted) -> None:
+        """Handle command input submission"""
+        await self.on_input_submitted(event)
+
     async def execute_command(self) -> None:
         """Execute the command from input"""
         command_input = self.query_one("#command-input", Input)
         command = command_input.value.strip()
 
-        if command:
+        if command.lower().startswith("screen "):
+            self.open_screen(command[7:].strip())
+            command_input.value = ""
+        elif command.lower().startswith("ingest "):
+            path = Path(command[7:].strip()).expanduser()
+            self.run_worker(self._ingest(path), group="ingest")
+            command_input.value = ""
+        elif command.split(" ", 1)[0].lower() in ("filter", "sort", "search"):
+            self._view_command(command)
+            command_input.value = ""
+        elif command:
             try:
-                result = await self.data_service.execute_command(command)
-                self.notify(f"Command executed: {result}")
-                await self.load_data()
-            except Exception as e:
-                self.notify(f"Command failed: {e}", severity="error")
+                self.scheduler.submit(command)
+            except asyncio.QueueFull:
+                self.notify("Command queue is full", severity="warning")
 
             command_input.value = ""
 
+    async def _ingest(self, path: Path) -> None:
+        """Ingest a file, showing progress as chunks arrive, then the new rows"""
+
+        def on_progress(progress: IngestProgress, diff: DataDiff) -> None:
+            self.show_diff(diff)
+            self.updates.set_status(progress.summary())
+
+        try:
+            progress = await self.data_service.ingest(path, on_progress=on_progress)
+        except (OSError, ValueError, pl.exceptions.PolarsError) as e:
+            self.updates.notify(f"Ingest failed: {e}", severity="error")
+            return
+        self.updates.notify(
+            f"Ingested {progress.rows} rows from {path.name} "
+            f"in {progress.elapsed:.1f}s ({progress.invalid} invalid)"
+        )
+
+    def _on_scheduler_change(self, status: SchedulerStatus) -> None:
+        """Show queue depth and progress in the status bar"""
+        self.updates.set_queue(status.summary())
+
+    def _on_command_finished(self, job: CommandJob) -> None:
+        """Report a finished command and refresh the table"""
+        if job.state == JobState.DONE:
+            self.updates.notify(f"Command executed: {job.result}")
+            self.refresher.trigger()
+        elif job.state == JobState.FAILED:
+            self.updates.notify(f"Command failed: {job.error}", severity="error")
+        elif job.state == JobState.CANCELLED:
+            self.updates.notify(f"Command cancelled: {job.command}", severity="warning")
+
     # def action_toggle_dark(self) -> None:
     #     """Toggle dark mode"""
     #     self.app.dark = not self.app.dark
 
+    def open_screen(self, mode: str) -> None:
+        """Switch to a built-in or plugin screen by mode name"""
+        try:
+            self.app.switch_mode(mode)
+        except Exception as e:
+            self.notify(f"Cannot open screen {mode}: {e}", severity="error")
+
     def action_switch_to_settings(self) -> None:
         """Switch to settings screen"""
         self.app.switch_mode("settings")
 
     def action_refresh_data(self) -> None:
         """Refresh data"""
-        self.run_worker(self.load_data, exclusive=True)
+        self.refresher.trigger(full=True)
+
+    def action_report(self) -> None:
+        """Export the table to PDF in the background"""
+        self.scheduler.submit("report")
+
+    def action_toggle_summary(self) -> None:
+        """Show or hide the summary panel"""
+        panel = self.query_one(SummaryPanel)
+        panel.display = not panel.display
+
+    def action_cancel_commands(self) -> None:
+        """Cancel queued and running commands"""
+        cancelled = self.scheduler.cancel_all()
+        if not cancelled:
+            self.notify("No commands to cancel")
@@ -1,10 +1,10 @@
 from textual.app import ComposeResult
 from textual.containers import Vertical, Horizontal, Grid
-from textual.widgets import Button, Input, Label, Switch, Select
+from textual.widgets import Button, Input, Label, Switch
 from textual.screen import Screen
 
 from pytools.screens.base import BaseScreen
-from pytools.config.settings import settings
+from pytools.config.manager import ConfigError, get_config
 
 
 class SettingsScreen(BaseScreen):
@@ -22,7 +22,7 @@ class SettingsScreen(BaseScreen):
 
             with Grid(id="settings-grid"):
                 # UI Settings
-                yield Label("Theme:", classes="setting-label")
+                # yield Label("Theme:", classes="setting-label")
                 # yield Select(
                 #     [("dark", "Dark"), ("light", "Light")],
                 #     value=settings.ui.theme,
@@ -31,35 +31,39 @@ class SettingsScreen(BaseScreen):
 
                 yield Label("Refresh Rate:", classes="setting-label")
                 yield Input(
-                    str(settings.ui.refresh_rate),
+                    str(self.app_settings.ui.refresh_rate),
                     id="refresh-rate-input",
                     type="number",
                 )
 
                 yield Label("Show Debug:", classes="setting-label")
-                yield Switch(settings.ui.show_debug, id="debug-switch")
+                yield Switch(self.app_settings.ui.show_debug, id="debug-switch")
 
                 # API Settings
                 yield Label("API Base URL:", classes="setting-label")
-                yield Input(settings.api.base_url, id="api-url-input")
+                yield Input(self.app_settings.api.base_url, id="api-url-input")
 
                 yield Label("API Timeout:", classes="setting-label")
                 yield Input(
-                    str(settings.api.timeout), id="api-timeout-input", type="number"
+                    str(self.app_settings.api.timeout),
+                    id="api-timeout-input",
+                    type="number",
                 )
 
                 # Database Settings
                 yield Label("Database Host:", classes="setting-label")
-                yield Input(settings.database.host, id="db-host-input")
+                yield Input(self.app_settings.database.host, id="db-host-input")
 
                 yield Label("Database Port:", classes="setting-label")
                 yield Input(
-                    str(settings.database.port), id="db-port-input", type="number"
+                    str(self.app_settings.database.port),
+                    id="db-port-input",
+                    type="number",
                 )
 
             with Horizontal(id="settings-buttons"):
-                yield Button("Save", variant="success")
-                yield Button("Cancel", variant="error")
+                yield Button("Save", variant="success", id="save-btn")
+                yield Button("Cancel", variant="error", id="cancel-btn")
 
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses"""
@@ -71,36 +75,29 @@ class SettingsScreen(BaseScreen):
     async def save_settings(self) -> None:
         """Save the current settings"""
         try:
-            # Update settings from UI
-            theme_select = self.query_one("#theme-select", Select)
-            settings.ui.theme = theme_select.value
-
-            refresh_input = self.query_one("#refresh-rate-input", Input)
-            settings.ui.refresh_rate = float(refresh_input.value)
-
-            debug_switch = self.query_one("#debug-switch", Switch)
-            settings.ui.show_debug = debug_switch.value
-
-            api_url_input = self.query_one("#api-url-input", Input)
-            settings.api.base_url = api_url_input.value
-
-            api_timeout_input = self.query_one("#api-timeout-input", Input)
-            settings.api.timeout = int(api_timeout_input.value)
-
-            db_host_input = self.query_one("#db-host-input", Input)
-            settings.database.host = db_host_input.value
-
-            db_port_input = self.query_one("#db-port-input", Input)
-            settings.database.port = int(db_port_input.value)
-
-            # Save to file
-            config_path = settings.data_dir / "config.yaml"
-            settings.save_to_yaml(config_path)
+            changes = {
+                "ui": {
+                    "refresh_rate": float(
+                        self.query_one("#refresh-rate-input", Input).value
+                    ),
+                    "show_debug": self.query_one("#debug-switch", Switch).value,
+                },
+                "api": {
+                    "base_url": self.query_one("#api-url-input", Input).value,
+                    "timeout": int(self.query_one("#api-timeout-input", Input).value),
+                },
+                "database": {
+                    "host": self.query_one("#db-host-input", Input).value,
+                    "port": int(self.query_one("#db-port-input", Input).value),
+                },
+            }
+            # Written to the YAML file and published to the running services
+            get_config().update(changes)
 
             self.notify("Settings saved successfully!")
             self.action_go_back()
 
-        except Exception as e:
+        except (ConfigError, OSError, ValueError) as e:
             self.notify(f"Error saving settings: {e}", severity="error")
 
     def action_go_back(self) -> None:
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO
+
+from pytools.services.data import DataService
+from pytools.utils.stats import percentiles
+
+
+@dataclass
+class CommandResult:
+    """Outcome of one command in a batch"""
+
+    index: int
+    command: str
+    result: Optional[str] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_json(self) -> str:
+        payload = {
+            "index": self.index,
+            "command": self.command,
+            "ok": self.ok,
+            "latency_ms": round(self.latency * 1000, 3),
+        }
+        if self.ok:
+            payload["result"] = self.result
+        else:
+            payload["error"] = self.error
+        return json.dumps(payload)
+
+
+@dataclass
+class BatchStats:
+    """Throughput and latency of a finished batch"""
+
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def throughput(self) -> float:
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        """Human readable summary"""
+        latency = ", ".join(
+            f"{name}={value * 1000:.1f}ms"
+            for name, value in percentiles(self.latencies).items()
+        )
+        return (
+            f"{self.count} commands ({self.errors} failed) in {self.elapsed:.2f}s, "
+            f"{self.throughput:.1f} cmd/s, latency {latency}"
+        )
+
+
+class InvalidCommand(str):
+    """An input line that could not be parsed, reported instead of run"""
+
+    error: str
+
+    def __new__(cls, line: str, error: str) -> "InvalidCommand":
+        command = super().__new__(cls, line)
+        command.error = error
+        return command
+
+
+def read_commands(lines: Iterable[str], input_format: str = "auto") -> Iterator[str]:
+    """Parse commands from plain text or NDJSON lines
+
+    Blank lines and lines starting with '#' are skipped. NDJSON lines may be
+    a bare JSON string or an object with a "command" field; any other line
+    is yielded as an InvalidCommand so the rest of the batch still runs.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if input_format == "ndjson" or (input_format == "auto" and line[0] in '{"'):
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidCommand(line, f"Invalid JSON: {e}")
+                continue
+            if not isinstance(payload, dict):
+                yield str(payload)
+            elif isinstance(payload.get("command"), str):
+                yield payload["command"]
+            else:
+                yield InvalidCommand(line, 'Expected a "command" string')
+        else:
+            yield line
+
+
+async def run_batch(
+    service: DataService,
+    commands: Iterable[str],
+    concurrency: int,
+    on_result: Callable[[CommandResult], None],
+) -> BatchStats:
+    """Run commands through the service with at most `concurrency` in flight
+
+    Results are handed to on_result as they complete, so output streams even
+    for batches too large to hold in memory.
+    """
+    stats = BatchStats()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    pending: set[asyncio.Task] = set()
+
+    async def run_one(index: int, command: str) -> None:
+        result = CommandResult(index, command)
+        start = time.perf_counter()
+        try:
+            if isinstance(command, InvalidCommand):
+                raise ValueError(command.error)
+            result.result = await service.execute_command(command)
+        except Exception as e:
+            result.error = str(e)
+            stats.errors += 1
+        finally:
+            result.latency = time.perf_counter() - start
+            stats.latencies.append(result.latency)
+            semaphore.release()
+        on_result(result)
+
+    start = time.perf_counter()
+    for index, command in enumerate(commands):
+        await semaphore.acquire()
+        task = asyncio.create_task(run_one(index, command))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+async def run_batch_to_stream(
+    commands: Iterable[str], concurrency: int, output: TextIO
+) -> BatchStats:
+    """Run a batch with a fresh DataService, writing NDJSON results"""
+    service = DataService()
+
+    def write(result: CommandResult) -> None:
+        output.write(result.to_json() + "\n")
+
+    try:
+        return await run_batch(service, commands, concurrency, write)
+    finally:
+        output.flush()
+        await service.aclose()
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Optional
+
+from pytools.config.settings import CacheSettings
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body plus its validators
+
+    Entries are shared between threads once cached, so they are replaced
+    rather than modified.
+    """
+
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    stored_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        """Seconds since the entry was stored or revalidated"""
+        return time.time() - self.stored_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    """Counters for both cache tiers"""
+
+    memory_hits: int = 0
+    memory_misses: int = 0
+    disk_hits: int = 0
+    disk_misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        """Short human readable description"""
+        return (
+            f"memory {self.memory_hits}/{self.memory_hits + self.memory_misses} hits, "
+            f"disk {self.disk_hits}/{self.disk_hits + self.disk_misses} hits, "
+            f"{self.revalidated} revalidated, "
+            f"{self.memory_evictions + self.disk_evictions} evicted"
+        )
+
+
+class MemoryCache:
+    """Bounded LRU of cache entries, safe to use from several threads"""
+
+    def __init__(self, max_entries: int, stats: CacheStats):
+        self.max_entries = max_entries
+        self.stats = stats
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.memory_evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache:
+    """Size-bounded cache of entries stored as files under a directory
+
+    One lock covers the files and the size tally, so concurrent writers
+    of a key never share a temporary file and the tally stays exact.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, ttl: float, stats: CacheStats):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = stats
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._size = sum(p.stat().st_size for p in self.directory.glob("*.body"))
+
+    @property
+    def size(self) -> int:
+        """Bytes currently used by cached bodies"""
+        return self._size
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / f"{digest}.body", self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        body_path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                meta = json.loads(meta_path.read_text())
+                body = body_path.read_bytes()
+                entry = CacheEntry(body=body, **meta)
+                expired = entry.age() > self.ttl
+            except (OSError, ValueError, TypeError):
+                # Missing, unreadable, or written with other fields
+                self._remove(body_path, meta_path)
+                return None
+            if expired:
+                self._remove(body_path, meta_path)
+                self.stats.disk_evictions += 1
+                return None
+            # Track recency for eviction
+            os.utime(body_path)
+            return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        body_path, meta_path = self._paths(key)
+        meta = {k: v for k, v in asdict(entry).items() if k != "body"}
+        with self._lock:
+            if body_path.exists():
+                self._size -= body_path.stat().st_size
+            tmp_path = body_path.with_suffix(".tmp")
+            tmp_path.write_bytes(entry.body)
+            tmp_path.replace(body_path)
+            meta_path.write_text(json.dumps(meta))
+            self._size += len(entry.body)
+            self._evict()
+
+    def touch(self, key: str, entry: CacheEntry) -> None:
+        """Record a successful revalidation"""
+        _, meta_path = self._paths(key)
+        meta = {k: v for k, v in asdict(entry).items() if k != "body"}
+        with self._lock:
+            meta_path.write_text(json.dumps(meta))
+
+    def _remove(self, body_path: Path, meta_path: Path) -> None:
+        try:
+            self._size -= body_path.stat().st_size
+            body_path.unlink()
+        except OSError:
+            pass
+        meta_path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop least recently used bodies until under the size limit"""
+        if self._size <= self.max_bytes:
+            return
+        bodies = sorted(self.directory.glob("*.body"), key=lambda p: p.stat().st_mtime)
+        for body_path in bodies:
+            if self._size <= self.max_bytes:
+                break
+            self._remove(body_path, body_path.with_suffix(".json"))
+            self.stats.disk_evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for body_path in self.directory.glob("*.body"):
+                self._remove(body_path, body_path.with_suffix(".json"))
+
+
+class ResponseCache:
+    """Two-tier response cache: in-memory LRU over an on-disk store
+
+    Memory entries younger than memory_ttl are served without touching the
+    network; the default of 0 revalidates every request, so auto-refresh
+    polls see changes. Anything else found in either tier is revalidated
+    with If-None-Match / If-Modified-Since. Safe to call from worker threads.
+    """
+
+    def __init__(self, config: CacheSettings, data_dir: Path):
+        self.config = config
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.memory = MemoryCache(config.memory_max_entries, self.stats)
+        self.disk = (
+            DiskCache(
+                data_dir / config.disk_dir,
+                config.disk_max_bytes,
+                config.disk_ttl,
+                self.stats,
+            )
+            if config.disk_enabled
+            else None
+        )
+
+    def fresh(self, key: str) -> Optional[CacheEntry]:
+        """Entry that can be served without revalidation"""
+        entry = self.memory.get(key)
+        with self._lock:
+            if entry is not None and entry.age() < self.config.memory_ttl:
+                self.stats.memory_hits += 1
+                return entry
+            self.stats.memory_misses += 1
+        return None
+
+    def stale(self, key: str) -> Optional[CacheEntry]:
+        """Entry that may be reused after revalidation"""
+        entry = self.memory.get(key)
+        if entry is not None:
+            return entry
+        if self.disk is None:
+            return None
+        entry = self.disk.get(key)
+        with self._lock:
+            if entry is None:
+                self.stats.disk_misses += 1
+            else:
+                self.stats.disk_hits += 1
+        return entry
+
+    def store(self, key: str, entry: CacheEntry) -> None:
+        """Store a fresh response in both tiers"""
+        with self._lock:
+            self.stats.stores += 1
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.put(key, entry)
+
+    def revalidated(self, key: str, entry: CacheEntry) -> CacheEntry:
+        """Mark an entry as confirmed current by the server"""
+        with self._lock:
+            self.stats.revalidated += 1
+        entry = replace(entry, stored_at=time.time())
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.touch(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
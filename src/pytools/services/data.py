@@ -1,35 +1,443 @@
 import asyncio
-from typing import List, Dict, Any
+import contextlib
+import shlex
+import time
+from datetime import date
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Set, Tuple
 
-from pytools.config.settings import settings
+import polars as pl
+
+from pytools.config.manager import ConfigUpdate, get_config
+from pytools.config.settings import Settings, get_settings
+from pytools.services.cache import ResponseCache
+from pytools.services.database import Database
+from pytools.services.diff import DataDiff, apply_diff, diff_frames, merge_diffs
+from pytools.services.http import HttpPool
+from pytools.services.ingest import IngestProgress, iter_chunks
+from pytools.services.plugins import get_registry
+from pytools.services.schema import (
+    conform,
+    empty_frame,
+    frame_from_records,
+    sample_frame,
+    to_display,
+)
+from pytools.services.storage import load_dataset, write_dataset
+from pytools.services.store import LocalStore
+from pytools.services.summary import DataSummary
 from pytools.utils.logger import get_logger
+from pytools.utils.tracing import tracer
 
 
 class DataService:
     """Service for handling data operations"""
 
-    def __init__(self):
+    def __init__(self, http: HttpPool | None = None, settings: Settings | None = None):
         self.logger = get_logger(__name__)
-        self.data_file = settings.data_dir / "data.json"
+        self.settings = settings or get_settings()
+        self.data_file = self.settings.data_dir / "data.arrow"
+        self.http = http or HttpPool(self.settings.api, self._create_cache())
+        self._owns_http = http is None
+        self._frame: pl.DataFrame = empty_frame()
+        self.summary = DataSummary()
+        self._reports_started = False
+        self.store: Optional[LocalStore] = None
+        self.database: Optional[Database] = None
+        self._store_lock = asyncio.Lock()
+        # Store changes not yet picked up by refresh()
+        self._pending = DataDiff()
+        self._ingesting = False
+        # Replaced databases still closing
+        self._retiring: Set[asyncio.Task] = set()
         self._ensure_data_dir()
+        get_config().subscribe(self._apply_config)
+
+    def _apply_config(self, update: ConfigUpdate) -> None:
+        """Switch to a new settings snapshot
+
+        API and database settings apply to the open pools straight away;
+        the data directory, cache and store keep their settings until the
+        app restarts.
+        """
+        self.settings = update.settings
+        if update.changed("api") and self._owns_http:
+            self.http.reconfigure(update.settings.api)
+        if update.changed("database") and self.database is not None:
+            config = update.settings.database
+            if update.fields("database") <= {"pool_size", "fetch_size", "batch_size"}:
+                self.database.config = config
+                self.database.pool.resize(config.pool_size)
+            else:
+                # Connect with the new settings on next use
+                database, self.database = self.database, None
+                task = asyncio.ensure_future(database.close())
+                self._retiring.add(task)
+                task.add_done_callback(self._retired)
+        fixed = update.sections & {"data_dir", "cache", "store"}
+        if fixed:
+            self.logger.warning(
+                f"Changes to {', '.join(sorted(fixed))} apply after a restart"
+            )
+
+    def _retired(self, task: asyncio.Task) -> None:
+        self._retiring.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error(
+                f"Could not close the replaced database: {task.exception()}"
+            )
 
     def _ensure_data_dir(self) -> None:
         """Ensure data directory exists"""
-        settings.data_dir.mkdir(parents=True, exist_ok=True)
+        self.settings.data_dir.mkdir(parents=True, exist_ok=True)
+
+    def _create_cache(self) -> ResponseCache | None:
+        """Build the response cache if enabled"""
+        if not self.settings.cache.enabled:
+            return None
+        return ResponseCache(self.settings.cache, self.settings.data_dir)
+
+    @property
+    def frame(self) -> pl.DataFrame:
+        """Current dataset as a typed polars frame"""
+        return self._frame
+
+    @property
+    def row_count(self) -> int:
+        """Number of records in the dataset"""
+        return self._frame.height
+
+    def lazy(self) -> pl.LazyFrame:
+        """Lazy view over the dataset for building queries"""
+        return self._frame.lazy()
+
+    def column(self, name: str) -> pl.Series:
+        """Get a single column of the dataset"""
+        return self._frame.get_column(name)
+
+    def slice(self, offset: int, length: int | None = None) -> pl.DataFrame:
+        """Get a zero-copy slice of the dataset"""
+        return self._frame.slice(offset, length)
+
+    def display_rows(
+        self, offset: int = 0, length: int | None = None
+    ) -> Iterator[Tuple[str, ...]]:
+        """Iterate rows of a slice as display strings"""
+        return to_display(self.slice(offset, length)).iter_rows()
+
+    async def open_store(self) -> LocalStore:
+        """Open the local store, seeding a new one with the sample data"""
+        async with self._store_lock:
+            if self.store is None:
+                store = LocalStore(
+                    self.settings.data_dir / self.settings.store.dir,
+                    compact_threshold=self.settings.store.compact_threshold,
+                    fsync=self.settings.store.fsync,
+                )
+                await asyncio.to_thread(store.open)
+                if store.created:
+                    await asyncio.to_thread(store.replace, sample_frame())
+                self.store = store
+            return self.store
+
+    async def open_database(self) -> Database:
+        """Connect to the configured database, creating the table if needed"""
+        async with self._store_lock:
+            if self.database is None:
+                self.database = await Database(
+                    self.settings.database, self.settings.data_dir
+                ).open()
+            return self.database
+
+    async def _mutate(self, operation: str, *args: Any) -> DataDiff:
+        """Run a mutation on the writable source and queue its diff
+
+        Mutations go to the database when it is the data source and to the
+        local store otherwise; both return the diff for the next refresh.
+        """
+        if self.settings.data_source == "database":
+            database = await self.open_database()
+            diff = await getattr(database, operation)(*args)
+        else:
+            store = await self.open_store()
+            async with self._store_lock:
+                diff = getattr(store, operation)(*args)
+                if store.pending_entries >= store.compact_threshold:
+                    await asyncio.to_thread(store.compact)
+        self._pending = merge_diffs(self._pending, diff)
+        return diff
+
+    async def _fetch_frame(self) -> pl.DataFrame:
+        """Fetch the dataset from the configured source"""
+        if self.settings.data_source == "store":
+            store = await self.open_store()
+            self._pending = DataDiff()
+            return store.frame
+        if self.settings.data_source == "database":
+            database = await self.open_database()
+            self._pending = DataDiff()
+            return await database.fetch_frame()
+        if self.settings.data_source == "api":
+            return await self._fetch_remote()
+        if self.settings.data_source == "snapshot":
+            if not self.data_file.exists():
+                return empty_frame()
+            return await asyncio.to_thread(load_dataset, self.data_file)
+
+        if self.settings.data_source != "sample":
+            source = get_registry().get("source", self.settings.data_source)
+            if source is not None:
+                return conform(await source(self))
+            self.logger.warning(f"Unknown data source: {self.settings.data_source}")
 
-    async def get_data(self) -> List[Dict[str, Any]]:
-        """Get data (simulated)"""
         # Simulate API call or database query
         await asyncio.sleep(0.1)  # Simulate network delay
+        return sample_frame()
+
+    async def _fetch_remote(self) -> pl.DataFrame:
+        """Fetch every page of the remote collection"""
+        records = await self.http.get_paginated(
+            self.settings.api.records_path, self.settings.api.page_size
+        )
+        return frame_from_records(records)
+
+    async def _fetch_since(self, watermark: date) -> Optional[pl.DataFrame]:
+        """Records updated on or after the watermark, if the source can tell"""
+        if self.settings.data_source == "database":
+            return await (await self.open_database()).fetch_since(watermark)
+        if self.settings.data_source == "api":
+            records = await self.http.get_paginated(
+                self.settings.api.records_path,
+                self.settings.api.page_size,
+                {self.settings.api.updated_since_param: watermark.isoformat()},
+            )
+            return frame_from_records(records)
+        return None
+
+    async def export_data(self, path: Path, fmt: Optional[str] = None) -> Path:
+        """Write the current dataset as Parquet, Arrow IPC or CSV"""
+        return await asyncio.to_thread(write_dataset, self._frame, path, fmt)
 
-        # Return sample data
-        return [
-            {"id": 1, "name": "Item 1", "status": "active", "updated": "2023-01-01"},
-            {"id": 2, "name": "Item 2", "status": "pending", "updated": "2023-01-02"},
-            {"id": 3, "name": "Item 3", "status": "completed", "updated": "2023-01-03"},
-        ]
+    async def import_data(self, path: Path, fmt: Optional[str] = None) -> DataDiff:
+        """Replace the dataset with a file and persist it as the snapshot
 
+        Like other mutations, the change is queued for the next refresh()
+        rather than applied to the frame on screen.
+        """
+        new_frame = await asyncio.to_thread(load_dataset, path, fmt)
+        if self.settings.data_source == "store":
+            store = await self.open_store()
+            async with self._store_lock:
+                await asyncio.to_thread(store.replace, new_frame)
+        elif self.settings.data_source == "database":
+            await (await self.open_database()).replace(new_frame)
+        elif path.resolve() != self.data_file.resolve():
+            await asyncio.to_thread(write_dataset, new_frame, self.data_file, "ipc")
+        current = (
+            apply_diff(self._frame, self._pending)
+            if not self._pending.is_empty()
+            else self._frame
+        )
+        diff = diff_frames(current, new_frame)
+        self._pending = merge_diffs(self._pending, diff)
+        return diff
+
+    async def ingest(
+        self,
+        path: Path,
+        fmt: Optional[str] = None,
+        replace: bool = False,
+        on_progress: Optional[Callable[[IngestProgress, DataDiff], None]] = None,
+    ) -> IngestProgress:
+        """Merge a large NDJSON, CSV or JSON file into the dataset by id
+
+        The file is parsed in parallel chunks (see services.ingest);
+        on_progress gets the running totals after each chunk. Parsed rows
+        are collected and merged into the dataset in one pass at the end,
+        so the cost is linear in the input size, and that final diff is
+        passed to on_progress too. With replace, existing records are
+        dropped. The database is written chunk by chunk inside a single
+        transaction and the store is locked for the duration and written as
+        one snapshot at the end, so a failure leaves the source (and the
+        dataset) as it was. Call after get_data().
+        """
+        report = on_progress or (lambda progress, diff: None)
+        progress = IngestProgress(path, path.stat().st_size)
+        store = database = None
+        if self.settings.data_source == "store":
+            store = await self.open_store()
+        elif self.settings.data_source == "database":
+            database = await self.open_database()
+
+        lock = self._store_lock if store is not None else contextlib.nullcontext()
+        async with lock:
+            self._ingesting = True
+            try:
+                # Catch up with our own writes before merging on top
+                diff, self._pending = self._pending, DataDiff()
+                if store is not None:
+                    report(progress, self._advance(store.frame, diff))
+                elif not diff.is_empty():
+                    report(progress, self._advance(apply_diff(self._frame, diff), diff))
+
+                if database is not None:
+                    async with database.writer(clear=replace) as write:
+                        incoming = await self._ingest_chunks(
+                            path, fmt, write, progress, report
+                        )
+                else:
+                    incoming = await self._ingest_chunks(
+                        path, fmt, None, progress, report
+                    )
+
+                if replace:
+                    frame = incoming
+                    diff = diff_frames(self._frame, incoming)
+                else:
+                    ids = incoming.get_column("id").implode()
+                    diff = diff_frames(
+                        self._frame.filter(pl.col("id").is_in(ids)), incoming
+                    )
+                    frame = apply_diff(self._frame, diff)
+                if store is not None:
+                    await asyncio.to_thread(store.replace, frame)
+                elif self.settings.data_source == "snapshot":
+                    await asyncio.to_thread(write_dataset, frame, self.data_file, "ipc")
+                progress.inserted = diff.inserted.height
+                progress.updated = diff.updated.height
+                report(progress, self._advance(frame, diff))
+            finally:
+                self._ingesting = False
+        self.logger.info(progress.summary())
+        return progress
+
+    async def _ingest_chunks(
+        self,
+        path: Path,
+        fmt: Optional[str],
+        write: Optional[Callable[[pl.DataFrame], Awaitable[None]]],
+        progress: IngestProgress,
+        report: Callable[[IngestProgress, DataDiff], None],
+    ) -> pl.DataFrame:
+        """Parse a file's chunks in order, keeping the last row for each id
+
+        Each chunk is passed to write (if given) as soon as it is parsed.
+        """
+        start = time.perf_counter()
+        frames: List[pl.DataFrame] = []
+        async for result in iter_chunks(
+            path, fmt, self.settings.ingest.chunk_size, self.settings.ingest.workers
+        ):
+            if write is not None and result.frame.height:
+                await write(result.frame)
+            frames.append(result.frame)
+            progress.bytes_done += result.chunk.size
+            progress.chunks += 1
+            progress.rows += result.frame.height
+            progress.invalid += result.invalid
+            progress.elapsed = time.perf_counter() - start
+            report(progress, DataDiff())
+        # Chunks do not cover a CSV header line
+        progress.bytes_done = progress.total_bytes
+        if not frames:
+            return empty_frame()
+        return pl.concat(frames).unique("id", keep="last", maintain_order=True)
+
+    def _advance(self, frame: pl.DataFrame, diff: DataDiff) -> DataDiff:
+        """Move to a new version of the dataset, updating the summary"""
+        self._frame = frame
+        self.summary.apply(diff)
+        return diff
+
+    async def aclose(self) -> None:
+        """Release network resources owned by the service"""
+        get_config().unsubscribe(self._apply_config)
+        if self.http.cache is not None:
+            self.logger.debug(f"Cache stats: {self.http.cache.stats.summary()}")
+        self.logger.debug(f"Remote stats: {self.http.resilience.summary()}")
+        if self._owns_http:
+            await self.http.close()
+        if self.store is not None:
+            async with self._store_lock:
+                await asyncio.to_thread(self.store.maybe_compact)
+                self.store.close()
+        if self.database is not None:
+            await self.database.close()
+        if self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+        if self._reports_started:
+            from pytools.services.report import shutdown_executor
+
+            shutdown_executor()
+
+    async def export_report(
+        self, output: Optional[Path] = None, split_by: Optional[str] = None
+    ) -> List[Path]:
+        """Render the current dataset to PDF in the report process pool"""
+        # fpdf2 is only needed here, keep it off the startup path
+        from pytools.services.report import generate_report
+
+        self._reports_started = True
+        return await generate_report(
+            self._frame,
+            output or self.settings.data_dir / "report.pdf",
+            title=f"{self.settings.app_name} report",
+            split_by=split_by,
+            chunk_size=self.settings.report.chunk_size,
+            workers=self.settings.report.workers,
+            part_rows=self.settings.report.part_rows,
+        )
+
+    @tracer.traced("data.get_data")
+    async def get_data(self) -> pl.DataFrame:
+        """Load the dataset and return it"""
+        self._frame = await self._fetch_frame()
+        self.summary = DataSummary.from_frame(self._frame)
+        return self._frame
+
+    @tracer.traced("data.refresh")
+    async def refresh(self) -> DataDiff:
+        """Reload the dataset and return what changed, keyed on id"""
+        if self._ingesting:
+            # ingest() is moving the dataset; it reports its own diffs
+            return DataDiff()
+        if self.settings.data_source == "store" and self.store is not None:
+            # Store mutations are tracked as they happen, no need to diff
+            diff, self._pending = self._pending, DataDiff()
+            return self._advance(self.store.frame, diff)
+        if self.settings.data_source == "database" and not self._pending.is_empty():
+            # Apply our own writes instead of pulling the whole table again
+            diff, self._pending = self._pending, DataDiff()
+            return self._advance(apply_diff(self._frame, diff), diff)
+        new_frame = await self._fetch_frame()
+        return self._advance(new_frame, diff_frames(self._frame, new_frame))
+
+    @tracer.traced("data.poll")
+    async def poll(self) -> DataDiff:
+        """Fetch only what changed since the last update date we have
+
+        The watermark is the latest `updated` date in the dataset. Records
+        on that day are fetched again (dates have no time part) and dropped
+        by the diff if unchanged. Deletions are not visible this way; they
+        are picked up by a full refresh(). Sources without delta support
+        fall back to refresh().
+        """
+        watermark = self.summary.latest
+        if self._ingesting:
+            return DataDiff()
+        if watermark is None or not self._pending.is_empty():
+            return await self.refresh()
+        changed = await self._fetch_since(watermark)
+        if changed is None:
+            return await self.refresh()
+        ids = changed.get_column("id")
+        previous = self._frame.filter(pl.col("id").is_in(ids.implode()))
+        diff = diff_frames(previous, changed)
+        if diff.is_empty():
+            return diff
+        return self._advance(apply_diff(self._frame, diff), diff)
+
+    @tracer.traced("data.execute_command")
     async def execute_command(self, command: str) -> str:
         """Execute a command"""
         self.logger.info(f"Executing command: {command}")
@@ -38,11 +446,73 @@ class DataService:
         await asyncio.sleep(0.5)
 
         if command.lower() == "clear":
-            return "Data cleared"
+            diff = await self._mutate("clear")
+            return f"Data cleared ({diff.deleted.height} rows)"
         elif command.lower() == "refresh":
             return "Data refreshed"
+        elif command.lower() == "summary":
+            return self.summary.brief()
+        elif command.lower() == "cache":
+            if self.http.cache is None:
+                return "Cache disabled"
+            return f"Cache: {self.http.cache.stats.summary()}"
+        elif command.lower() == "remote":
+            return f"Remote: {self.http.resilience.summary()}"
+        elif command.lower().split(" ", 1)[0] == "report":
+            return await self._report_command(command.split()[1:])
+        elif command.lower().startswith("export "):
+            path = await self.export_data(Path(command[7:].strip()).expanduser())
+            return f"Exported {self.row_count} rows to {path}"
+        elif command.lower().startswith("import "):
+            path = Path(command[7:].strip()).expanduser()
+            diff = await self.import_data(path)
+            return f"Imported {path.name} ({diff.summary()})"
+        elif command.lower().startswith("ingest "):
+            progress = await self.ingest(Path(command[7:].strip()).expanduser())
+            return progress.summary()
         elif command.lower().startswith("add "):
             item_name = command[4:]
+            await self._mutate("add", item_name)
             return f"Added item: {item_name}"
+        elif command.lower().split(" ", 1)[0] in ("update", "delete"):
+            return await self._store_command(command)
         else:
+            word, _, args = command.partition(" ")
+            handler = get_registry().get("command", word.lower())
+            if handler is not None:
+                return await handler(self, args.strip())
             return f"Unknown command: {command}"
+
+    async def _store_command(self, command: str) -> str:
+        """Handle `update ID FIELD=VALUE...` and `delete ID...`"""
+        try:
+            action, *args = shlex.split(command)
+            if action.lower() == "delete":
+                ids = [int(arg) for arg in args]
+                if not ids:
+                    return "Usage: delete ID [ID...]"
+                diff = await self._mutate("delete", ids)
+                return f"Deleted {diff.deleted.height} item(s)"
+
+            if len(args) < 2 or not all("=" in arg for arg in args[1:]):
+                return "Usage: update ID FIELD=VALUE [FIELD=VALUE...]"
+            record_id = int(args[0])
+            changes = dict(arg.split("=", 1) for arg in args[1:])
+            diff = await self._mutate("update", record_id, changes)
+        except KeyError as e:
+            return f"No item with id {e.args[0]}"
+        except ValueError as e:
+            return f"Invalid command: {e}"
+        return f"Updated item {record_id}" if diff.updated.height else "No changes"
+
+    async def _report_command(self, args: List[str]) -> str:
+        """Handle `report [PATH] [by COLUMN]`"""
+        split_by = None
+        if len(args) >= 2 and args[-2].lower() == "by":
+            split_by = args[-1]
+            args = args[:-2]
+        output = Path(args[0]).expanduser() if args else None
+        paths = await self.export_report(output, split_by)
+        if len(paths) == 1:
+            return f"Report written to {paths[0]}"
+        return f"{len(paths)} reports written to {paths[0].parent}"
@@ -0,0 +1,457 @@
+import asyncio
+import itertools
+from contextlib import asynccontextmanager
+from datetime import date
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+import polars as pl
+
+from pytools.config.settings import DatabaseConfig
+from pytools.services.diff import DataDiff
+from pytools.services.schema import COLUMNS, conform, empty_frame, frame_from_records
+from pytools.utils.logger import get_logger
+
+T = TypeVar("T")
+Row = Dict[str, Any]
+
+# Upper bound on bound parameters per IN (...) list
+IN_BATCH = 500
+
+
+class ConnectionPool:
+    """Bounded pool of blocking DB-API connections for asyncio code
+
+    Connections are opened lazily up to size. Each checked-out connection is
+    used by one thread at a time, so drivers without thread affinity
+    (sqlite3 with check_same_thread=False, psycopg) are safe to drive
+    through asyncio.to_thread.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 4):
+        self._connect = connect
+        self._limit = max(size, 1)
+        self._slots = asyncio.Semaphore(self._limit)
+        # Slots to take out of circulation after the limit was lowered
+        self._debt = 0
+        self._idle: List[Any] = []
+        self._connections: List[Any] = []
+
+    @property
+    def size(self) -> int:
+        """Connections opened so far"""
+        return len(self._connections)
+
+    def resize(self, size: int) -> None:
+        """Change the connection limit
+
+        A lower limit takes slots out of circulation as checkouts return
+        them, so no more than size are ever checked out once those in
+        progress finish; connections beyond it are closed, not kept idle.
+        """
+        size = max(size, 1)
+        change, self._limit = size - self._limit, size
+        if change < 0:
+            self._debt -= change
+            return
+        repaid = min(change, self._debt)
+        self._debt -= repaid
+        for _ in range(change - repaid):
+            self._slots.release()
+
+    async def _take_slot(self) -> None:
+        await self._slots.acquire()
+        while self._debt:
+            # Keep this slot to shrink the pool, and wait for another
+            self._debt -= 1
+            await self._slots.acquire()
+
+    def _give_slot(self) -> None:
+        if self._debt:
+            self._debt -= 1
+        else:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """Check out a connection, rolling back on error"""
+        await self._take_slot()
+        try:
+            while self._idle and self.size > self._limit:
+                await self._discard(self._idle.pop())
+            if self._idle:
+                conn = self._idle.pop()
+            else:
+                conn = await asyncio.to_thread(self._connect)
+                self._connections.append(conn)
+            try:
+                yield conn
+            except BaseException:
+                await asyncio.to_thread(conn.rollback)
+                raise
+            finally:
+                if self.size > self._limit:
+                    await self._discard(conn)
+                else:
+                    self._idle.append(conn)
+        finally:
+            self._give_slot()
+
+    async def _discard(self, conn: Any) -> None:
+        self._connections.remove(conn)
+        await asyncio.to_thread(conn.close)
+
+    async def run(self, work: Callable[[Any], T]) -> T:
+        """Run work(connection) in a thread and commit"""
+        async with self.acquire() as conn:
+
+            def transaction() -> T:
+                result = work(conn)
+                conn.commit()
+                return result
+
+            return await asyncio.to_thread(transaction)
+
+    async def close(self) -> None:
+        """Close idle connections; checked-out ones close when returned"""
+        self._limit = 0
+        while self._idle:
+            await self._discard(self._idle.pop())
+
+
+class Database:
+    """Record table in SQLite or PostgreSQL, read and written in bulk
+
+    Reads go through cursor.fetchmany() and each chunk of tuples becomes a
+    polars frame straight away, so at most fetch_size rows exist as Python
+    objects at once; on PostgreSQL the cursor is server-side, so the client
+    only receives one chunk at a time. iter_frames() yields the chunks, while
+    fetch_frame() and fetch_since() collect them into one frame. Writes use
+    executemany() in batch_size batches.
+    Statements are fixed strings per table, which sqlite3 keeps in its
+    per-connection statement cache and psycopg prepares server-side.
+
+    New ids come from MAX(id) + 1 on SQLite, whose writers are serialized
+    by the database lock, and from an identity column on PostgreSQL, where
+    concurrent inserts would otherwise pick the same id.
+    """
+
+    def __init__(self, config: DatabaseConfig, data_dir: Path):
+        if not config.table.isidentifier():
+            raise ValueError(f"Invalid table name: {config.table}")
+        self.logger = get_logger(__name__)
+        self.config = config
+        self.data_dir = data_dir
+        self.pool = ConnectionPool(self._connect, config.pool_size)
+        self._cursor_names = itertools.count(1)
+        self._param = "?" if config.driver == "sqlite" else "%s"
+        # sqlite returns dates as ISO strings, conform() parses them
+        self._raw_schema = {
+            "id": pl.Int64,
+            "name": pl.String,
+            "status": pl.String,
+            "updated": pl.String if config.driver == "sqlite" else pl.Date,
+        }
+
+        table, p = config.table, self._param
+        columns = ", ".join(COLUMNS)
+        id_column = "id BIGINT PRIMARY KEY"
+        if config.driver == "postgresql":
+            # BY DEFAULT, as upserts and imports bring their own ids
+            id_column = "id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+        self.sql_create = (
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"({id_column}, name TEXT, status TEXT, updated DATE)"
+        )
+        self.sql_select = f"SELECT {columns} FROM {table} ORDER BY id"
+        self.sql_since = (
+            f"SELECT {columns} FROM {table} WHERE updated >= {p} ORDER BY id"
+        )
+        self.sql_upsert = (
+            f"INSERT INTO {table} ({columns}) VALUES ({p}, {p}, {p}, {p}) "
+            "ON CONFLICT (id) DO UPDATE SET name = excluded.name, "
+            "status = excluded.status, updated = excluded.updated"
+        )
+        if config.driver == "postgresql":
+            self.sql_add = (
+                f"INSERT INTO {table} (name, status, updated) "
+                f"VALUES ({p}, {p}, {p}) RETURNING {columns}"
+            )
+        else:
+            self.sql_add = (
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT COALESCE(MAX(id), 0) + 1, {p}, {p}, {p} FROM {table} "
+                f"RETURNING {columns}"
+            )
+        # Moves the identity past explicitly written ids, never backwards
+        sequence = f"pg_get_serial_sequence('{table}', 'id')"
+        self.sql_sync_identity = (
+            f"SELECT setval({sequence}, GREATEST("
+            f"(SELECT COALESCE(MAX(id), 0) FROM {table}), nextval({sequence})))"
+        )
+        self.sql_clear = f"DELETE FROM {table} RETURNING {columns}"
+
+    def _connect(self) -> Any:
+        if self.config.driver == "sqlite":
+            import sqlite3
+
+            path = Path(self.config.sqlite_path).expanduser()
+            if not path.is_absolute():
+                path = self.data_dir / path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            return sqlite3.connect(path, check_same_thread=False, cached_statements=256)
+
+        if self.config.driver == "postgresql":
+            try:
+                import psycopg
+            except ImportError:
+                raise RuntimeError(
+                    "The postgresql driver needs psycopg: pip install 'psycopg[binary]'"
+                ) from None
+            return psycopg.connect(
+                host=self.config.host,
+                port=self.config.port,
+                dbname=self.config.name,
+                user=self.config.username,
+                password=self.config.password,
+                prepare_threshold=0,
+            )
+        raise ValueError(f"Unsupported database driver: {self.config.driver}")
+
+    async def open(self) -> "Database":
+        """Create the record table if needed"""
+
+        def work(conn: Any) -> None:
+            conn.execute(self.sql_create)
+            if self.config.driver != "postgresql":
+                return
+            sequence = conn.execute(
+                "SELECT pg_get_serial_sequence(%s, 'id')", (self.config.table,)
+            ).fetchone()[0]
+            if sequence is None:
+                # Table created before ids came from an identity column
+                conn.execute(
+                    f"ALTER TABLE {self.config.table} "
+                    "ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY"
+                )
+                conn.execute(self.sql_sync_identity)
+
+        await self.pool.run(work)
+        return self
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    def _to_frame(self, rows: List[tuple]) -> pl.DataFrame:
+        return conform(pl.DataFrame(rows, schema=self._raw_schema, orient="row"))
+
+    def _to_params(self, frame: pl.DataFrame) -> List[tuple]:
+        exprs = [pl.col("id"), pl.col("name"), pl.col("status").cast(pl.String)]
+        if self.config.driver == "sqlite":
+            exprs.append(pl.col("updated").cast(pl.String))
+        else:
+            exprs.append(pl.col("updated"))
+        return frame.select(exprs).rows()
+
+    def _fetch(self, cursor: Any) -> pl.DataFrame:
+        """Drain a cursor in fetch_size chunks into one frame"""
+        frames = []
+        while rows := cursor.fetchmany(self.config.fetch_size):
+            frames.append(self._to_frame(rows))
+        return pl.concat(frames) if frames else empty_frame()
+
+    def _next_chunk(self, cursor: Any, size: int) -> Optional[pl.DataFrame]:
+        rows = cursor.fetchmany(size)
+        return self._to_frame(rows) if rows else None
+
+    def _open_cursor(self, conn: Any, query: str, params: tuple) -> Any:
+        """Execute a read on a cursor that fetchmany() pulls from in chunks"""
+        if self.config.driver == "postgresql":
+            # Named, so psycopg keeps the result on the server
+            cursor = conn.cursor(name=f"pytools_read_{next(self._cursor_names)}")
+        else:
+            cursor = conn.cursor()
+        cursor.execute(query, params)
+        return cursor
+
+    def _in(self, count: int) -> str:
+        return ", ".join([self._param] * count)
+
+    async def iter_frames(
+        self, query: Optional[str] = None, params: tuple = (), chunk_size: int = 0
+    ) -> AsyncIterator[pl.DataFrame]:
+        """Stream a query as record frames of at most chunk_size rows"""
+        chunk_size = chunk_size or self.config.fetch_size
+        async with self.pool.acquire() as conn:
+            cursor = await asyncio.to_thread(
+                self._open_cursor, conn, query or self.sql_select, params
+            )
+            try:
+                while True:
+                    frame = await asyncio.to_thread(
+                        self._next_chunk, cursor, chunk_size
+                    )
+                    if frame is None:
+                        break
+                    yield frame
+            finally:
+                cursor.close()
+                # End the read transaction so the connection sees new writes
+                await asyncio.to_thread(conn.rollback)
+
+    async def fetch_frame(self) -> pl.DataFrame:
+        """Read the whole table into one frame"""
+        frames = [frame async for frame in self.iter_frames()]
+        if not frames:
+            return empty_frame()
+        return pl.concat(frames, rechunk=True)
+
+    async def fetch_since(self, watermark: date) -> pl.DataFrame:
+        """Read the records updated on or after a date into one frame"""
+        value = watermark.isoformat() if self.config.driver == "sqlite" else watermark
+        frames = [frame async for frame in self.iter_frames(self.sql_since, (value,))]
+        return pl.concat(frames) if frames else empty_frame()
+
+    def _select_ids(self, conn: Any, ids: List[int]) -> pl.DataFrame:
+        frames = []
+        for start in range(0, len(ids), IN_BATCH):
+            batch = ids[start : start + IN_BATCH]
+            cursor = conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM {self.config.table} "
+                f"WHERE id IN ({self._in(len(batch))})",
+                batch,
+            )
+            frames.append(self._fetch(cursor))
+        return pl.concat(frames) if frames else empty_frame()
+
+    def _write(self, conn: Any, frame: pl.DataFrame) -> None:
+        params = self._to_params(frame)
+        size = self.config.batch_size
+        cursor = conn.cursor()
+        for start in range(0, len(params), size):
+            cursor.executemany(self.sql_upsert, params[start : start + size])
+        if params and self.config.driver == "postgresql":
+            cursor.execute(self.sql_sync_identity)
+        cursor.close()
+
+    async def write_frame(self, frame: pl.DataFrame) -> int:
+        """Bulk upsert a frame, returning the number of rows written"""
+        await self.pool.run(lambda conn: self._write(conn, frame))
+        return frame.height
+
+    async def replace(self, frame: pl.DataFrame) -> None:
+        """Replace the table contents with a frame in one transaction"""
+
+        def work(conn: Any) -> None:
+            conn.execute(f"DELETE FROM {self.config.table}")
+            self._write(conn, frame)
+
+        await self.pool.run(work)
+
+    @asynccontextmanager
+    async def writer(
+        self, clear: bool = False
+    ) -> AsyncIterator[Callable[[pl.DataFrame], Awaitable[None]]]:
+        """Upsert frames in one transaction, committed when the block ends
+
+        With clear, the table is emptied first. An error inside the block
+        rolls back everything written in it, the clear included.
+        """
+        async with self.pool.acquire() as conn:
+            if clear:
+                await asyncio.to_thread(
+                    conn.execute, f"DELETE FROM {self.config.table}"
+                )
+
+            async def write(frame: pl.DataFrame) -> None:
+                await asyncio.to_thread(self._write, conn, frame)
+
+            yield write
+            await asyncio.to_thread(conn.commit)
+
+    async def get(self, record_id: int) -> Optional[Row]:
+        """One record by id, or None"""
+        frame = await self.pool.run(lambda conn: self._select_ids(conn, [record_id]))
+        return frame.row(0, named=True) if frame.height else None
+
+    async def add(self, name: str) -> DataDiff:
+        """Insert a new record with the next free id"""
+
+        def work(conn: Any) -> pl.DataFrame:
+            today = date.today()
+            updated = today.isoformat() if self.config.driver == "sqlite" else today
+            return self._fetch(conn.execute(self.sql_add, (name, "active", updated)))
+
+        return DataDiff(inserted=await self.pool.run(work))
+
+    async def upsert(self, records: Iterable[Row]) -> DataDiff:
+        """Insert or replace whole records, returning what changed"""
+        frame = frame_from_records(records)
+        frame = frame.filter(pl.col("id").is_not_null())
+        frame = frame.unique("id", keep="last", maintain_order=True)
+        if frame.is_empty():
+            return DataDiff()
+
+        def work(conn: Any) -> DataDiff:
+            existing = self._select_ids(conn, frame.get_column("id").to_list())
+            old = {row["id"]: row for row in existing.iter_rows(named=True)}
+            rows = frame.to_dicts()
+            changed = [row for row in rows if old.get(row["id"]) != row]
+            if not changed:
+                return DataDiff()
+            self._write(conn, frame_from_records(changed))
+            return DataDiff(
+                inserted=frame_from_records(r for r in changed if r["id"] not in old),
+                updated=frame_from_records(r for r in changed if r["id"] in old),
+                replaced=frame_from_records(
+                    old[r["id"]] for r in changed if r["id"] in old
+                ),
+            )
+
+        return await self.pool.run(work)
+
+    async def update(self, record_id: int, changes: Row) -> DataDiff:
+        """Change some fields of one record"""
+        row = await self.get(record_id)
+        if row is None:
+            raise KeyError(record_id)
+        invalid = set(changes) - set(COLUMNS[1:])
+        if invalid:
+            raise ValueError(f"Cannot set field(s): {', '.join(sorted(invalid))}")
+        return await self.upsert([{**row, **changes}])
+
+    async def delete(self, ids: Iterable[int]) -> DataDiff:
+        """Delete records by id, ignoring unknown ids"""
+        ids = list(dict.fromkeys(ids))
+
+        def work(conn: Any) -> pl.DataFrame:
+            frames = []
+            for start in range(0, len(ids), IN_BATCH):
+                batch = ids[start : start + IN_BATCH]
+                cursor = conn.execute(
+                    f"DELETE FROM {self.config.table} "
+                    f"WHERE id IN ({self._in(len(batch))}) "
+                    f"RETURNING {', '.join(COLUMNS)}",
+                    batch,
+                )
+                frames.append(self._fetch(cursor))
+            return pl.concat(frames) if frames else empty_frame()
+
+        return DataDiff(deleted=await self.pool.run(work))
+
+    async def clear(self) -> DataDiff:
+        """Delete every record"""
+        deleted = await self.pool.run(
+            lambda conn: self._fetch(conn.execute(self.sql_clear))
+        )
+        return DataDiff(deleted=deleted)
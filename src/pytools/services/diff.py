@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+
+import polars as pl
+
+from pytools.services.schema import COLUMNS, empty_frame
+
+
+@dataclass(frozen=True)
+class DataDiff:
+    """Row-level changes between two versions of the dataset, keyed on id"""
+
+    inserted: pl.DataFrame = field(default_factory=empty_frame)
+    updated: pl.DataFrame = field(default_factory=empty_frame)
+    deleted: pl.DataFrame = field(default_factory=empty_frame)
+    # Previous values of the updated rows
+    replaced: pl.DataFrame = field(default_factory=empty_frame)
+
+    @property
+    def change_count(self) -> int:
+        """Total number of changed rows"""
+        return self.inserted.height + self.updated.height + self.deleted.height
+
+    def is_empty(self) -> bool:
+        """Whether nothing changed"""
+        return self.change_count == 0
+
+    def summary(self) -> str:
+        """Short human readable description"""
+        return f"+{self.inserted.height} ~{self.updated.height} -{self.deleted.height}"
+
+
+def _last_per_key(frame: pl.DataFrame, key: str = "id") -> pl.DataFrame:
+    """frame with only the last row of each repeated key"""
+    if not frame.get_column(key).is_duplicated().any():
+        return frame
+    return frame.unique(key, keep="last", maintain_order=True)
+
+
+def diff_frames(old: pl.DataFrame, new: pl.DataFrame, key: str = "id") -> DataDiff:
+    """Compute the keyed diff that turns old into new
+
+    A key repeated within a frame counts once, with its last row, as when
+    ingesting; otherwise the join would multiply its rows.
+    """
+    old, new = _last_per_key(old, key), _last_per_key(new, key)
+    if old.is_empty():
+        return DataDiff(inserted=new)
+    if new.is_empty():
+        return DataDiff(deleted=old)
+
+    inserted = new.join(old.select(key), on=key, how="anti", maintain_order="left")
+    deleted = old.join(new.select(key), on=key, how="anti", maintain_order="left")
+
+    values = [name for name in COLUMNS if name != key]
+    changed = pl.any_horizontal(
+        pl.col(name).ne_missing(pl.col(f"{name}_old")) for name in values
+    )
+    joined = new.join(
+        old, on=key, how="inner", suffix="_old", maintain_order="left"
+    ).filter(changed)
+    updated = joined.select(COLUMNS)
+    replaced = joined.select(
+        pl.col(key), *(pl.col(f"{name}_old").alias(name) for name in values)
+    )
+    return DataDiff(
+        inserted=inserted, updated=updated, deleted=deleted, replaced=replaced
+    )
+
+
+def _without(frame: pl.DataFrame, ids: pl.Series, key: str = "id") -> pl.DataFrame:
+    """Rows of frame whose key is not in ids"""
+    if frame.is_empty() or ids.is_empty():
+        return frame
+    return frame.filter(~pl.col(key).is_in(ids.implode()))
+
+
+def _overlay(
+    frame: pl.DataFrame, values: pl.DataFrame, key: str = "id"
+) -> pl.DataFrame:
+    """Replace rows of frame with rows of values sharing the same key"""
+    if frame.is_empty() or values.is_empty():
+        return frame
+    return frame.update(values, on=key, include_nulls=True)
+
+
+def apply_diff(frame: pl.DataFrame, diff: DataDiff, key: str = "id") -> pl.DataFrame:
+    """Apply a diff to a frame: drop deleted, update in place, append inserted"""
+    frame = _without(frame, diff.deleted.get_column(key), key)
+    frame = _overlay(frame, diff.updated, key)
+    if not diff.inserted.is_empty():
+        frame = pl.concat([frame, diff.inserted])
+    return frame
+
+
+def merge_diffs(first: DataDiff, second: DataDiff, key: str = "id") -> DataDiff:
+    """Combine two consecutive diffs into one with the same net effect"""
+    if first.is_empty():
+        return second
+    if second.is_empty():
+        return first
+
+    inserted_ids = first.inserted.get_column(key)
+    deleted_ids = second.deleted.get_column(key)
+
+    # Rows inserted then changed stay inserts, with their latest values
+    inserted = _overlay(_without(first.inserted, deleted_ids, key), second.updated, key)
+    inserted = pl.concat([inserted, second.inserted])
+
+    updated = _overlay(_without(first.updated, deleted_ids, key), second.updated, key)
+    newly_updated = _without(
+        _without(second.updated, inserted_ids, key), first.updated.get_column(key), key
+    )
+    updated = pl.concat([updated, newly_updated])
+    replaced = pl.concat(
+        [
+            _without(first.replaced, deleted_ids, key),
+            _without(
+                _without(second.replaced, inserted_ids, key),
+                first.updated.get_column(key),
+                key,
+            ),
+        ]
+    )
+
+    # Rows inserted then deleted never existed as far as the consumer knows;
+    # rows updated then deleted are reported with their original values
+    deleted = _overlay(_without(second.deleted, inserted_ids, key), first.replaced, key)
+    deleted = pl.concat([first.deleted, deleted])
+    return DataDiff(
+        inserted=inserted, updated=updated, deleted=deleted, replaced=replaced
+    )
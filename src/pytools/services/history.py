@@ -0,0 +1,241 @@
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pytools.config.settings import HistorySettings
+from pytools.utils.logger import get_logger
+
+
+class CommandHistory:
+    """Command history shared by the TUI and the CLI, persisted to a file
+
+    Commands are kept once each, most recent last: running a command again
+    moves it to the end, and the oldest are dropped past max_entries. The
+    file is append-only; add() only queues the line and a background timer
+    writes queued lines in one batch every flush_interval, so recording a
+    command never waits on the disk. load() compacts a file that has grown
+    to more than twice its live entries.
+
+    In memory, entries live in append-only slots; moving or dropping a
+    command just empties its old slot. Searching goes through a corpus of
+    every slot, lowercased and UTF-8 encoded, joined by newlines, plus each
+    slot's start offset: a substring or (newline + prefix) match is one
+    bytearray.rfind, mapped back to a slot by bisecting the offsets. New
+    commands are appended to the corpus in place on the next search, and
+    slots are compacted once more than half are empty, so each add costs
+    O(1) amortized.
+
+    load() usually runs on a worker thread while the TUI is already taking
+    commands, so the index is built aside and swapped in under the lock,
+    which also guards every read and change. Commands added before the
+    file is loaded are replayed on top of it.
+    """
+
+    def __init__(self, path: Optional[Path], config: HistorySettings):
+        self.logger = get_logger(__name__)
+        self.path = path
+        self.config = config
+        self.loaded = False
+        self._slots: List[Optional[str]] = []
+        self._slot_of: Dict[str, int] = {}
+        self._first = 0
+        self._corpus = bytearray()
+        self._offsets: List[int] = []
+        self._indexed = 0
+        self._pending: List[str] = []
+        self._early: List[str] = []
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._slot_of)
+
+    def load(self) -> None:
+        """Read the history file, compacting it if it has many duplicates"""
+        if self.loaded:
+            return
+        lines: List[str] = []
+        if self.path is not None and self.path.exists():
+            with open(self.path, encoding="utf-8", errors="replace") as f:
+                lines = [line.rstrip("\n") for line in f]
+        # Keep the last occurrence of each command, in order
+        commands = list(dict.fromkeys(c for c in reversed(lines) if c))
+        commands = commands[: self.config.max_entries][::-1]
+        index = _build_index(commands)
+        with self._lock:
+            self._install(index)
+            for command in self._early:
+                self._remember(command)
+            self._early = []
+            self.loaded = True
+        if len(lines) > 2 * len(commands) and len(lines) > 1000:
+            self._rewrite()
+
+    def _install(self, index: "Index") -> None:
+        self._slots, self._slot_of, self._corpus, self._offsets = index
+        self._first = 0
+        self._indexed = len(self._slots)
+
+    def _remember(self, command: str) -> None:
+        slot = self._slot_of.get(command)
+        if slot is not None:
+            self._slots[slot] = None
+        self._slot_of[command] = len(self._slots)
+        self._slots.append(command)
+        while len(self._slot_of) > self.config.max_entries:
+            oldest = self._slots[self._first]
+            if oldest is not None:
+                del self._slot_of[oldest]
+                self._slots[self._first] = None
+            self._first += 1
+        if len(self._slots) > 2 * len(self._slot_of) + 1000:
+            self._install(_build_index(self.entries()))
+
+    def add(self, command: str) -> None:
+        """Record a command and queue it for writing"""
+        command = " ".join(command.splitlines()).strip()
+        if not command:
+            return
+        with self._lock:
+            if self.loaded:
+                self._remember(command)
+            else:
+                self._early.append(command)
+                # Only the newest max_entries can survive the replay
+                if len(self._early) > 2 * self.config.max_entries:
+                    del self._early[: -self.config.max_entries]
+            if self.path is None:
+                return
+            self._pending.append(command)
+            if self._timer is None:
+                self._timer = threading.Timer(self.config.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def record(self, commands: Iterable[str]) -> Iterator[str]:
+        """Pass commands through, adding each to the history"""
+        for command in commands:
+            self.add(command)
+            yield command
+
+    def flush(self) -> None:
+        """Append queued commands to the file"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._timer = None
+        if not pending or self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{command}\n" for command in pending))
+        except OSError as e:
+            self.logger.warning(f"Could not write history to {self.path}: {e}")
+
+    def close(self) -> None:
+        """Cancel the pending timer and write everything queued"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        self.flush()
+
+    def _rewrite(self) -> None:
+        """Replace the file with the live entries only"""
+        self.flush()
+        tmp_path = self.path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("".join(f"{command}\n" for command in self.entries()))
+            tmp_path.replace(self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not compact history {self.path}: {e}")
+
+    def entries(self) -> List[str]:
+        """All commands, oldest first"""
+        with self._lock:
+            return [c for c in self._slots[self._first :] if c is not None]
+
+    def _index(self) -> None:
+        """Append slots added since the last search to the corpus"""
+        if self._indexed == len(self._slots):
+            return
+        for command in self._slots[self._indexed :]:
+            # bytearray grows in place, unlike str +=
+            self._corpus += b"\n"
+            self._offsets.append(len(self._corpus))
+            self._corpus += (command or "").lower().encode()
+        self._indexed = len(self._slots)
+
+    def _find(
+        self, needle: bytes, before: Optional[int], skip: int = 0
+    ) -> Optional[Tuple[int, str]]:
+        self._index()
+        end = len(self._corpus)
+        if before is not None and before < len(self._offsets):
+            end = self._offsets[before] - 1
+        while True:
+            position = self._corpus.rfind(needle, 0, end)
+            if position < 0:
+                return None
+            slot = bisect_right(self._offsets, position + skip) - 1
+            if slot < self._first:
+                return None
+            command = self._slots[slot]
+            if command is not None:
+                return slot, command
+            # A moved or dropped command; keep looking further back
+            end = self._offsets[slot] - 1
+
+    def search(
+        self, text: str, before: Optional[int] = None
+    ) -> Optional[Tuple[int, str]]:
+        """Most recent (position, command) containing text, ignoring case
+
+        With before, only entries older than that position are considered,
+        so passing the last result's position steps back through matches.
+        """
+        with self._lock:
+            return self._find(text.lower().encode(), before)
+
+    def complete(self, prefix: str) -> Optional[str]:
+        """Most recent command starting with prefix, ignoring case"""
+        if not prefix:
+            return None
+        # Skip the newline to land on the matching entry's first character
+        with self._lock:
+            match = self._find(b"\n" + prefix.lower().encode(), None, skip=1)
+        return match[1] if match is not None else None
+
+
+# Slots, slot of each command, search corpus and slot offsets into it
+Index = Tuple[List[Optional[str]], Dict[str, int], bytearray, List[int]]
+
+
+def _build_index(commands: List[str]) -> Index:
+    """Search structures for a list of distinct commands"""
+    lowered = [command.lower().encode() for command in commands]
+    lengths = (len(command) + 1 for command in lowered)
+    return (
+        list(commands),
+        {command: slot for slot, command in enumerate(commands)},
+        bytearray(b"\n" + b"\n".join(lowered)) if commands else bytearray(),
+        list(accumulate(lengths, initial=1))[:-1] if commands else [],
+    )
+
+
+_history: Optional[CommandHistory] = None
+
+
+def get_history() -> CommandHistory:
+    """The process-wide history, stored under settings.data_dir"""
+    global _history
+    if _history is None:
+        from pytools.config.settings import get_settings
+
+        settings = get_settings()
+        path = settings.data_dir / settings.history.file
+        _history = CommandHistory(path, settings.history)
+    return _history
@@ -0,0 +1,230 @@
+import asyncio
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import niquests
+
+from pytools.config.settings import APISettings
+from pytools.services.cache import CacheEntry, ResponseCache
+from pytools.services.resilience import OPEN, CircuitOpenError, Resilience
+from pytools.utils.logger import get_logger
+
+# Settings baked into an open session
+SESSION_FIELDS = ("base_url", "api_key", "multiplexed", "max_hosts", "max_connections")
+
+
+class HttpPool:
+    """Long-lived async HTTP session shared by all remote calls
+
+    The session is opened on first use and reused until close(), so TLS and
+    TCP setup are paid once per app rather than once per refresh. With
+    multiplexing enabled, concurrent requests share HTTP/2 connections.
+    Requests go through a Resilience layer keyed by URL; while an
+    endpoint's breaker is open, get_json answers from the cache.
+    """
+
+    def __init__(self, api: APISettings, cache: Optional[ResponseCache] = None):
+        self.logger = get_logger(__name__)
+        self.api = api
+        self.cache = cache
+        self.resilience = Resilience(api, _retryable)
+        self._session: Optional[niquests.AsyncSession] = None
+        self._semaphore = asyncio.Semaphore(api.max_concurrency)
+        self._retiring: Set[asyncio.Task] = set()
+
+    @property
+    def session(self) -> niquests.AsyncSession:
+        """The shared session, created on first use"""
+        if self._session is None:
+            self._session = self._open()
+        return self._session
+
+    def _open(self) -> niquests.AsyncSession:
+        """Create the underlying session"""
+        session = niquests.AsyncSession(
+            multiplexed=self.api.multiplexed,
+            pool_connections=self.api.max_hosts,
+            pool_maxsize=self.api.max_connections,
+        )
+        session.headers["Accept"] = "application/json"
+        if self.api.api_key:
+            session.headers["Authorization"] = f"Bearer {self.api.api_key}"
+        self.logger.debug(
+            f"Opened HTTP pool for {self.api.base_url} "
+            f"(max_connections={self.api.max_connections})"
+        )
+        return session
+
+    def reconfigure(self, api: APISettings) -> None:
+        """Apply new API settings to the running pool
+
+        A new concurrency limit applies to requests started from now on.
+        When a setting baked into the session changes, the next request
+        opens a new session; the old one is closed once the requests
+        already using it have finished.
+        """
+        old, self.api = self.api, api
+        self.resilience.reconfigure(api)
+        reopen = self._session is not None and any(
+            getattr(old, f) != getattr(api, f) for f in SESSION_FIELDS
+        )
+        if not reopen and api.max_concurrency == old.max_concurrency:
+            return
+        # Requests in flight release the semaphore they acquired
+        semaphore, self._semaphore = (
+            self._semaphore,
+            asyncio.Semaphore(api.max_concurrency),
+        )
+        if reopen:
+            session, self._session = self._session, None
+            task = asyncio.ensure_future(
+                self._retire(session, semaphore, old.max_concurrency)
+            )
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    async def _retire(
+        self, session: niquests.AsyncSession, semaphore: asyncio.Semaphore, slots: int
+    ) -> None:
+        """Close a replaced session once every request holding it is done"""
+        for _ in range(slots):
+            await semaphore.acquire()
+        await session.close()
+        self.logger.debug(f"Closed HTTP pool for {self.api.base_url}")
+
+    def url(self, path: str) -> str:
+        """Resolve a path against the configured base URL"""
+        if path.startswith(("http://", "https://")):
+            return path
+        return f"{self.api.base_url.rstrip('/')}/{path.lstrip('/')}"
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> niquests.Response:
+        """Send a GET request through the pool
+
+        Server errors and connection failures are retried; a 5xx or 429
+        still failing after the last retry raises HTTPError.
+        """
+        url = self.url(path)
+        async with self._semaphore:
+            return await self.resilience.call(
+                url, lambda: self._send(url, params, headers)
+            )
+
+    async def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+    ) -> niquests.Response:
+        """One request attempt"""
+        response = await self.session.get(
+            url, params=params, headers=headers, timeout=self.api.timeout
+        )
+        if self.api.multiplexed:
+            # Multiplexed responses are lazy until gathered
+            await self.session.gather(response)
+        if response.status_code >= 500 or response.status_code == 429:
+            response.raise_for_status()
+        return response
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """GET a path and decode the JSON body, going through the cache"""
+        if self.cache is None:
+            response = await self.get(path, params=params)
+            response.raise_for_status()
+            return response.json()
+
+        key = self._cache_key(path, params)
+        entry = self.cache.fresh(key)
+        if entry is not None:
+            return json.loads(entry.body)
+
+        stale = await asyncio.to_thread(self.cache.stale, key)
+        headers = stale.validators() if stale is not None else None
+        try:
+            response = await self.get(path, params=params, headers=headers)
+        except Exception as e:
+            breaker = self.resilience.breaker(self.url(path))
+            if stale is None or not (
+                isinstance(e, CircuitOpenError) or breaker.state == OPEN
+            ):
+                raise
+            self.resilience.stats.stale_served += 1
+            self.logger.warning(f"Serving cached {key} ({e})")
+            return json.loads(stale.body)
+        if response.status_code == 304 and stale is not None:
+            entry = await asyncio.to_thread(self.cache.revalidated, key, stale)
+            return json.loads(entry.body)
+
+        response.raise_for_status()
+        entry = CacheEntry(
+            body=response.content or b"",
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        await asyncio.to_thread(self.cache.store, key, entry)
+        return json.loads(entry.body)
+
+    def _cache_key(self, path: str, params: Optional[Dict[str, Any]]) -> str:
+        """Stable cache key for a request"""
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{self.url(path)}?{query}"
+
+    async def get_many(self, path: str, params: Iterable[Dict[str, Any]]) -> List[Any]:
+        """GET the same path with several parameter sets concurrently"""
+        return await asyncio.gather(*(self.get_json(path, p) for p in params))
+
+    async def get_paginated(
+        self, path: str, page_size: int, params: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """Fetch every page of a paginated collection
+
+        The first page reports the total, the remaining pages are fanned
+        out concurrently (bounded by api.max_concurrency). A server that
+        caps the page size below page_size is paged at its own size.
+        """
+        params = params or {}
+        first = await self.get_json(path, {**params, "offset": 0, "limit": page_size})
+        items, total = _unpack_page(first)
+        step = min(len(items), page_size) or page_size
+        offsets = range(len(items), total, step) if total else []
+        pages = await self.get_many(
+            path, ({**params, "offset": offset, "limit": step} for offset in offsets)
+        )
+        for page in pages:
+            items.extend(_unpack_page(page)[0])
+        return items
+
+    async def close(self) -> None:
+        """Close the session and its connections"""
+        for task in list(self._retiring):
+            task.cancel()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def _retryable(error: Exception) -> bool:
+    """Whether a failed request is worth retrying"""
+    if isinstance(error, (niquests.ConnectionError, niquests.Timeout)):
+        return True
+    if isinstance(error, niquests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status is not None and (status >= 500 or status == 429)
+    return False
+
+
+def _unpack_page(payload: Any) -> tuple[List[Any], int]:
+    """Split a page payload into (items, total)
+
+    Accepts either a bare list or an object with ``items`` and ``total``.
+    """
+    if isinstance(payload, list):
+        return list(payload), 0
+    items = list(payload.get("items", []))
+    return items, int(payload.get("total", 0))
@@ -0,0 +1,266 @@
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from pytools.services.schema import COLUMNS, conform
+from pytools.services.storage import FORMATS as DATASET_FORMATS, load_dataset
+
+# Formats split into byte ranges at line boundaries
+SPLITTABLE = ("ndjson", "csv")
+FORMATS: Dict[str, str] = {
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".json": "json",
+    **DATASET_FORMATS,
+}
+# Read every column as text so bad values can be counted, not guessed at
+RAW_SCHEMA = pl.Schema({name: pl.String for name in COLUMNS})
+
+
+def detect_ingest_format(path: Path, fmt: Optional[str] = None) -> str:
+    """Resolve an input format from an explicit name or the file suffix"""
+    if fmt:
+        if fmt not in set(FORMATS.values()):
+            raise ValueError(f"Unsupported format: {fmt}")
+        return fmt
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Cannot infer format from {path.name}; use one of "
+            f"{', '.join(sorted(FORMATS))}"
+        ) from None
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A byte range of an input file, starting and ending at line boundaries"""
+
+    index: int
+    start: int
+    end: int
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def plan_chunks(
+    path: Path, chunk_size: int, skip_header: bool = False
+) -> Tuple[bytes, List[Chunk]]:
+    """Split a line-oriented file into chunks of about chunk_size bytes
+
+    Returns the header line (for CSV, prepended to every chunk) and the
+    chunks. Each boundary is moved forward to just after a newline, so no
+    record is split; quoted CSV fields containing newlines are not
+    supported.
+    """
+    size = path.stat().st_size
+    chunks: List[Chunk] = []
+    with open(path, "rb") as f:
+        header = f.readline() if skip_header else b""
+        start = len(header)
+        while start < size:
+            end = start + max(chunk_size, 1)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            end = min(end, size)
+            chunks.append(Chunk(len(chunks), start, end))
+            start = end
+    return header, chunks
+
+
+@dataclass
+class ChunkResult:
+    """Valid rows parsed from one chunk, plus how many were rejected"""
+
+    chunk: Chunk
+    frame: pl.DataFrame
+    invalid: int
+    seconds: float
+
+
+def validate(raw: pl.DataFrame) -> Tuple[pl.DataFrame, int]:
+    """Conform raw text columns to the record schema, dropping bad rows
+
+    A row is rejected when it has no id or when a value present in the
+    input does not convert to the column's type (e.g. id "x" or updated
+    "yesterday").
+    """
+    if "id" not in raw.columns:
+        raise ValueError("Input has no id column")
+    frame = conform(raw)
+    ok = frame.get_column("id").is_not_null()
+    for name in COLUMNS[1:]:
+        if name in raw.columns:
+            ok = ok & (
+                raw.get_column(name).is_null() | frame.get_column(name).is_not_null()
+            )
+    invalid = frame.height - ok.sum()
+    return (frame.filter(ok) if invalid else frame), invalid
+
+
+def _parse_ndjson_lines(data: bytes) -> Tuple[pl.DataFrame, int]:
+    """Parse NDJSON line by line, skipping lines that are not JSON objects"""
+    good: List[bytes] = []
+    bad = 0
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError:
+            bad += 1
+            continue
+        if isinstance(value, dict):
+            good.append(line)
+        else:
+            bad += 1
+    if not good:
+        return pl.DataFrame(schema=RAW_SCHEMA), bad
+    return pl.read_ndjson(b"\n".join(good), schema=RAW_SCHEMA), bad
+
+
+def _parse_csv_lines(header: bytes, data: bytes) -> Tuple[pl.DataFrame, int]:
+    """Parse CSV line by line, skipping lines with bad quoting or extra fields"""
+    width = len(next(csv.reader([header.decode("utf-8", "replace")]), []))
+    good: List[bytes] = []
+    bad = 0
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            fields = next(csv.reader([line.decode("utf-8")], strict=True))
+        except (csv.Error, UnicodeDecodeError):
+            bad += 1
+            continue
+        if len(fields) > width:
+            bad += 1
+        else:
+            good.append(line)
+    return pl.read_csv(header + b"\n".join(good), infer_schema=False), bad
+
+
+def parse_chunk(path: Path, fmt: str, chunk: Chunk, header: bytes = b"") -> ChunkResult:
+    """Read and validate one chunk (runs in a worker thread)
+
+    Polars parses without holding the GIL, so chunks parsed on separate
+    threads use separate cores. A chunk polars cannot parse is parsed
+    again line by line, counting the lines it cannot read as invalid.
+    """
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        f.seek(chunk.start)
+        data = f.read(chunk.size)
+    try:
+        if fmt == "ndjson":
+            raw = pl.read_ndjson(data, schema=RAW_SCHEMA)
+        else:
+            raw = pl.read_csv(header + data, infer_schema=False)
+        unreadable = 0
+    except pl.exceptions.PolarsError:
+        # Malformed lines raise ComputeError (bad JSON, quoting or field
+        # counts, invalid UTF-8) and an empty CSV NoDataError; catch the
+        # common base so other parse errors fall back too
+        if fmt == "ndjson":
+            raw, unreadable = _parse_ndjson_lines(data)
+        else:
+            raw, unreadable = _parse_csv_lines(header, data)
+    frame, invalid = validate(raw)
+    return ChunkResult(chunk, frame, invalid + unreadable, time.perf_counter() - start)
+
+
+def parse_whole(path: Path, fmt: str) -> ChunkResult:
+    """Read a file that cannot be split (JSON array, Parquet or Arrow)"""
+    start = time.perf_counter()
+    if fmt == "json":
+        frame, invalid = validate(pl.read_json(path, schema=RAW_SCHEMA))
+    else:
+        frame, invalid = load_dataset(path, fmt), 0
+    chunk = Chunk(0, 0, path.stat().st_size)
+    return ChunkResult(chunk, frame, invalid, time.perf_counter() - start)
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+async def iter_chunks(
+    path: Path,
+    fmt: Optional[str] = None,
+    chunk_size: int = 64 * 1024 * 1024,
+    workers: int = 0,
+) -> AsyncIterator[ChunkResult]:
+    """Parse a file in parallel, yielding chunk results in file order
+
+    At most workers + 1 chunks are parsed or waiting at once, so memory
+    stays bounded however large the file is. Yielding in order keeps
+    "last record wins" semantics for ids repeated across chunks.
+    """
+    fmt = detect_ingest_format(path, fmt)
+    if fmt not in SPLITTABLE:
+        yield await asyncio.to_thread(parse_whole, path, fmt)
+        return
+
+    header, chunks = await asyncio.to_thread(
+        plan_chunks, path, chunk_size, fmt == "csv"
+    )
+    workers = workers or default_workers()
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(workers, thread_name_prefix="pytools-ingest")
+    pending: Deque[asyncio.Future] = deque()
+    try:
+        for chunk in chunks:
+            pending.append(
+                loop.run_in_executor(executor, parse_chunk, path, fmt, chunk, header)
+            )
+            if len(pending) > workers:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+@dataclass
+class IngestProgress:
+    """Running totals of an ingest"""
+
+    path: Path
+    total_bytes: int
+    bytes_done: int = 0
+    chunks: int = 0
+    rows: int = 0
+    invalid: int = 0
+    inserted: int = 0
+    updated: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_done / self.total_bytes if self.total_bytes else 1.0
+
+    @property
+    def throughput(self) -> float:
+        """Input megabytes per second"""
+        return self.bytes_done / 2**20 / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Ingest {self.path.name}: {self.fraction:.0%}, {self.rows} rows "
+            f"({self.inserted} new, {self.updated} updated, {self.invalid} invalid), "
+            f"{self.throughput:.1f} MB/s"
+        )
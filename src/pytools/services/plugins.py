@@ -0,0 +1,180 @@
+import importlib
+import time
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional
+
+from pytools.utils.logger import get_logger
+from pytools.utils.tracing import tracer
+
+# Entry point group per plugin kind; the entry point name is the command
+# word, data source name or screen mode it provides
+GROUPS: Dict[str, str] = {
+    "command": "pytools.commands",
+    "source": "pytools.sources",
+    "screen": "pytools.screens",
+}
+KINDS = tuple(GROUPS)
+MODULE = "module"
+
+
+@dataclass
+class PluginSpec:
+    """A discovered plugin, imported on first use
+
+    Commands are `async def (service, args: str) -> str`, sources are
+    `async def (service) -> pl.DataFrame` and screens are Screen classes.
+    A module plugin has a `register(registry)` function that calls
+    registry.add() for each thing it provides.
+    """
+
+    kind: str
+    name: str
+    target: str
+    origin: str
+    obj: Any = None
+    load_time: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.load_time is not None
+
+    def load(self, registry: "PluginRegistry") -> Any:
+        """Import the target once, recording how long it took"""
+        if self.loaded:
+            return self.obj
+        start = time.perf_counter()
+        try:
+            with tracer.span(f"plugin.load:{self.name}"):
+                module_name, _, attr = self.target.partition(":")
+                obj = importlib.import_module(module_name)
+                for part in filter(None, attr.split(".")):
+                    obj = getattr(obj, part)
+                if self.kind == MODULE:
+                    obj.register(registry)
+            self.obj = obj
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            registry.logger.error(f"Failed to load plugin {self.name}: {self.error}")
+        self.load_time = time.perf_counter() - start
+        return self.obj
+
+
+def parse_spec(entry: str) -> PluginSpec:
+    """Parse a Settings.plugins entry
+
+    "KIND:NAME=module:attr" declares one command, source or screen;
+    "module" or "module:attr" is a module plugin with register().
+    """
+    entry = entry.strip()
+    head, sep, target = entry.partition("=")
+    if sep:
+        kind, _, name = head.partition(":")
+        if kind not in KINDS or not name or not target:
+            raise ValueError(f"Invalid plugin entry: {entry!r}")
+        return PluginSpec(kind, name.strip(), target.strip(), "settings")
+    if not entry:
+        raise ValueError("Empty plugin entry")
+    return PluginSpec(MODULE, entry, entry, "settings")
+
+
+class PluginRegistry:
+    """Plugins from Settings.plugins and entry points, loaded lazily
+
+    Discovery reads only settings and installed package metadata; nothing
+    is imported until a command, source or screen is first looked up.
+    Module plugins are imported the first time a lookup misses, since only
+    their register() hook knows what they provide.
+    """
+
+    def __init__(self):
+        self.logger = get_logger(__name__)
+        self.specs: Dict[tuple[str, str], PluginSpec] = {}
+        self.modules: List[PluginSpec] = []
+        self.discovery_time = 0.0
+        self._discovered = False
+
+    def discover(self, entries: Optional[List[str]] = None) -> None:
+        """Collect plugin declarations without importing them"""
+        if self._discovered:
+            return
+        self._discovered = True
+        start = time.perf_counter()
+        if entries is None:
+            from pytools.config.settings import get_settings
+
+            entries = get_settings().plugins
+        for entry in entries:
+            try:
+                spec = parse_spec(entry)
+            except ValueError as e:
+                self.logger.error(str(e))
+                continue
+            self._add_spec(spec)
+        for kind, group in GROUPS.items():
+            for ep in entry_points(group=group):
+                origin = ep.dist.name if ep.dist else group
+                self._add_spec(PluginSpec(kind, ep.name, ep.value, origin))
+        for ep in entry_points(group="pytools.plugins"):
+            origin = ep.dist.name if ep.dist else "pytools.plugins"
+            self._add_spec(PluginSpec(MODULE, ep.name, ep.value, origin))
+        self.discovery_time = time.perf_counter() - start
+
+    def _add_spec(self, spec: PluginSpec) -> None:
+        if spec.kind == MODULE:
+            self.modules.append(spec)
+        elif (spec.kind, spec.name) in self.specs:
+            self.logger.warning(
+                f"Plugin {spec.kind} {spec.name!r} from {spec.origin} "
+                f"shadowed by {self.specs[spec.kind, spec.name].origin}"
+            )
+        else:
+            self.specs[spec.kind, spec.name] = spec
+
+    def add(self, kind: str, name: str, obj: Any) -> None:
+        """Register an already imported object (used by register() hooks)"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown plugin kind: {kind}")
+        spec = PluginSpec(kind, name, getattr(obj, "__module__", ""), "module")
+        spec.obj, spec.load_time = obj, 0.0
+        self._add_spec(spec)
+
+    def names(self, kind: str) -> List[str]:
+        """Declared names of a kind; module plugins are not imported"""
+        self.discover()
+        return sorted(name for k, name in self.specs if k == kind)
+
+    def get(self, kind: str, name: str) -> Any:
+        """The loaded plugin object, or None if unknown or broken"""
+        self.discover()
+        spec = self.specs.get((kind, name))
+        if spec is None and self._load_modules():
+            spec = self.specs.get((kind, name))
+        return spec.load(self) if spec is not None else None
+
+    def _load_modules(self) -> bool:
+        """Import pending module plugins, returning whether any ran"""
+        pending = [spec for spec in self.modules if not spec.loaded]
+        for spec in pending:
+            spec.load(self)
+        return bool(pending)
+
+    def load_all(self) -> List[PluginSpec]:
+        """Import every plugin (for load-time accounting)"""
+        self.discover()
+        self._load_modules()
+        for spec in list(self.specs.values()):
+            spec.load(self)
+        return self.modules + list(self.specs.values())
+
+
+_registry: Optional[PluginRegistry] = None
+
+
+def get_registry() -> PluginRegistry:
+    """The process-wide plugin registry"""
+    global _registry
+    if _registry is None:
+        _registry = PluginRegistry()
+    return _registry
@@ -0,0 +1,238 @@
+import re
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import Any, Iterator, List, Optional, Tuple
+
+import polars as pl
+
+from pytools.services.schema import COLUMNS, RECORD_SCHEMA, empty_frame, to_display
+
+# Longest operators first so ">=" is not read as ">"
+OPERATORS = ("!=", ">=", "<=", "=", ">", "<", "~")
+_CONDITION = re.compile(
+    rf"^({'|'.join(COLUMNS)})({'|'.join(re.escape(op) for op in OPERATORS)})(.*)$"
+)
+
+Condition = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class ViewQuery:
+    """Filter conditions, free-text name search and sort for the table view"""
+
+    conditions: Tuple[Condition, ...] = ()
+    search: str = ""
+    sort: Optional[Tuple[str, bool]] = None  # (column, descending)
+
+    def is_empty(self) -> bool:
+        return not self.conditions and not self.search and self.sort is None
+
+    def is_filtered(self) -> bool:
+        return bool(self.conditions or self.search)
+
+    def refines(self, other: "ViewQuery") -> bool:
+        """Whether every row matching self also matches other
+
+        Holds when each of other's conditions is kept (or, for `~`, kept
+        with a longer value) and the search text contains other's, e.g.
+        after typing more characters.
+        """
+        return (
+            all(
+                any(_implies(mine, theirs) for mine in self.conditions)
+                for theirs in other.conditions
+            )
+            and other.search.lower() in self.search.lower()
+        )
+
+    def with_conditions(self, conditions: List[Condition]) -> "ViewQuery":
+        """Add conditions, replacing existing ones on the same column and op"""
+        replaced = {(column, op) for column, op, _ in conditions}
+        kept = [c for c in self.conditions if (c[0], c[1]) not in replaced]
+        return replace(self, conditions=tuple(kept + conditions))
+
+    def to_text(self) -> str:
+        """Render back to filter bar syntax"""
+        parts = [f"{column}{op}{value}" for column, op, value in self.conditions]
+        if self.sort is not None:
+            column, descending = self.sort
+            parts.append(f"sort:{'-' if descending else ''}{column}")
+        if self.search:
+            parts.append(self.search)
+        return " ".join(parts)
+
+
+def _implies(narrow: Condition, wide: Condition) -> bool:
+    if narrow == wide:
+        return True
+    return (
+        narrow[:2] == wide[:2]
+        and narrow[1] == "~"
+        and wide[2].lower() in narrow[2].lower()
+    )
+
+
+def parse_condition(token: str) -> Optional[Condition]:
+    """Parse `column<op>value`, or None if the token is not a condition"""
+    match = _CONDITION.match(token)
+    if match is None:
+        return None
+    return match.group(1), match.group(2), match.group(3)
+
+
+def parse_sort(column: str, direction: str = "asc") -> Tuple[str, bool]:
+    """Validate a sort column and direction"""
+    if column.startswith("-"):
+        column, direction = column[1:], "desc"
+    if column not in COLUMNS:
+        raise ValueError(f"Unknown column: {column}")
+    if direction.lower() not in ("asc", "desc"):
+        raise ValueError(f"Sort direction must be asc or desc, not {direction}")
+    return column, direction.lower() == "desc"
+
+
+def parse_query(text: str) -> ViewQuery:
+    """Parse filter bar text
+
+    Tokens like `status=active`, `id>=10` or `name~foo` are conditions,
+    `sort:updated` / `sort:-updated` sets the order and everything else is
+    searched for in the name column, case-insensitively.
+    """
+    conditions: List[Condition] = []
+    words: List[str] = []
+    sort = None
+    for token in text.split():
+        if token.startswith("sort:"):
+            sort = parse_sort(token[5:])
+        elif (condition := parse_condition(token)) is not None:
+            conditions.append(condition)
+        else:
+            words.append(token)
+    return ViewQuery(tuple(conditions), " ".join(words), sort)
+
+
+def _literal(column: str, value: str) -> Any:
+    dtype = RECORD_SCHEMA[column]
+    if dtype == pl.Int64:
+        return int(value)
+    if dtype == pl.Date:
+        return date.fromisoformat(value)
+    return value
+
+
+def condition_expr(column: str, op: str, value: str) -> pl.Expr:
+    """Polars expression for one condition"""
+    col = pl.col(column)
+    if RECORD_SCHEMA[column] == pl.Categorical():
+        # Compare categories by their labels
+        col = col.cast(pl.String)
+    if op == "~":
+        return col.cast(pl.String).str.contains(f"(?i){re.escape(value)}")
+    try:
+        literal = _literal(column, value)
+    except ValueError:
+        raise ValueError(f"Invalid value for {column}: {value!r}") from None
+    return {
+        "=": col == literal,
+        "!=": col != literal,
+        ">": col > literal,
+        ">=": col >= literal,
+        "<": col < literal,
+        "<=": col <= literal,
+    }[op]
+
+
+def filter_expr(query: ViewQuery) -> Optional[pl.Expr]:
+    """Combined filter for a query, or None if it matches everything"""
+    exprs = [condition_expr(*condition) for condition in query.conditions]
+    if query.search:
+        exprs.append(pl.col("name").str.contains(f"(?i){re.escape(query.search)}"))
+    return pl.all_horizontal(exprs) if exprs else None
+
+
+def sort_frame(frame: pl.DataFrame, sort: Tuple[str, bool]) -> pl.DataFrame:
+    column, descending = sort
+    key = pl.col(column)
+    if frame.schema[column] == pl.Categorical():
+        key = key.cast(pl.String)
+    return frame.sort(key, descending=descending, nulls_last=True, maintain_order=True)
+
+
+@dataclass(frozen=True)
+class ViewResult:
+    """A computed view: the query, its base frame and the matching rows"""
+
+    query: ViewQuery
+    base: pl.DataFrame
+    filtered: pl.DataFrame
+    rows: pl.DataFrame
+
+
+class DataView:
+    """Filtered and sorted view over the DataService dataset
+
+    Serves display rows like DataService so PagedDataTable can page it. A
+    new query that refines the previous one (same base, more conditions or
+    longer search text) is evaluated against the previous result rather
+    than the whole dataset, so typing into the filter bar narrows an
+    ever smaller frame.
+    """
+
+    def __init__(self, service: Any):
+        self.service = service
+        self._result = ViewResult(
+            ViewQuery(), empty_frame(), empty_frame(), empty_frame()
+        )
+
+    @property
+    def query(self) -> ViewQuery:
+        return self._result.query
+
+    def compute(self, query: ViewQuery) -> ViewResult:
+        """Evaluate a query (thread safe, does not change the view)"""
+        base = self.service.frame
+        last = self._result
+        if query.is_empty():
+            return ViewResult(query, base, base, base)
+        if last.base is base and query == last.query:
+            return last
+
+        reuse = last.base is base and query.refines(last.query)
+        source = last.filtered if reuse else base
+        expr = filter_expr(query)
+        # filtered stays in dataset order, so a later sort change can use it
+        filtered = source.filter(expr) if expr is not None else source
+        if query.sort is None:
+            rows = filtered
+        elif reuse and query.sort == last.query.sort:
+            # Filtering keeps the existing order
+            rows = last.rows.filter(expr) if expr is not None else last.rows
+        else:
+            rows = sort_frame(filtered, query.sort)
+        return ViewResult(query, base, filtered, rows)
+
+    def commit(self, result: ViewResult) -> None:
+        """Make a computed result the current view"""
+        self._result = result
+
+    def apply(self, query: ViewQuery) -> ViewResult:
+        """Compute and commit a query"""
+        self.commit(self.compute(query))
+        return self._result
+
+    @property
+    def frame(self) -> pl.DataFrame:
+        """Rows of the view, recomputed if the dataset changed"""
+        if self._result.base is not self.service.frame:
+            self.apply(self.query)
+        return self._result.rows
+
+    @property
+    def row_count(self) -> int:
+        return self.frame.height
+
+    def display_rows(
+        self, offset: int = 0, length: int | None = None
+    ) -> Iterator[Tuple[str, ...]]:
+        """Iterate rows of a slice of the view as display strings"""
+        return to_display(self.frame.slice(offset, length)).iter_rows()
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from pytools.services.diff import DataDiff
+from pytools.utils.logger import get_logger
+
+
+@dataclass
+class RefreshStats:
+    """Counters for the auto-refresh loop"""
+
+    runs: int = 0
+    changed: int = 0
+    errors: int = 0
+    coalesced: int = 0
+    full: int = 0
+    last_duration: float = 0.0
+    delay: float = 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.runs} refreshes ({self.changed} changed, {self.errors} failed, "
+            f"{self.coalesced} coalesced, {self.full} full), "
+            f"next in {self.delay:.1f}s"
+        )
+
+
+class AutoRefresher:
+    """Background loop that refreshes data on a timer or on demand
+
+    One task runs refreshes strictly one at a time: trigger() while a
+    refresh is in flight schedules a single follow-up however often it is
+    called. The delay starts at interval and grows by backoff (up to
+    max_interval) while refreshes find nothing new or fail, and is at least
+    twice the last refresh duration so a slow source is not hammered. Any
+    change or trigger() resets it. While paused nothing runs; triggers are
+    remembered until resume(). An exception from on_result or on_error is
+    logged and the loop carries on.
+
+    Polls only see inserted and updated records, so every full_every-th
+    refresh is a full one, which also picks up deletions (0 disables).
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[bool], Awaitable[DataDiff]],
+        on_result: Callable[[DataDiff], None],
+        interval: Optional[float] = 0.5,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        full_every: int = 0,
+    ):
+        self.logger = get_logger(__name__)
+        self._refresh = refresh
+        self._on_result = on_result
+        self._on_error = on_error
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.full_every = full_every
+        self.stats = RefreshStats(delay=interval or 0.0)
+        self._delay = interval
+        self._wake = asyncio.Event()
+        self._active = asyncio.Event()
+        self._active.set()
+        self._full = False
+        self._since_full = 0
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def paused(self) -> bool:
+        return not self._active.is_set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def pause(self) -> None:
+        """Stop refreshing until resume()"""
+        self._active.clear()
+
+    def resume(self) -> None:
+        self._active.set()
+
+    def reconfigure(
+        self,
+        interval: Optional[float],
+        max_interval: float,
+        backoff: float,
+        full_every: int = 0,
+    ) -> None:
+        """Change the timing, starting with a refresh now"""
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.full_every = full_every
+        self.trigger()
+
+    def trigger(self, full: bool = False) -> None:
+        """Refresh as soon as possible; full also re-reads everything"""
+        self._full = self._full or full
+        if self._running or self._wake.is_set():
+            self.stats.coalesced += 1
+        self._delay = self.interval
+        self._wake.set()
+
+    async def _sleep(self) -> None:
+        """Wait for the delay to pass or a trigger"""
+        try:
+            await asyncio.wait_for(self._wake.wait(), self._delay)
+        except TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await self._sleep()
+            await self._active.wait()
+
+            full, self._full = self._full, False
+            if self.full_every and self._since_full + 1 >= self.full_every:
+                full = True
+            start = time.perf_counter()
+            self._running = True
+            try:
+                diff = await self._refresh(full)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats.errors += 1
+                self.logger.warning(f"Refresh failed: {e}")
+                self._backoff()
+                if self._on_error is not None:
+                    self._notify(self._on_error, e)
+                continue
+            finally:
+                self._running = False
+            self.stats.last_duration = time.perf_counter() - start
+            self.stats.runs += 1
+            if full:
+                self.stats.full += 1
+                self._since_full = 0
+            else:
+                self._since_full += 1
+
+            if diff.is_empty():
+                self._backoff()
+            else:
+                self.stats.changed += 1
+                self._delay = self.interval
+            if self._delay is not None:
+                # Poll a slow source less often than it takes to answer
+                self._delay = min(
+                    max(self._delay, 2 * self.stats.last_duration), self.max_interval
+                )
+            self.stats.delay = self._delay or 0.0
+            self._notify(self._on_result, diff)
+
+    def _notify(self, callback: Callable[[Any], None], value: Any) -> None:
+        """Call back without letting a failure end the loop"""
+        try:
+            callback(value)
+        except Exception:
+            self.logger.exception(f"Refresh callback {callback!r} failed")
+
+    def _backoff(self) -> None:
+        if self._delay is not None:
+            self._delay = min(self._delay * self.backoff, self.max_interval)
@@ -0,0 +1,204 @@
+import asyncio
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+import polars as pl
+from fpdf import FPDF
+
+from pytools.services.schema import COLUMN_LABELS, COLUMNS, to_display
+
+# Column widths in mm for an A4 portrait page
+COLUMN_WIDTHS = {"id": 25, "name": 90, "status": 35, "updated": 30}
+MARGIN = 10
+ROW_HEIGHT = 5
+# Section for rows whose split column is null
+NULL_SECTION = "(none)"
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _latin1(text: str) -> str:
+    """Core PDF fonts only cover latin-1"""
+    return text.encode("latin-1", "replace").decode("latin-1")
+
+
+def render_report(
+    source: Path,
+    output: Path,
+    title: str,
+    chunk_size: int,
+    rows: Optional[tuple[int, int]] = None,
+) -> int:
+    """Render rows of an Arrow IPC file to a PDF, returning the row count
+
+    Runs in a worker process. rows is an (offset, length) range of the
+    file, all of it by default. The uncompressed IPC source is memory-mapped
+    by polars and read one chunk_size slice at a time, so only one chunk is
+    held as a frame and as Python strings at once. fpdf2 still keeps every
+    page in memory until the file is written, which is why generate_report
+    splits large reports into parts.
+    """
+    chunk_size = max(chunk_size, 1)
+    query = pl.scan_ipc(source)
+    offset, length = rows if rows is not None else (0, None)
+    if length is None:
+        length = query.select(pl.len()).collect().item() - offset
+
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(False)
+    pdf.set_margins(MARGIN, MARGIN)
+    bottom = pdf.h - MARGIN - ROW_HEIGHT
+    generated = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    def new_page() -> float:
+        pdf.add_page()
+        pdf.set_font("Helvetica", "B", 12)
+        pdf.text(MARGIN, MARGIN + 4, _latin1(title))
+        pdf.set_font("Helvetica", "", 8)
+        pdf.text(pdf.w - MARGIN - 60, MARGIN + 4, f"{generated}  page {pdf.page}")
+        y = MARGIN + 12
+        pdf.set_font("Helvetica", "B", 9)
+        x = MARGIN
+        for name in COLUMNS:
+            pdf.text(x, y, COLUMN_LABELS[name])
+            x += COLUMN_WIDTHS[name]
+        pdf.line(MARGIN, y + 1.5, pdf.w - MARGIN, y + 1.5)
+        pdf.set_font("Helvetica", "", 9)
+        return y + ROW_HEIGHT + 1
+
+    y = new_page()
+    for start in range(offset, offset + length, chunk_size):
+        size = min(chunk_size, offset + length - start)
+        chunk = query.slice(start, size).collect()
+        for row in to_display(chunk).iter_rows():
+            if y > bottom:
+                y = new_page()
+            x = MARGIN
+            for name, value in zip(COLUMNS, row):
+                pdf.text(x, y, _latin1(value))
+                x += COLUMN_WIDTHS[name]
+            y += ROW_HEIGHT
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    pdf.output(str(output))
+    return length
+
+
+def _get_executor(workers: int) -> ProcessPoolExecutor:
+    """Shared process pool, created on first use"""
+    global _executor
+    if _executor is None:
+        # Spawn rather than fork: the app runs threads (logging, polars)
+        _executor = ProcessPoolExecutor(
+            max_workers=max(workers, 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the worker processes"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _section_name(value: Optional[str]) -> str:
+    if value is None:
+        return "none"
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in value) or "empty"
+
+
+def _unique_path(output: Path, name: str, used: Set[str]) -> Path:
+    """<output stem>-<name>, numbered if another job already has that path"""
+    stem, number = f"{output.stem}-{name}" if name else output.stem, 1
+    candidate = stem
+    # casefold: files differing only in case collide on some filesystems
+    while candidate.casefold() in used:
+        number += 1
+        candidate = f"{stem}-{number}"
+    used.add(candidate.casefold())
+    return output.with_name(f"{candidate}{output.suffix}")
+
+
+async def generate_report(
+    frame: pl.DataFrame,
+    output: Path,
+    title: str = "Data report",
+    split_by: Optional[str] = None,
+    chunk_size: int = 5000,
+    workers: int = 2,
+    part_rows: int = 100000,
+) -> List[Path]:
+    """Render the dataset to PDF in worker processes
+
+    With split_by, one PDF per distinct value of that column is rendered in
+    parallel, named <output stem>-<value>.pdf; rows where it is null go in
+    a "(none)" section named -none. Names that would clash, such as a null
+    and a literal "none" or values that differ only in characters replaced
+    by "_", get a -2, -3... suffix. Raises ValueError for an unknown column.
+
+    A report or section of more than part_rows rows is split into
+    -part1, -part2... files so no worker holds more pages than that.
+    """
+    if split_by is not None and split_by not in COLUMNS:
+        raise ValueError(
+            f"Cannot split by {split_by!r}, expected one of {', '.join(COLUMNS)}"
+        )
+    if split_by is None:
+        sections: List[Tuple[Optional[str], int]] = [(None, frame.height)]
+    else:
+        # Rows of each section are made contiguous, so a worker reads a range
+        key = pl.col(split_by).cast(pl.String)
+        frame = frame.sort(key, nulls_last=True, maintain_order=True)
+        runs = frame.select(key.rle()).unnest(split_by)
+        sections = list(zip(runs.get_column("value"), runs.get_column("len")))
+
+    part_rows = max(part_rows, 1)
+    jobs = []
+    used: Set[str] = set()
+    offset = 0
+    for value, length in sections:
+        name = "" if split_by is None else _section_name(value)
+        section_title = title
+        if split_by is not None:
+            label = NULL_SECTION if value is None else value
+            section_title = f"{title}: {split_by} = {label}"
+        parts = max(-(-length // part_rows), 1)
+        for part in range(parts):
+            start = offset + part * part_rows
+            size = min(part_rows, offset + length - start)
+            part_name, job_title = name, section_title
+            if parts > 1:
+                part_name = f"{name}-part{part + 1}" if name else f"part{part + 1}"
+                job_title = f"{section_title} (part {part + 1} of {parts})"
+            jobs.append(
+                (_unique_path(output, part_name, used), job_title, (start, size))
+            )
+        offset += length
+
+    loop = asyncio.get_running_loop()
+    executor = _get_executor(workers)
+    with tempfile.TemporaryDirectory(prefix="pytools-report-") as tmp:
+        source = Path(tmp) / "data.arrow"
+        await asyncio.to_thread(frame.write_ipc, source)
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    render_report,
+                    source,
+                    path,
+                    job_title,
+                    chunk_size,
+                    rows,
+                )
+                for path, job_title, rows in jobs
+            )
+        )
+    return [path for path, _, _ in jobs]
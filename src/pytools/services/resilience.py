@@ -0,0 +1,288 @@
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from pytools.config.settings import APISettings
+from pytools.utils.logger import get_logger
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose breaker is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit open for {endpoint}, retrying in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+@dataclass
+class ResilienceStats:
+    """Counters for remote calls"""
+
+    calls: int = 0
+    attempts: int = 0
+    failures: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedges_won: int = 0
+    rejected: int = 0
+    stale_served: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        """Short human readable description"""
+        return (
+            f"{self.calls} calls, {self.retries} retries, "
+            f"{self.hedges_won}/{self.hedges} hedges won, "
+            f"{self.rejected} rejected, {self.stale_served} served stale"
+        )
+
+
+class CircuitBreaker:
+    """Failure tracking for one endpoint
+
+    Closed lets every call through. `threshold` consecutive failures open
+    it, and calls fail fast until `reset_timeout` has passed; then it is
+    half-open and lets a single probe through, which closes it again on
+    success or reopens it on failure.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.trips = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self.retry_in() == 0:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        return max(0.0, self._opened_at + self.reset_timeout - self.clock())
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._state = CLOSED
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._state == HALF_OPEN or self.failures >= self.threshold:
+            if self._state != OPEN:
+                self.trips += 1
+            self._state = OPEN
+            self._opened_at = self.clock()
+            self._probing = False
+
+    def abandon(self) -> None:
+        """Forget a probe that was cancelled before it finished"""
+        self._probing = False
+
+
+class LatencyWindow:
+    """The most recent successful call durations of one endpoint"""
+
+    def __init__(self, size: int = 200):
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Resilience:
+    """Retries, hedging and circuit breaking around calls to remote endpoints
+
+    A call is attempted up to api.retries + 1 times, sleeping a random
+    ("full jitter") delay of up to api.retry_backoff * 2**retry between
+    attempts so clients that failed together do not retry together. Only
+    errors for which `retryable` is true are retried and count against the
+    endpoint's breaker. With api.hedge on, an attempt still running after
+    the endpoint's api.hedge_quantile latency gets a duplicate, and
+    whichever finishes first wins. Clock and random source are injectable
+    for testing.
+    """
+
+    def __init__(
+        self,
+        api: APISettings,
+        retryable: Callable[[Exception], bool],
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self.logger = get_logger(__name__)
+        self.api = api
+        self.retryable = retryable
+        self.clock = clock
+        self.rng = rng or random.Random()
+        self.stats = ResilienceStats()
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[str, LatencyWindow] = {}
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(
+                self.api.breaker_threshold, self.api.breaker_reset, self.clock
+            )
+        return breaker
+
+    def reconfigure(self, api: APISettings) -> None:
+        """Use new settings, keeping breaker state and latency history"""
+        self.api = api
+        for breaker in self.breakers.values():
+            breaker.threshold = api.breaker_threshold
+            breaker.reset_timeout = api.breaker_reset
+
+    def backoff(self, retry: int) -> float:
+        """Jittered delay before the given retry (0 for the first)"""
+        cap = min(self.api.retry_max_backoff, self.api.retry_backoff * 2**retry)
+        return self.rng.uniform(0, cap)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """How long to wait before hedging, or None to not hedge"""
+        window = self.latencies.get(endpoint)
+        if not self.api.hedge or window is None:
+            return None
+        if len(window) < self.api.hedge_min_samples:
+            return None
+        return window.quantile(self.api.hedge_quantile)
+
+    async def call(self, endpoint: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        """Run attempt() with retries, hedging and the endpoint's breaker"""
+        self.stats.calls += 1
+        breaker = self.breaker(endpoint)
+        retry = 0
+        while True:
+            if not breaker.allow():
+                self.stats.rejected += 1
+                raise CircuitOpenError(endpoint, breaker.retry_in())
+            try:
+                return await self._hedged(endpoint, breaker, attempt)
+            except Exception as e:
+                if not self.retryable(e) or retry >= self.api.retries:
+                    raise
+                delay = self.backoff(retry)
+                self.logger.debug(
+                    f"Retrying {endpoint} in {delay:.2f}s after {type(e).__name__}: {e}"
+                )
+            retry += 1
+            self.stats.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _hedged(
+        self,
+        endpoint: str,
+        breaker: CircuitBreaker,
+        attempt: Callable[[], Awaitable[T]],
+    ) -> T:
+        # No duplicates while probing a half-open breaker
+        delay = self.hedge_delay(endpoint) if breaker.state == CLOSED else None
+        if delay is None:
+            return await self._timed(endpoint, breaker, attempt)
+
+        primary = asyncio.ensure_future(self._timed(endpoint, breaker, attempt))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self.stats.hedges += 1
+        hedge = asyncio.ensure_future(self._timed(endpoint, breaker, attempt))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(
+        self,
+        endpoint: str,
+        breaker: CircuitBreaker,
+        attempt: Callable[[], Awaitable[T]],
+    ) -> T:
+        """One attempt, feeding the breaker and the latency window"""
+        self.stats.attempts += 1
+        start = self.clock()
+        try:
+            result = await attempt()
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        except Exception as e:
+            if self.retryable(e):
+                self.stats.failures += 1
+                breaker.record_failure()
+            else:
+                # The endpoint answered, just not with what we wanted
+                breaker.record_success()
+            raise
+        window = self.latencies.get(endpoint)
+        if window is None:
+            window = self.latencies[endpoint] = LatencyWindow()
+        window.add(self.clock() - start)
+        breaker.record_success()
+        return result
+
+    def summary(self) -> str:
+        """Stats plus the state of any breaker that is not closed"""
+        tripped = [
+            f"{endpoint} {breaker.state}"
+            for endpoint, breaker in self.breakers.items()
+            if breaker.state != CLOSED
+        ]
+        text = self.stats.summary()
+        return text + (f"; breakers: {', '.join(tripped)}" if tripped else "")
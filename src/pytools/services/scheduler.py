@@ -0,0 +1,278 @@
+import asyncio
+import itertools
+from dataclasses import dataclass, field
+from enum import IntEnum, StrEnum
+from typing import Callable, Dict, List, Optional
+
+from pytools.services.data import DataService
+from pytools.utils.logger import get_logger
+
+
+class Priority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+class JobState(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# Commands that jump the queue; only idempotent ones may
+COMMAND_PRIORITIES: Dict[str, Priority] = {
+    "refresh": Priority.HIGH,
+}
+
+
+# Commands that only read, so a second copy in flight can share the first
+IDEMPOTENT_COMMANDS = frozenset({"refresh", "summary", "cache", "remote", "report"})
+
+
+def _verb(command: str) -> str:
+    return command.split(" ", 1)[0].lower()
+
+
+def priority_for(command: str) -> Priority:
+    """Default priority for a command string"""
+    return COMMAND_PRIORITIES.get(_verb(command), Priority.NORMAL)
+
+
+def is_idempotent(command: str) -> bool:
+    """Whether running a command twice is the same as running it once"""
+    return _verb(command) in IDEMPOTENT_COMMANDS
+
+
+@dataclass
+class CommandJob:
+    """A command submitted to the scheduler"""
+
+    id: int
+    command: str
+    priority: Priority
+    state: JobState = JobState.QUEUED
+    result: Optional[str] = None
+    error: Optional[str] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+    # The mutating command this one must not start before
+    after: Optional["CommandJob"] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+
+@dataclass(frozen=True)
+class SchedulerStatus:
+    """Snapshot of queue depth and progress"""
+
+    queued: int
+    running: int
+    completed: int
+    submitted: int
+
+    def summary(self) -> str:
+        if not self.submitted:
+            return ""
+        return (
+            f"Queue: {self.queued} waiting, {self.running} running, "
+            f"{self.completed}/{self.submitted} done"
+        )
+
+
+class CommandScheduler:
+    """Runs DataService commands on a pool of async workers
+
+    Commands are taken from a bounded priority queue, so submitting never
+    waits on execution. Identical idempotent commands that are already
+    queued or running are deduplicated, and any job can be cancelled; a
+    cancelled job stops counting against max_queue straight away.
+
+    Mutating commands run one at a time in submission order, and no
+    command starts before a mutation submitted ahead of it has finished;
+    a job dequeued too early is parked until then, without holding a
+    worker. Priority only reorders idempotent commands, so a refresh can
+    overtake queued reads but never a queued mutation.
+    """
+
+    def __init__(
+        self,
+        service: DataService,
+        workers: int = 4,
+        max_queue: int = 100,
+        on_change: Optional[Callable[[SchedulerStatus], None]] = None,
+        on_finished: Optional[Callable[[CommandJob], None]] = None,
+    ):
+        self.logger = get_logger(__name__)
+        self.service = service
+        self.worker_count = max(workers, 1)
+        self.on_change = on_change
+        self.on_finished = on_finished
+        self.max_queue = max(max_queue, 1)
+        # Unbounded, as cancelled jobs stay in it until popped; capacity is
+        # checked against the jobs still waiting instead
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._ids = itertools.count(1)
+        self._active: Dict[int, CommandJob] = {}
+        self._shared: Dict[str, CommandJob] = {}
+        self._last_mutation: Optional[CommandJob] = None
+        # Queue entries waiting for the mutation with that id to finish
+        self._parked: Dict[int, List[tuple]] = {}
+        self._waiting = 0
+        self._workers: List[asyncio.Task] = []
+        self._running = 0
+        self._completed = 0
+        self._submitted = 0
+
+    @property
+    def status(self) -> SchedulerStatus:
+        return SchedulerStatus(
+            queued=self._waiting,
+            running=self._running,
+            completed=self._completed,
+            submitted=self._submitted,
+        )
+
+    @property
+    def jobs(self) -> List[CommandJob]:
+        """Jobs currently queued or running"""
+        return list(self._active.values())
+
+    def start(self) -> None:
+        """Start the worker tasks"""
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"command-worker-{i}")
+                for i in range(self.worker_count)
+            ]
+
+    async def stop(self) -> None:
+        """Cancel everything and stop the workers"""
+        self.cancel_all()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, command: str, priority: Optional[Priority] = None) -> CommandJob:
+        """Queue a command, returning the existing job if an identical
+        idempotent one is in flight
+
+        priority is ignored for mutating commands. Raises asyncio.QueueFull
+        when max_queue jobs are already waiting.
+        """
+        shared = is_idempotent(command)
+        if shared and command in self._shared:
+            return self._shared[command]
+        if self._waiting >= self.max_queue:
+            raise asyncio.QueueFull
+
+        if not shared:
+            priority = Priority.NORMAL
+        elif priority is None:
+            priority = priority_for(command)
+        after = self._last_mutation
+        if after is not None and after.finished:
+            after = None
+        job = CommandJob(next(self._ids), command, priority, after=after)
+        if self._queue.qsize() >= 2 * self.max_queue:
+            self._compact()
+        self._queue.put_nowait((job.priority, job.id, job))
+        self._active[job.id] = job
+        if shared:
+            self._shared[command] = job
+        else:
+            self._last_mutation = job
+            # Reads from before this mutation must not answer later ones
+            self._shared.clear()
+        self._waiting += 1
+        self._submitted += 1
+        self._notify()
+        return job
+
+    def cancel(self, job: CommandJob) -> bool:
+        """Cancel a queued or running job"""
+        if job.finished:
+            return False
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            # Still queued; the worker skips it when dequeued
+            self._finish(job, JobState.CANCELLED)
+        return True
+
+    def cancel_all(self) -> int:
+        """Cancel every queued or running job"""
+        return sum(self.cancel(job) for job in self.jobs)
+
+    def _compact(self) -> None:
+        """Drop cancelled jobs from the queue"""
+        entries = []
+        while not self._queue.empty():
+            entries.append(self._queue.get_nowait())
+            self._queue.task_done()
+        for entry in entries:
+            if not entry[2].finished:
+                self._queue.put_nowait(entry)
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            try:
+                if job.finished:
+                    continue
+                if job.after is not None and not job.after.finished:
+                    parked = self._parked.setdefault(job.after.id, [])
+                    parked.append((job.priority, job.id, job))
+                    continue
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: CommandJob) -> None:
+        job.state = JobState.RUNNING
+        job.after = None
+        self._waiting -= 1
+        self._running += 1
+        self._notify()
+        job.task = asyncio.create_task(self.service.execute_command(job.command))
+        try:
+            job.result = await job.task
+            state = JobState.DONE
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # The worker itself is being stopped
+                self._running -= 1
+                self._finish(job, JobState.CANCELLED)
+                raise
+            state = JobState.CANCELLED
+        except Exception as e:
+            self.logger.error(f"Command failed: {job.command}: {e}")
+            job.error = str(e)
+            state = JobState.FAILED
+        self._running -= 1
+        self._finish(job, state)
+
+    def _finish(self, job: CommandJob, state: JobState) -> None:
+        if job.state == JobState.QUEUED:
+            self._waiting -= 1
+        job.state = state
+        self._active.pop(job.id, None)
+        if self._shared.get(job.command) is job:
+            del self._shared[job.command]
+        for entry in self._parked.pop(job.id, []):
+            self._queue.put_nowait(entry)
+        self._completed += 1
+        if not self._active:
+            # Progress counts restart with the next burst
+            self._completed = self._submitted = 0
+        self._notify()
+        if self.on_finished is not None:
+            self.on_finished(job)
+
+    def _notify(self) -> None:
+        if self.on_change is not None:
+            self.on_change(self.status)
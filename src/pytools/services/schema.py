@@ -0,0 +1,83 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List
+
+import polars as pl
+
+
+RECORD_SCHEMA = pl.Schema(
+    {
+        "id": pl.Int64,
+        "name": pl.String,
+        "status": pl.Categorical(),
+        "updated": pl.Date,
+    }
+)
+
+COLUMNS: List[str] = list(RECORD_SCHEMA.names())
+COLUMN_LABELS: Dict[str, str] = {
+    "id": "ID",
+    "name": "Name",
+    "status": "Status",
+    "updated": "Updated",
+}
+
+
+def empty_frame() -> pl.DataFrame:
+    """Create an empty frame with the record schema"""
+    return pl.DataFrame(schema=RECORD_SCHEMA)
+
+
+def frame_from_columns(columns: Dict[str, Iterable[Any]]) -> pl.DataFrame:
+    """Build a typed frame from column sequences"""
+    return pl.DataFrame(
+        {name: list(columns.get(name, [])) for name in COLUMNS},
+        schema=RECORD_SCHEMA,
+    )
+
+
+def frame_from_records(records: Iterable[Dict[str, Any]]) -> pl.DataFrame:
+    """Build a typed frame from record dicts (e.g. decoded JSON)"""
+    records = list(records)
+    if not records:
+        return empty_frame()
+    return conform(pl.from_dicts(records))
+
+
+def conform(frame: pl.DataFrame) -> pl.DataFrame:
+    """Cast and order an arbitrary frame to the record schema"""
+    exprs = []
+    for name, dtype in RECORD_SCHEMA.items():
+        if name not in frame.columns:
+            exprs.append(pl.lit(None, dtype=dtype).alias(name))
+        elif name == "updated" and frame.schema[name] == pl.String:
+            exprs.append(pl.col(name).str.to_date(strict=False))
+        else:
+            exprs.append(pl.col(name).cast(dtype, strict=False))
+    return frame.select(exprs)
+
+
+def to_display(frame: pl.DataFrame) -> pl.DataFrame:
+    """Cast every column to strings for rendering"""
+    return frame.select(pl.col(name).cast(pl.String).fill_null("") for name in COLUMNS)
+
+
+def to_keys(frame: pl.DataFrame) -> List[str]:
+    """Row keys (string ids) for a frame"""
+    return frame.get_column("id").cast(pl.String).to_list()
+
+
+def new_record(record_id: int, name: str) -> Dict[str, Any]:
+    """A freshly added record"""
+    return {"id": record_id, "name": name, "status": "active", "updated": date.today()}
+
+
+def sample_frame() -> pl.DataFrame:
+    """Sample data used when no other source is configured"""
+    return frame_from_columns(
+        {
+            "id": [1, 2, 3],
+            "name": ["Item 1", "Item 2", "Item 3"],
+            "status": ["active", "pending", "completed"],
+            "updated": [date(2023, 1, 1), date(2023, 1, 2), date(2023, 1, 3)],
+        }
+    )
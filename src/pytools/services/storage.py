@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+import polars as pl
+
+from pytools.services.schema import RECORD_SCHEMA, conform
+
+FORMATS: Dict[str, str] = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+    ".csv": "csv",
+}
+
+
+def detect_format(path: Path, fmt: Optional[str] = None) -> str:
+    """Resolve a dataset format from an explicit name or the file suffix"""
+    if fmt:
+        if fmt not in set(FORMATS.values()):
+            raise ValueError(f"Unsupported format: {fmt}")
+        return fmt
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Cannot infer format from {path.name}; use one of "
+            f"{', '.join(sorted(FORMATS))}"
+        ) from None
+
+
+def scan_dataset(path: Path, fmt: Optional[str] = None) -> pl.LazyFrame:
+    """Lazily scan a dataset file without reading it"""
+    fmt = detect_format(path, fmt)
+    if fmt == "parquet":
+        return pl.scan_parquet(path)
+    if fmt == "ipc":
+        return pl.scan_ipc(path)
+    return pl.scan_csv(path, schema_overrides={"updated": pl.String})
+
+
+def load_dataset(path: Path, fmt: Optional[str] = None) -> pl.DataFrame:
+    """Load a dataset file conformed to the record schema
+
+    Uncompressed Arrow IPC files are memory-mapped by polars, so a snapshot
+    written by write_dataset loads without copying into Python objects.
+    """
+    if detect_format(path, fmt) == "ipc":
+        frame = pl.read_ipc(path)
+    else:
+        frame = scan_dataset(path, fmt).collect()
+    if frame.schema == RECORD_SCHEMA:
+        return frame
+    return conform(frame)
+
+
+def write_dataset(frame: pl.DataFrame, path: Path, fmt: Optional[str] = None) -> Path:
+    """Write a dataset atomically (temp file + rename)"""
+    fmt = detect_format(path, fmt)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    if fmt == "parquet":
+        frame.write_parquet(tmp_path, compression="zstd")
+    elif fmt == "ipc":
+        # Uncompressed so reads can be memory-mapped
+        frame.write_ipc(tmp_path, compression="uncompressed")
+    else:
+        frame.write_csv(tmp_path)
+    tmp_path.replace(path)
+    return path
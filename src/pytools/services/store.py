@@ -0,0 +1,316 @@
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+import polars as pl
+
+from pytools.services.diff import DataDiff, apply_diff
+from pytools.services.schema import (
+    COLUMNS,
+    empty_frame,
+    frame_from_records,
+    new_record,
+)
+from pytools.services.storage import load_dataset, write_dataset
+from pytools.utils.logger import get_logger
+
+Row = Dict[str, Any]
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class LocalStore:
+    """Persistent record store: columnar snapshot plus append-only change log
+
+    Every mutation is appended to changes.log as one JSON line tagged with a
+    sequence number before it is applied in memory. Lookups by id are O(1)
+    through a position index over the snapshot and an overlay dict holding
+    rows changed since the last compaction. compact() writes the current
+    state as snapshot-<seq>.arrow and truncates the log; on open the newest
+    snapshot is loaded and log entries with a higher sequence are replayed,
+    so a crash at any point loses at most a torn final line.
+
+    Ids are never reused: the highest id handed out survives clears and
+    deletes, through the clear entry and a reserve entry written after a
+    compaction that dropped it.
+    """
+
+    LOG_NAME = "changes.log"
+
+    def __init__(
+        self, directory: Path, compact_threshold: int = 10000, fsync: bool = False
+    ):
+        self.logger = get_logger(__name__)
+        self.directory = directory
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.log_path = directory / self.LOG_NAME
+        self._log: Optional[TextIO] = None
+        self._seq = 0
+        self._log_entries = 0
+        self._snapshot: pl.DataFrame = empty_frame()
+        self._index: Dict[int, int] = {}
+        # id -> current row, or None if deleted since the snapshot
+        self._overlay: Dict[int, Optional[Row]] = {}
+        self._frame: Optional[pl.DataFrame] = None
+        self._count = 0
+        self._max_id = 0
+        self.created = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._log is not None
+
+    @property
+    def pending_entries(self) -> int:
+        """Log entries not yet folded into the snapshot"""
+        return self._log_entries
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, record_id: int) -> bool:
+        return self.get(record_id) is not None
+
+    def _snapshots(self) -> List[tuple[int, Path]]:
+        found = []
+        for path in self.directory.glob("snapshot-*.arrow"):
+            try:
+                found.append((int(path.stem.split("-", 1)[1]), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def open(self) -> "LocalStore":
+        """Load the newest snapshot and replay the change log"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        snapshots = self._snapshots()
+        self.created = not snapshots and not self.log_path.exists()
+        if snapshots:
+            self._seq, path = snapshots[-1]
+            self._set_snapshot(load_dataset(path, "ipc"))
+        self._replay()
+        self._log = open(self.log_path, "a", encoding="utf-8")
+        return self
+
+    def close(self) -> None:
+        """Close the change log"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _set_snapshot(self, frame: pl.DataFrame) -> None:
+        self._snapshot = frame
+        ids = frame.get_column("id").to_list()
+        self._index = dict(zip(ids, range(len(ids))))
+        self._overlay = {}
+        self._frame = frame
+        self._count = frame.height
+        self._max_id = max(self._max_id, max(self._index, default=0))
+
+    def _replay(self) -> None:
+        if not self.log_path.exists():
+            return
+        good = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn write can only be the last line
+                    self.logger.warning(f"Ignoring torn entry in {self.log_path}")
+                    break
+                good += len(line)
+                if entry["seq"] <= self._seq:
+                    continue
+                self._seq = entry["seq"]
+                self._log_entries += 1
+                self._apply(entry)
+        if good < self.log_path.stat().st_size:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(good)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        if self._log is None:
+            raise RuntimeError("Store is not open")
+        self._seq += 1
+        entry["seq"] = self._seq
+        self._log.write(json.dumps(entry, default=_encode) + "\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._log_entries += 1
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply a replayed log entry to the index, without diffing"""
+        op = entry["op"]
+        if op == "upsert":
+            for row in frame_from_records(entry["rows"]).iter_rows(named=True):
+                self._put(row)
+        elif op == "delete":
+            for record_id in entry["ids"]:
+                self._drop(record_id)
+        elif op == "clear":
+            self._set_snapshot(empty_frame())
+        if "max_id" in entry:
+            self._max_id = max(self._max_id, entry["max_id"])
+        self._frame = None
+
+    def _put(self, row: Row) -> None:
+        if self.get(row["id"]) is None:
+            self._count += 1
+        self._overlay[row["id"]] = row
+        self._max_id = max(self._max_id, row["id"])
+
+    def _drop(self, record_id: int) -> None:
+        if self.get(record_id) is not None:
+            self._count -= 1
+            self._overlay[record_id] = None
+
+    def get(self, record_id: int) -> Optional[Row]:
+        """Current row for an id, or None"""
+        if record_id in self._overlay:
+            return self._overlay[record_id]
+        position = self._index.get(record_id)
+        if position is None:
+            return None
+        return self._snapshot.row(position, named=True)
+
+    def next_id(self) -> int:
+        """An id not used by any record so far"""
+        return self._max_id + 1
+
+    @property
+    def frame(self) -> pl.DataFrame:
+        """All current records; snapshot order, new records appended"""
+        if self._frame is None:
+            self._frame = self._materialize()
+        return self._frame
+
+    def _materialize(self) -> pl.DataFrame:
+        inserted: List[Row] = []
+        updated: List[Row] = []
+        deleted: List[int] = []
+        for record_id, row in self._overlay.items():
+            if row is None:
+                if record_id in self._index:
+                    deleted.append(record_id)
+            elif record_id in self._index:
+                updated.append(row)
+            else:
+                inserted.append(row)
+        diff = DataDiff(
+            inserted=frame_from_records(inserted),
+            updated=frame_from_records(updated),
+            deleted=frame_from_records({"id": i} for i in deleted),
+        )
+        return apply_diff(self._snapshot, diff)
+
+    def _update_frame(self, diff: DataDiff) -> DataDiff:
+        if self._frame is not None and not diff.is_empty():
+            self._frame = apply_diff(self._frame, diff)
+        return diff
+
+    def upsert(self, records: Iterable[Row]) -> DataDiff:
+        """Insert or replace whole records, returning what changed"""
+        frame = frame_from_records(records)
+        if frame.is_empty():
+            return DataDiff()
+        frame = frame.unique("id", keep="last", maintain_order=True)
+        frame = frame.filter(pl.col("id").is_not_null())
+        rows = frame.to_dicts()
+        existing = [self.get(row["id"]) for row in rows]
+        # Unchanged rows are neither logged nor reported
+        changed = [row for row, old in zip(rows, existing) if row != old]
+        if not changed:
+            return DataDiff()
+        self._append({"op": "upsert", "rows": changed})
+
+        inserted = [row for row, old in zip(rows, existing) if old is None]
+        updated = [
+            (row, old)
+            for row, old in zip(rows, existing)
+            if old is not None and row != old
+        ]
+        for row in changed:
+            self._put(row)
+        return self._update_frame(
+            DataDiff(
+                inserted=frame_from_records(inserted),
+                updated=frame_from_records(row for row, _ in updated),
+                replaced=frame_from_records(old for _, old in updated),
+            )
+        )
+
+    def add(self, name: str) -> DataDiff:
+        """Insert a new record with the next free id"""
+        return self.upsert([new_record(self.next_id(), name)])
+
+    def update(self, record_id: int, changes: Row) -> DataDiff:
+        """Change some fields of one record"""
+        row = self.get(record_id)
+        if row is None:
+            raise KeyError(record_id)
+        invalid = set(changes) - set(COLUMNS[1:])
+        if invalid:
+            raise ValueError(f"Cannot set field(s): {', '.join(sorted(invalid))}")
+        return self.upsert([{**row, **changes}])
+
+    def delete(self, ids: Iterable[int]) -> DataDiff:
+        """Delete records by id, ignoring unknown ids"""
+        rows = [row for row in map(self.get, dict.fromkeys(ids)) if row is not None]
+        if not rows:
+            return DataDiff()
+        self._append({"op": "delete", "ids": [row["id"] for row in rows]})
+        for row in rows:
+            self._drop(row["id"])
+        return self._update_frame(DataDiff(deleted=frame_from_records(rows)))
+
+    def clear(self) -> DataDiff:
+        """Delete every record"""
+        if self._count == 0:
+            return DataDiff()
+        deleted = self.frame
+        self._append({"op": "clear", "max_id": self._max_id})
+        self._set_snapshot(empty_frame())
+        return DataDiff(deleted=deleted)
+
+    def replace(self, frame: pl.DataFrame) -> None:
+        """Replace the whole store with a frame and compact immediately"""
+        # The new snapshot supersedes every logged entry, so nothing is logged
+        self._seq += 1
+        self._overlay = {}
+        self._frame = frame
+        self.compact()
+
+    def compact(self) -> Path:
+        """Write the current state as a snapshot and truncate the log"""
+        frame = self.frame
+        path = self.directory / f"snapshot-{self._seq}.arrow"
+        write_dataset(frame, path, "ipc")
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.log_path, "w", encoding="utf-8")
+        self._log_entries = 0
+        for _, old in self._snapshots():
+            if old != path:
+                old.unlink(missing_ok=True)
+        self._set_snapshot(frame)
+        if self._max_id > max(self._index, default=0):
+            # The snapshot alone would hand out ids of removed records again
+            self._append({"op": "reserve", "max_id": self._max_id})
+        self.logger.debug(f"Compacted store to {path.name} ({frame.height} rows)")
+        return path
+
+    def maybe_compact(self) -> bool:
+        """Compact once the log has grown past the threshold"""
+        if self._log_entries < self.compact_threshold:
+            return False
+        self.compact()
+        return True
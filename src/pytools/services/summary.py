@@ -0,0 +1,96 @@
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import polars as pl
+
+from pytools.services.diff import DataDiff
+
+
+class DataSummary:
+    """Totals, per-status counts and per-date update counts of the dataset
+
+    Built once from a full frame, then kept current with apply(diff): only
+    the inserted, updated, replaced and deleted rows are grouped, so the
+    cost of staying current is proportional to the change, not the dataset.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_status: Counter = Counter()
+        self.by_date: Counter = Counter()
+
+    @classmethod
+    def from_frame(cls, frame: pl.DataFrame) -> "DataSummary":
+        """Compute the summary with a full scan"""
+        summary = cls()
+        summary._count(frame, 1)
+        return summary
+
+    def _count(self, frame: pl.DataFrame, sign: int) -> None:
+        if frame.is_empty():
+            return
+        self.total += sign * frame.height
+        for column, counter in (("status", self.by_status), ("updated", self.by_date)):
+            for value, count in frame.group_by(column).len().iter_rows():
+                counter[value] += sign * count
+                if counter[value] <= 0:
+                    del counter[value]
+
+    def apply(self, diff: DataDiff) -> None:
+        """Update the aggregates with a diff"""
+        self._count(diff.deleted, -1)
+        self._count(diff.replaced, -1)
+        self._count(diff.updated, 1)
+        self._count(diff.inserted, 1)
+
+    @property
+    def latest(self) -> Optional[date]:
+        """Most recent update date"""
+        return max((d for d in self.by_date if d is not None), default=None)
+
+    def histogram(self, days: int = 14) -> List[Tuple[date, int]]:
+        """Updates per day for the days up to the latest update"""
+        latest = self.latest
+        if latest is None:
+            return []
+        start = latest - timedelta(days=days - 1)
+        return [
+            (start + timedelta(days=i), self.by_date.get(start + timedelta(days=i), 0))
+            for i in range(days)
+        ]
+
+    def as_dict(self, days: int = 14) -> Dict[str, Any]:
+        """JSON-friendly form for scripting"""
+        latest = self.latest
+        return {
+            "total": self.total,
+            "by_status": {
+                str(k) if k is not None else None: v
+                for k, v in self.by_status.most_common()
+            },
+            "latest_update": latest.isoformat() if latest else None,
+            "updates_by_day": {d.isoformat(): n for d, n in self.histogram(days)},
+        }
+
+    def brief(self) -> str:
+        """One line: total and counts per status"""
+        statuses = ", ".join(
+            f"{status or '(none)'} {count}"
+            for status, count in self.by_status.most_common()
+        )
+        return f"{self.total} items" + (f": {statuses}" if statuses else "")
+
+    def format(self, days: int = 14, width: int = 20) -> str:
+        """Plain text report with a bar chart of recent updates"""
+        lines = [f"Total: {self.total}", "", "By status:"]
+        for status, count in self.by_status.most_common():
+            lines.append(f"  {status or '(none)':<14} {count:>9}")
+        histogram = self.histogram(days)
+        if histogram:
+            peak = max(count for _, count in histogram) or 1
+            lines += ["", f"Updates, last {days} days:"]
+            for day, count in histogram:
+                bar = "#" * round(count / peak * width)
+                lines.append(f"  {day:%m-%d} {bar:<{width}} {count}")
+        return "\n".join(lines)
@@ -0,0 +1,341 @@
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from pytools.utils.profiling import profile_imports
+from pytools.utils.tracing import memory_usage
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+@dataclass
+class BenchResult:
+    """One measured value"""
+
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+@dataclass
+class Regression:
+    """A result that got worse than the baseline allows"""
+
+    name: str
+    baseline: float
+    current: float
+    unit: str
+
+    @property
+    def change(self) -> float:
+        """Relative change, positive meaning worse"""
+        if not self.baseline:
+            return 0.0
+        return abs(self.current - self.baseline) / self.baseline
+
+    def format(self) -> str:
+        return (
+            f"{self.name}: {self.baseline:.2f} -> {self.current:.2f} {self.unit} "
+            f"({self.change:+.0%} worse)"
+        )
+
+
+@dataclass
+class BenchReport:
+    """Named benchmark results plus the environment they ran in"""
+
+    results: Dict[str, BenchResult] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def add(self, name: str, value: float, unit: str, higher_is_better: bool = False):
+        self.results[name] = BenchResult(value, unit, higher_is_better)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "meta": self.meta,
+                "results": {name: asdict(r) for name, r in self.results.items()},
+            },
+            indent=2,
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "BenchReport":
+        payload = json.loads(text)
+        results = {
+            name: BenchResult(**result) for name, result in payload["results"].items()
+        }
+        return cls(results, payload.get("meta", {}))
+
+    def compare(
+        self, baseline: "BenchReport", tolerance: float = 0.2, min_delta: float = 1.0
+    ) -> List[Regression]:
+        """Results worse than baseline by more than tolerance (relative)
+
+        Differences smaller than min_delta (in the result's unit) are
+        ignored so sub-millisecond noise never fails a run.
+        """
+        regressions = []
+        for name, result in self.results.items():
+            base = baseline.results.get(name)
+            if base is None:
+                continue
+            delta = result.value - base.value
+            if result.higher_is_better:
+                delta = -delta
+            if delta > max(abs(base.value) * tolerance, min_delta):
+                regressions.append(
+                    Regression(name, base.value, result.value, result.unit)
+                )
+        return regressions
+
+    def format(self, baseline: Optional["BenchReport"] = None) -> str:
+        lines = []
+        for name, result in self.results.items():
+            line = f"{name:<32} {result.value:>12.2f} {result.unit}"
+            base = baseline.results.get(name) if baseline else None
+            if base is not None and base.value:
+                line += (
+                    f"  ({(result.value - base.value) / base.value:+.0%} vs baseline)"
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def synthetic_frame(rows: int, seed: int = 0) -> Any:
+    """Deterministic record frame with `rows` rows"""
+    import polars as pl
+
+    from pytools.services.schema import conform
+
+    start = date(2024, 1, 1)
+    ids = pl.int_range(1, rows + 1, eager=True)
+    frame = pl.DataFrame(
+        {
+            "id": ids,
+            "name": ("item " + ((ids * 7919 + seed) % 100_003).cast(pl.String)),
+            "status": pl.Series(["active", "pending", "completed", "archived"])
+            .gather(ids % 4)
+            .alias("status"),
+            "updated": pl.Series(
+                [start + timedelta(days=d) for d in range(365)]
+            ).gather(ids % 365),
+        }
+    )
+    return conform(frame)
+
+
+def touch_rows(frame: Any, every: int = 100) -> Any:
+    """Change the name of every n-th row, as a refresh would see"""
+    import polars as pl
+
+    changed = pl.col("id") % every == 0
+    return frame.with_columns(
+        pl.when(changed)
+        .then(pl.col("name") + "*")
+        .otherwise(pl.col("name"))
+        .alias("name")
+    )
+
+
+async def _wait_for(condition: Callable[[], bool], timeout: float = 120.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Benchmark condition not reached")
+        await asyncio.sleep(0.001)
+
+
+class _Source:
+    """Data source plugin serving the current synthetic frame"""
+
+    def __init__(self):
+        self.frame = None
+
+    async def __call__(self, service: Any) -> Any:
+        return self.frame
+
+
+async def _bench_ui(report: BenchReport, source: _Source, rows: int) -> None:
+    """First paint, load_data and refresh latency for one dataset size"""
+    from pytools.app import ToolsApp
+    from pytools.screens.main import MainScreen
+
+    source.frame = synthetic_frame(rows)
+    start = time.perf_counter()
+    app = ToolsApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await _wait_for(
+            lambda: (
+                isinstance(app.screen, MainScreen)
+                and app.screen.data_table.row_count > 0
+            )
+        )
+        await pilot.pause()
+        report.add(
+            f"first_paint_ms[{rows}]", (time.perf_counter() - start) * 1000, "ms"
+        )
+        screen = app.screen
+
+        source.frame = touch_rows(source.frame)
+        start = time.perf_counter()
+        await screen.load_data()
+        report.add(f"load_data_ms[{rows}]", (time.perf_counter() - start) * 1000, "ms")
+
+        source.frame = touch_rows(source.frame, every=97)
+        runs = screen.refresher.stats.runs
+        start = time.perf_counter()
+        screen.refresher.trigger(full=True)
+        await _wait_for(lambda: screen.refresher.stats.runs > runs)
+        report.add(
+            f"refresh_latency_ms[{rows}]", (time.perf_counter() - start) * 1000, "ms"
+        )
+        report.add(f"rss_mb[{rows}]", memory_usage() / 2**20, "MiB")
+
+
+async def _bench_ui_burst(report: BenchReport, count: int, mode: str) -> None:
+    """Render work while `count` commands finish in about a second"""
+    from pytools.app import ToolsApp
+    from pytools.screens.main import MainScreen
+    from pytools.services.scheduler import (
+        CommandJob,
+        JobState,
+        Priority,
+        SchedulerStatus,
+    )
+
+    app = ToolsApp()
+    async with app.run_test(size=(120, 40)) as pilot:
+        await _wait_for(lambda: isinstance(app.screen, MainScreen))
+        screen = app.screen
+        await pilot.pause()
+        if mode == "direct":
+            screen.updates.frame = 0
+        before = screen.updates.stats.as_dict()
+        start = time.process_time()
+        for i in range(count):
+            screen._on_scheduler_change(SchedulerStatus(count - i - 1, 1, i + 1, count))
+            screen._on_command_finished(
+                CommandJob(i, "summary", Priority.NORMAL, JobState.DONE, f"result {i}")
+            )
+            if i % 10 == 9:
+                await asyncio.sleep(0.01)
+        await asyncio.sleep(max(screen.updates.frame, 0.05))
+        await pilot.pause()
+        cpu = time.process_time() - start
+        stats = screen.updates.stats.as_dict()
+    report.add(f"ui_burst_cpu_ms[{mode}]", cpu * 1000, "ms")
+    for name in ("renders", "toasts"):
+        report.add(f"ui_burst_{name}[{mode}]", stats[name] - before[name], "count")
+
+
+async def _bench_commands(
+    report: BenchReport, rows: int, count: int, concurrency: int
+) -> None:
+    """Batch runner dispatch throughput over a loaded dataset of one size
+
+    execute_command itself sleeps to simulate work, so it is stubbed out on
+    this service and only the dispatch around it is timed.
+    """
+    from pytools.services.batch import run_batch
+    from pytools.services.data import DataService
+
+    async def noop(command: str) -> str:
+        return "ok"
+
+    service = DataService()
+    service.execute_command = noop
+    try:
+        await service.get_data()
+        before = memory_usage()
+        commands = ("noop" for _ in range(count))
+        stats = await run_batch(service, commands, concurrency, lambda result: None)
+        delta = memory_usage() - before
+    finally:
+        await service.aclose()
+    report.add(
+        f"command_throughput[{rows}]",
+        stats.throughput,
+        "cmd/s",
+        higher_is_better=True,
+    )
+    report.add(f"command_errors[{rows}]", stats.errors, "count")
+    report.add(f"command_rss_delta_mb[{rows}]", delta / 2**20, "MiB")
+
+
+def run_benchmarks(
+    sizes: Optional[List[int]] = None,
+    commands: int = 500,
+    concurrency: int = 64,
+    startup_repeat: int = 3,
+) -> BenchReport:
+    """Run the whole suite in this process with isolated settings"""
+    from pytools.config.settings import get_settings, set_settings
+
+    sizes = list(sizes or DEFAULT_SIZES)
+    report = BenchReport(
+        meta={
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+        }
+    )
+    for args in (["--version"], ["show-config"]):
+        startup = profile_imports(args, repeat=startup_repeat)
+        name = args[0].lstrip("-").replace("-", "_")
+        report.add(f"startup_ms[{name}]", startup.wall_seconds * 1000, "ms")
+        report.add(f"import_ms[{name}]", startup.import_seconds * 1000, "ms")
+
+    settings = get_settings()
+    with tempfile.TemporaryDirectory(prefix="pytools-bench-") as tmp:
+        from pytools.services.plugins import get_registry
+
+        source = _Source()
+        get_registry().add("source", "bench", source)
+        # Isolate from the user's data and make refreshes trigger-only
+        set_settings(
+            settings.model_copy(
+                update={
+                    "data_dir": Path(tmp),
+                    "data_source": "bench",
+                    "cache": settings.cache.model_copy(update={"enabled": False}),
+                    "ui": settings.ui.model_copy(
+                        update={"auto_refresh": False, "show_debug": False}
+                    ),
+                }
+            )
+        )
+        try:
+            for rows in sizes:
+                asyncio.run(_bench_ui(report, source, rows))
+            source.frame = synthetic_frame(min(sizes))
+            for mode in ("coalesced", "direct"):
+                asyncio.run(_bench_ui_burst(report, commands, mode))
+
+            for rows in sizes:
+                source.frame = synthetic_frame(rows)
+                asyncio.run(_bench_commands(report, rows, commands, concurrency))
+        finally:
+            set_settings(settings)
+
+    report.add("peak_rss_mb", _peak_rss() / 2**20, "MiB")
+    return report
+
+
+def _peak_rss() -> int:
+    try:
+        import resource
+    except ImportError:
+        return memory_usage()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
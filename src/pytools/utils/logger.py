@@ -1,6 +1,283 @@
+import atexit
+import json
 import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from pytools.config.settings import settings
+from logging.handlers import QueueHandler
+from typing import List, Optional, TextIO
+
+from pytools.config.manager import ConfigUpdate, get_config
+from pytools.config.settings import LoggingConfig, get_settings
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller
+
+    Above the high-water mark only every ``sample_rate``-th record below
+    WARNING is kept; when the queue is full records are dropped. Both are
+    counted and reported by the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue, high_water: int, sample_rate: int):
+        super().__init__(log_queue)
+        self.high_water = high_water
+        self.sample_rate = max(sample_rate, 1)
+        self.dropped = 0
+        self.sampled_out = 0
+        self._seen = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The writer thread lives in this process, so formatting can be
+        # deferred to it rather than done on the caller's thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.queue.qsize() >= self.high_water and record.levelno < logging.WARNING:
+            self._seen += 1
+            if self._seen % self.sample_rate:
+                self.sampled_out += 1
+                return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RotatingBatchFile:
+    """Append-only log file written in batches, rotated by size and age"""
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int,
+        backup_count: int,
+        rotate_interval: Optional[float],
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotate_interval = rotate_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def _open(self) -> None:
+        self._stream = open(self.path, "a", encoding="utf-8")
+        self._size = self._stream.tell()
+        self._opened_at = time.monotonic()
+
+    def write(self, lines: List[str]) -> None:
+        data = "\n".join(lines) + "\n"
+        self._stream.write(data)
+        self._stream.flush()
+        # max_bytes is a file size, so count encoded bytes, not characters
+        self._size += len(data.encode("utf-8"))
+        if self._should_rotate():
+            self.rotate()
+
+    def _should_rotate(self) -> bool:
+        if self.max_bytes and self._size >= self.max_bytes:
+            return True
+        return bool(
+            self.rotate_interval
+            and time.monotonic() - self._opened_at >= self.rotate_interval
+        )
+
+    def rotate(self) -> None:
+        """Shift path -> path.1 -> path.2 ..., dropping the oldest"""
+        self._stream.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.path.with_name(f"{self.path.name}.{index}")
+                if source.exists():
+                    source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink(missing_ok=True)
+        self._open()
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class LogPipeline:
+    """Queue-backed logging backend with a background writer thread
+
+    Log calls only enqueue; formatting and I/O happen on the writer thread,
+    which drains the queue in batches and issues one write per batch.
+    """
+
+    _STOP = object()
+
+    def __init__(self, config: LoggingConfig, console: Optional[TextIO] = None):
+        self.config = config
+        self.queue: queue.Queue = queue.Queue(config.queue_size)
+        self.handler = DroppingQueueHandler(
+            self.queue,
+            high_water=int(config.queue_size * 0.8),
+            sample_rate=config.sample_rate,
+        )
+        self.formatter = self._make_formatter(config)
+        self.console = console if console is not None else sys.stderr
+        self.file = self._make_file(config)
+        # Held while writing a batch so reconfigure() never swaps mid-batch
+        self._lock = threading.Lock()
+        self._reported_losses = 0
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    @staticmethod
+    def _make_formatter(config: LoggingConfig) -> logging.Formatter:
+        if config.format_type == "json":
+            return JsonFormatter()
+        return logging.Formatter(config.format)
+
+    @staticmethod
+    def _make_file(config: LoggingConfig) -> Optional[RotatingBatchFile]:
+        if not config.file_path:
+            return None
+        return RotatingBatchFile(
+            Path(config.file_path).expanduser(),
+            config.max_bytes,
+            config.backup_count,
+            config.rotate_interval,
+        )
+
+    def reconfigure(self, config: LoggingConfig) -> None:
+        """Apply new logging settings without restarting the writer thread
+
+        The queue keeps the size it was created with; everything else
+        applies from the next batch.
+        """
+        file_fields = ("file_path", "max_bytes", "backup_count", "rotate_interval")
+        reopen = any(getattr(config, f) != getattr(self.config, f) for f in file_fields)
+        new_file = self._make_file(config) if reopen else self.file
+        with self._lock:
+            old_file = self.file if reopen else None
+            self.config = config
+            self.formatter = self._make_formatter(config)
+            self.file = new_file
+            self.handler.sample_rate = max(config.sample_rate, 1)
+        if old_file is not None:
+            old_file.close()
+        for logger in list(logging.Logger.manager.loggerDict.values()):
+            if isinstance(logger, logging.Logger) and self.handler in logger.handlers:
+                logger.setLevel(config.level)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                record = self.queue.get(timeout=self.config.flush_interval)
+            except queue.Empty:
+                self._report_losses()
+                continue
+            batch = []
+            while record is not self._STOP:
+                batch.append(record)
+                if len(batch) >= self.config.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write(batch)
+            self._report_losses()
+            if record is self._STOP:
+                return
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        if not records:
+            return
+        with self._lock:
+            self._write_locked(records)
+
+    def _write_locked(self, records: List[logging.LogRecord]) -> None:
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                self.handler.handleError(record)
+        if self.console and self.config.console:
+            try:
+                self.console.write("\n".join(lines) + "\n")
+                self.console.flush()
+            except (OSError, ValueError):
+                pass
+        if self.file is not None:
+            try:
+                self.file.write(lines)
+            except OSError:
+                pass
+
+    def _report_losses(self) -> None:
+        """Log how many records were dropped or sampled out since last time"""
+        losses = self.handler.dropped + self.handler.sampled_out
+        if losses > self._reported_losses:
+            record = logging.LogRecord(
+                __name__,
+                logging.WARNING,
+                __file__,
+                0,
+                f"Log backpressure: {self.handler.dropped} dropped, "
+                f"{self.handler.sampled_out} sampled out",
+                None,
+                None,
+            )
+            self._write([record])
+            self._reported_losses = losses
+
+    def stop(self) -> None:
+        """Flush pending records and stop the writer thread"""
+        if not self._thread.is_alive():
+            return
+        self.queue.put(self._STOP)
+        self._thread.join(timeout=5)
+        if self.file is not None:
+            self.file.close()
+
+
+_pipeline: Optional[LogPipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_pipeline() -> LogPipeline:
+    """Get the shared logging pipeline, starting it on first use"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = LogPipeline(get_settings().logging)
+            atexit.register(_pipeline.stop)
+            get_config().subscribe(_reconfigure_pipeline)
+        return _pipeline
+
+
+def _reconfigure_pipeline(update: ConfigUpdate) -> None:
+    if update.changed("logging") and _pipeline is not None:
+        _pipeline.reconfigure(update.settings.logging)
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -8,22 +285,7 @@ def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
 
     if not logger.handlers:
-        logger.setLevel(settings.logging.level)
-
-        # Create formatter
-        formatter = logging.Formatter(settings.logging.format)
-
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
-
-        # File handler (if configured)
-        if settings.logging.file_path:
-            file_path = Path(settings.logging.file_path)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(file_path)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+        logger.setLevel(get_settings().logging.level)
+        logger.addHandler(get_pipeline().handler)
 
     return logger
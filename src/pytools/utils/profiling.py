@@ -0,0 +1,113 @@
+import json
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class ImportRecord:
+    """One line of `python -X importtime` output"""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+@dataclass
+class StartupReport:
+    """Import-time breakdown of a CLI invocation"""
+
+    args: List[str]
+    wall_seconds: float
+    records: List[ImportRecord] = field(default_factory=list)
+
+    @property
+    def import_seconds(self) -> float:
+        return sum(r.self_us for r in self.records) / 1e6
+
+    def by_package(self) -> Dict[str, int]:
+        """Self import time (us) summed per top-level package"""
+        totals: Dict[str, int] = defaultdict(int)
+        for record in self.records:
+            totals[record.package] += record.self_us
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def format(self, top: int = 15) -> str:
+        lines = [
+            f"pytools {' '.join(self.args)}",
+            f"  wall time:   {self.wall_seconds * 1000:8.1f} ms",
+            f"  import time: {self.import_seconds * 1000:8.1f} ms "
+            f"({len(self.records)} modules)",
+            "",
+            "By package (self time):",
+        ]
+        for package, us in list(self.by_package().items())[:top]:
+            lines.append(f"  {us / 1000:8.1f} ms  {package}")
+        lines += ["", "Slowest modules (cumulative):"]
+        slowest = sorted(self.records, key=lambda r: -r.cumulative_us)[:top]
+        for record in slowest:
+            lines.append(f"  {record.cumulative_us / 1000:8.1f} ms  {record.module}")
+        return "\n".join(lines)
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse the stderr of `python -X importtime`"""
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(
+            ImportRecord(stripped.strip(), int(self_us), int(cumulative_us), depth)
+        )
+    return records
+
+
+def profile_imports(args: List[str], repeat: int = 1) -> StartupReport:
+    """Run a CLI subcommand in a fresh interpreter and time its imports
+
+    Each run uses a new process so nothing is already in sys.modules; the
+    fastest run is reported to reduce noise. A failing run raises
+    RuntimeError with its stderr.
+    """
+    code = "; ".join(
+        [
+            "from pytools.cli import cli",
+            f"cli({json.dumps(args)}, standalone_mode=False)",
+        ]
+    )
+    best: StartupReport | None = None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        wall = time.perf_counter() - start
+        if result.returncode != 0:
+            # Drop the importtime lines so only the error itself is shown
+            errors = [
+                line
+                for line in result.stderr.splitlines()
+                if not line.startswith("import time:")
+            ]
+            raise RuntimeError(
+                f"pytools {' '.join(args)} exited with {result.returncode}:\n"
+                + "\n".join(errors)
+            )
+        report = StartupReport(args, wall, parse_importtime(result.stderr))
+        if best is None or report.wall_seconds < best.wall_seconds:
+            best = report
+    return best
@@ -0,0 +1,18 @@
+import math
+from typing import Dict, Iterable, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted values (q in 0-100)"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+def percentiles(
+    values: Iterable[float], qs: Iterable[float] = (50, 95, 99)
+) -> Dict[str, float]:
+    """Map of p50/p95/p99 (or the requested percentiles) for values"""
+    ordered = sorted(values)
+    return {f"p{q:g}": percentile(ordered, q) for q in qs}
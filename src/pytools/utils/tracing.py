@@ -0,0 +1,174 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from pytools.utils.stats import percentiles
+
+
+@dataclass(slots=True)
+class Span:
+    """A finished timing span"""
+
+    name: str
+    start: float
+    duration: float
+    thread_id: int
+
+
+class _NullSpan:
+    """Context manager used while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self) -> "_ActiveSpan":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.tracer.record(self.name, self.start, time.perf_counter() - self.start)
+
+
+class Tracer:
+    """Collects timing spans into bounded in-memory buffers
+
+    While disabled, span() returns a shared no-op context manager and
+    traced() functions call straight through, so instrumentation costs a
+    single attribute check.
+    """
+
+    def __init__(self, capacity: int = 10000, per_name: int = 1000):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        self.spans: Deque[Span] = deque(maxlen=capacity)
+        self.loop_lag: Deque[float] = deque(maxlen=per_name)
+        self._per_name = per_name
+        self._durations: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self._per_name)
+        )
+
+    def span(self, name: str) -> Any:
+        """Context manager timing the enclosed block"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name)
+
+    def start(self) -> Optional[float]:
+        """Start a span that ends in another callback (see finish)"""
+        return time.perf_counter() if self.enabled else None
+
+    def finish(self, name: str, start: Optional[float]) -> None:
+        """Finish a span begun with start()"""
+        if start is not None and self.enabled:
+            self.record(name, start, time.perf_counter() - start)
+
+    def traced(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator recording a span for every call of a (async) function"""
+
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if not self.enabled:
+                        return await func(*args, **kwargs)
+                    with _ActiveSpan(self, name):
+                        return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _ActiveSpan(self, name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        self.spans.append(Span(name, start, duration, threading.get_ident()))
+        self._durations[name].append(duration)
+
+    def record_loop_lag(self, lag: float) -> None:
+        self.loop_lag.append(max(lag, 0.0))
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Count and p50/p95/p99 duration (seconds) per span name"""
+        return {
+            name: {"count": len(durations), **percentiles(durations)}
+            for name, durations in sorted(self._durations.items())
+        }
+
+    def recent(self, count: int = 10) -> List[Span]:
+        """Most recent spans, newest first"""
+        return list(reversed(list(self.spans)[-count:]))
+
+    def clear(self) -> None:
+        self.spans.clear()
+        self.loop_lag.clear()
+        self._durations.clear()
+
+    def export_chrome_trace(self, path: Path) -> int:
+        """Write spans in Chrome trace event format, returning the count"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": span.name,
+                "cat": "pytools",
+                "ph": "X",
+                "ts": (span.start - self.origin) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": pid,
+                "tid": span.thread_id,
+            }
+            for span in self.spans
+        ]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+def memory_usage() -> int:
+    """Resident set size of this process in bytes"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is the peak, in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+tracer = Tracer()
@@ -0,0 +1,127 @@
+import time
+from dataclasses import asdict, dataclass
+from collections import Counter
+from typing import Dict, List
+
+from textual.dom import DOMNode
+
+from pytools.widgets.status import StatusBar
+
+# Distinct messages listed in one warning or error toast
+MAX_LISTED = 5
+
+
+@dataclass
+class CoalescerStats:
+    """Counters showing how much UI work coalescing saved"""
+
+    updates: int = 0
+    notifications: int = 0
+    flushes: int = 0
+    renders: int = 0
+    toasts: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (
+            f"{self.updates} updates -> {self.renders} renders, "
+            f"{self.notifications} notifications -> {self.toasts} toasts, "
+            f"{self.flushes} flushes"
+        )
+
+
+class UpdateCoalescer:
+    """Collects status bar and notification changes and applies them per frame
+
+    Each status bar field keeps only its latest value and notifications
+    are grouped by severity, so however many changes arrive within a frame
+    the status bar repaints at most once per field and each severity shows
+    at most one toast. An information toast shows the latest message; a
+    warning or error toast lists each distinct message, so no failure is
+    hidden behind another. The first change after an idle frame is applied
+    straight away (after the current message), later ones wait for the
+    frame to end. A frame of 0 applies every change immediately.
+    """
+
+    def __init__(self, node: DOMNode, frame: float):
+        self.node = node
+        self.frame = frame
+        self.stats = CoalescerStats()
+        self._fields: Dict[str, str] = {}
+        self._notes: Dict[str, List[str]] = {}
+        self._scheduled = False
+        self._last_flush = 0.0
+
+    def set_status(self, message: str) -> None:
+        self._set("status", message)
+
+    def set_queue(self, summary: str) -> None:
+        self._set("queue", summary)
+
+    def _set(self, field: str, text: str) -> None:
+        self.stats.updates += 1
+        self._fields[field] = text
+        self._schedule()
+
+    def notify(self, message: str, severity: str = "information") -> None:
+        """Queue a notification, merged with others of its severity"""
+        self.stats.notifications += 1
+        self._notes.setdefault(severity, []).append(message)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self.frame <= 0:
+            self.flush()
+            return
+        if self._scheduled:
+            return
+        self._scheduled = True
+        wait = self._last_flush + self.frame - time.monotonic()
+        if wait > 0:
+            self.node.set_timer(wait, self.flush)
+        else:
+            self.node.call_later(self.flush)
+
+    def flush(self) -> None:
+        """Apply everything collected since the last flush"""
+        self._scheduled = False
+        self._last_flush = time.monotonic()
+        fields, self._fields = self._fields, {}
+        notes, self._notes = self._notes, {}
+        if not fields and not notes:
+            return
+        self.stats.flushes += 1
+
+        status_bar = self.node.query_one(StatusBar, None) if fields else None
+        if status_bar is not None:
+            if "status" in fields and status_bar.update_status(fields["status"]):
+                self.stats.renders += 1
+            if "queue" in fields and status_bar.update_queue(fields["queue"]):
+                self.stats.renders += 1
+
+        for severity, messages in notes.items():
+            self.node.notify(_merge(severity, messages), severity=severity)
+            self.stats.toasts += 1
+
+
+def _merge(severity: str, messages: List[str]) -> str:
+    """One toast's text for the messages of a severity"""
+    if severity == "information":
+        message = messages[-1]
+        if len(messages) > 1:
+            message = f"{message} (+{len(messages) - 1} more)"
+        return message
+    counts = Counter(messages)
+    if len(counts) == 1:
+        return (
+            messages[0] if len(messages) == 1 else f"{messages[0]} (x{len(messages)})"
+        )
+    lines = [
+        message if count == 1 else f"{message} (x{count})"
+        for message, count in list(counts.items())[:MAX_LISTED]
+    ]
+    if len(counts) > MAX_LISTED:
+        lines.append(f"... and {len(counts) - MAX_LISTED} more")
+    return "\n".join(lines)
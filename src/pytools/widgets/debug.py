@@ -0,0 +1,67 @@
+import time
+
+from textual.widgets import Static
+
+from pytools.utils.stats import percentiles
+from pytools.utils.tracing import memory_usage, tracer
+
+
+class DebugPanel(Static):
+    """Overlay showing recent span latencies, event-loop lag and memory"""
+
+    SAMPLE_INTERVAL = 0.25
+
+    def __init__(self, *args, **kwargs):
+        super().__init__("", *args, **kwargs)
+        self._expected = 0.0
+        self._timer = None
+
+    def on_mount(self) -> None:
+        """Start sampling if visible"""
+        self._timer = self.set_interval(
+            self.SAMPLE_INTERVAL, self._sample, pause=not self.display
+        )
+        self.set_visible(self.display)
+
+    def set_visible(self, visible: bool) -> None:
+        """Show or hide the panel, only sampling while it is shown"""
+        self.display = visible
+        if self._timer is None:
+            return
+        if visible:
+            self._expected = time.perf_counter() + self.SAMPLE_INTERVAL
+            self._render_stats()
+            self._timer.resume()
+        else:
+            self._timer.pause()
+
+    def _sample(self) -> None:
+        """Measure how late this callback ran and refresh the panel"""
+        now = time.perf_counter()
+        tracer.record_loop_lag(now - self._expected)
+        self._expected = now + self.SAMPLE_INTERVAL
+        self._render_stats()
+
+    def _render_stats(self) -> None:
+        lines = ["[b]Spans[/b]  count   p50   p95   p99 (ms)"]
+        for name, stats in tracer.stats().items():
+            lines.append(
+                f"{name[:22]:<22} {stats['count']:>5} "
+                f"{stats['p50'] * 1000:>5.0f} {stats['p95'] * 1000:>5.0f} "
+                f"{stats['p99'] * 1000:>5.0f}"
+            )
+        lines.append("")
+        lines.append("[b]Recent[/b]")
+        for span in tracer.recent(5):
+            lines.append(f"{span.name[:28]:<28} {span.duration * 1000:>7.1f} ms")
+        lag = percentiles(tracer.loop_lag)
+        lines.append("")
+        lines.append(
+            f"[b]Loop lag[/b] p50 {lag['p50'] * 1000:.1f} "
+            f"p99 {lag['p99'] * 1000:.1f} ms"
+        )
+        lines.append(f"[b]Memory[/b] {memory_usage() / 2**20:.1f} MiB")
+        updates = getattr(self.screen, "updates", None)
+        if updates is not None:
+            lines.append(f"[b]UI[/b] {updates.stats.summary()}")
+        self.update("\n".join(lines))
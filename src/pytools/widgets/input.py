@@ -1,24 +1,68 @@
+from typing import List, Optional, Tuple
+
 from textual.widgets import Input
 from textual.message import Message
 from textual.events import Key
+from textual.suggester import Suggester
+
+from pytools.services.history import CommandHistory, get_history
+
+
+class HistorySuggester(Suggester):
+    """Suggest the most recent history entry starting with the input"""
+
+    def __init__(self, history: CommandHistory):
+        # History changes as commands run, so never cache suggestions
+        super().__init__(use_cache=False, case_sensitive=False)
+        self.history = history
+
+    async def get_suggestion(self, value: str) -> Optional[str]:
+        return self.history.complete(value)
 
 
 class CustomInput(Input):
-    """Custom input widget with enhanced functionality"""
+    """Custom input widget with enhanced functionality
+
+    Up/down walk the persistent command history, a suggestion completes
+    the most recent matching command (accept with right), and ctrl+r
+    searches backwards: typing narrows the search, ctrl+r again finds the
+    next older match, escape restores the original text.
+    """
 
     class Submitted(Input.Submitted):
         """Custom submitted message"""
 
         pass
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, history: Optional[CommandHistory] = None, **kwargs):
+        self.history = history or get_history()
+        kwargs.setdefault("suggester", HistorySuggester(self.history))
         super().__init__(*args, **kwargs)
-        self.history = []
-        self.history_index = 0
+        self.history_index: Optional[int] = None
+        self._entries: List[str] = []
+        self._search: Optional[str] = None
+        self._search_index: Optional[int] = None
+        self._search_original = ""
+
+    def on_mount(self) -> None:
+        """Read the history file without blocking the UI"""
+        self.run_worker(self.history.load, thread=True, group="history")
+
+    def on_unmount(self) -> None:
+        """Write out commands still queued for the history file"""
+        self.history.close()
 
     async def on_key(self, event: Key) -> None:
         """Handle key events"""
-        if event.key == "up":
+        if self._search is not None and self._search_key(event):
+            event.prevent_default()
+            event.stop()
+            return
+        if event.key == "ctrl+r":
+            self._start_search()
+            event.prevent_default()
+            event.stop()
+        elif event.key == "up":
             await self._history_up()
             event.prevent_default()
         elif event.key == "down":
@@ -29,26 +73,69 @@ class CustomInput(Input):
 
     async def _history_up(self) -> None:
         """Navigate to previous command in history"""
-        if self.history and self.history_index > 0:
+        if self.history_index is None:
+            # Walk a snapshot so commands finishing meanwhile do not shift it
+            self._entries = self.history.entries()
+            self.history_index = len(self._entries)
+        if self.history_index > 0:
             self.history_index -= 1
-            self.value = self.history[self.history_index]
+            self.value = self._entries[self.history_index]
             self.cursor_position = len(self.value)
 
     async def _history_down(self) -> None:
         """Navigate to next command in history"""
-        if self.history and self.history_index < len(self.history) - 1:
+        if self.history_index is None:
+            return
+        if self.history_index < len(self._entries) - 1:
             self.history_index += 1
-            self.value = self.history[self.history_index]
+            self.value = self._entries[self.history_index]
             self.cursor_position = len(self.value)
-        elif self.history_index == len(self.history) - 1:
-            self.history_index += 1
+        else:
+            self.history_index = None
             self.value = ""
 
     def _add_to_history(self) -> None:
         """Add current value to history"""
-        if self.value and (not self.history or self.value != self.history[-1]):
-            self.history.append(self.value)
-            # Keep only last 50 commands
-            if len(self.history) > 50:
-                self.history.pop(0)
-            self.history_index = len(self.history)
+        self._end_search()
+        self.history.add(self.value)
+        self.history_index = None
+
+    def _start_search(self) -> None:
+        """Enter reverse search, seeded with the current text"""
+        self._search = self.value
+        self._search_index = None
+        self._search_original = self.value
+        self._search_step(self.history.search(self._search))
+
+    def _search_key(self, event: Key) -> bool:
+        """Handle a key while searching, returning whether it was consumed"""
+        if event.key == "ctrl+r":
+            self._search_step(self.history.search(self._search, self._search_index))
+        elif event.key == "escape":
+            value = self._search_original
+            self._end_search()
+            self.value = value
+        elif event.key == "backspace":
+            self._search = self._search[:-1]
+            self._search_step(self.history.search(self._search))
+        elif event.is_printable and event.character:
+            self._search += event.character
+            self._search_step(self.history.search(self._search))
+        else:
+            # Anything else keeps the match and edits it normally
+            self._end_search()
+            return False
+        return True
+
+    def _search_step(self, match: Optional[Tuple[int, str]]) -> None:
+        if match is not None:
+            self._search_index, self.value = match
+            self.cursor_position = len(self.value)
+            self.border_title = f"reverse-i-search: {self._search}"
+        else:
+            self.border_title = f"failing reverse-i-search: {self._search}"
+
+    def _end_search(self) -> None:
+        self._search = None
+        self._search_index = None
+        self.border_title = None
@@ -9,10 +9,13 @@ class StatusBar(Horizontal):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.status_text = Static("Ready", id="status-text")
+        self.queue_display = Static("", id="queue-display")
         self.time_display = Static("", id="time-display")
+        self._texts = {"status": "Ready", "queue": ""}
 
     def compose(self):
         yield self.status_text
+        yield self.queue_display
         yield self.time_display
 
     def on_mount(self) -> None:
@@ -25,6 +28,18 @@ class StatusBar(Horizontal):
         current_time = datetime.now().strftime("%H:%M:%S")
         self.time_display.update(f"[{current_time}]")
 
-    def update_status(self, message: str) -> None:
+    def _update(self, field: str, widget: Static, text: str) -> bool:
+        """Repaint a field if its text changed, returning whether it did"""
+        if self._texts[field] == text:
+            return False
+        self._texts[field] = text
+        widget.update(text)
+        return True
+
+    def update_status(self, message: str) -> bool:
         """Update the status message"""
-        self.status_text.update(message)
+        return self._update("status", self.status_text, message)
+
+    def update_queue(self, summary: str) -> bool:
+        """Update the command queue display"""
+        return self._update("queue", self.queue_display, summary)
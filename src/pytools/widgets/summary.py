@@ -0,0 +1,20 @@
+from textual.widgets import Static
+
+from pytools.services.summary import DataSummary
+
+
+class SummaryPanel(Static):
+    """Totals, counts per status and recent updates of the dataset"""
+
+    DAYS = 14
+
+    def __init__(self, *args, **kwargs):
+        super().__init__("", *args, markup=False, **kwargs)
+        self._rendered = ""
+
+    def update_summary(self, summary: DataSummary) -> None:
+        """Show the current aggregates, skipping redraws when unchanged"""
+        text = summary.format(days=self.DAYS, width=12)
+        if text != self._rendered:
+            self._rendered = text
+            self.update(text)
@@ -0,0 +1,139 @@
+from typing import Iterable, Optional, Protocol, Tuple
+
+from textual.widgets import DataTable
+
+from pytools.services.diff import DataDiff
+from pytools.services.schema import COLUMNS, to_display, to_keys
+
+
+class RowSource(Protocol):
+    """Anything that can serve display rows by range"""
+
+    @property
+    def row_count(self) -> int: ...
+
+    def display_rows(
+        self, offset: int = 0, length: int | None = None
+    ) -> Iterable[Tuple[str, ...]]: ...
+
+
+class PagedDataTable(DataTable):
+    """DataTable that only holds the rows around the cursor
+
+    Rows are pulled from a RowSource one window at a time, so the widget
+    costs the same whether the source has a thousand or ten million rows.
+    Rows are keyed by id so diffs can target them; a row whose id is null
+    or repeated gets a generated key instead and is only refreshed with
+    its window.
+    """
+
+    def __init__(
+        self,
+        source: RowSource,
+        page_size: int = 100,
+        prefetch: int = 50,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.source = source
+        self.page_size = max(page_size, 1)
+        self.prefetch = max(prefetch, 1)
+        self.window_start = 0
+        self.total_rows = 0
+
+    @property
+    def window_size(self) -> int:
+        """Maximum number of rows held at once"""
+        return self.page_size + 2 * self.prefetch
+
+    @property
+    def window_end(self) -> int:
+        """Absolute index one past the last loaded row"""
+        return self.window_start + self.row_count
+
+    @property
+    def absolute_cursor_row(self) -> int:
+        """Cursor position within the whole source"""
+        return self.window_start + self.cursor_row
+
+    def reload(self) -> None:
+        """Reload the current window from the source"""
+        self.total_rows = self.source.row_count
+        self._load_window(self.window_start, self.absolute_cursor_row)
+
+    def reset(self) -> None:
+        """Reload from the top, e.g. after the source was filtered"""
+        self.total_rows = self.source.row_count
+        self._load_window(0, 0)
+        self.scroll_home(animate=False)
+
+    def apply_diff(self, diff: DataDiff) -> None:
+        """Apply keyed changes to the loaded rows without rebuilding"""
+        previous_total = self.total_rows
+        self.total_rows = self.source.row_count
+        if previous_total == 0 or diff.change_count > self.window_size:
+            self._load_window(self.window_start, self.absolute_cursor_row)
+            return
+
+        # New rows land at the end of the source; they are only shown if
+        # the window currently reaches the tail
+        at_tail = self.window_end >= previous_total
+
+        for row_id in to_keys(diff.deleted):
+            if row_id in self.rows:
+                self.remove_row(row_id)
+
+        for row in to_display(diff.updated).iter_rows():
+            if row[0] in self.rows:
+                for column, value in zip(COLUMNS[1:], row[1:]):
+                    self.update_cell(row[0], column, value)
+
+        if at_tail:
+            room = self.window_size - self.row_count
+            for row in to_display(diff.inserted.head(room)).iter_rows():
+                if row[0] not in self.rows:
+                    self.add_row(*row, key=self._key(row))
+
+    def _key(self, row: Tuple[str, ...]) -> Optional[str]:
+        """Row key for an id, or None to let the table generate one"""
+        if not row[0] or row[0] in self.rows:
+            return None
+        return row[0]
+
+    def _load_window(self, start: int, cursor: int) -> None:
+        """Fill the table with the window starting at start"""
+        start = max(0, min(start, self.total_rows - self.window_size))
+        self.window_start = start
+        self.clear()
+        for row in self.source.display_rows(start, self.window_size):
+            self.add_row(*row, key=self._key(row))
+        if self.row_count:
+            row = max(0, min(cursor - start, self.row_count - 1))
+            self.move_cursor(row=row, animate=False)
+
+    def _maybe_shift(self) -> None:
+        """Slide the window when the cursor nears one of its edges"""
+        margin = self.prefetch // 2
+        cursor = self.absolute_cursor_row
+        if self.cursor_row < margin and self.window_start > 0:
+            self._load_window(cursor - self.prefetch - self.page_size, cursor)
+        elif (
+            self.cursor_row >= self.row_count - margin
+            and self.window_end < self.total_rows
+        ):
+            self._load_window(cursor - self.prefetch, cursor)
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Fetch the next page as the cursor scrolls"""
+        if event.data_table is self:
+            self._maybe_shift()
+
+    def action_scroll_top(self) -> None:
+        """Jump to the first row of the source"""
+        self._load_window(0, 0)
+        self.scroll_home(animate=False)
+
+    def action_scroll_bottom(self) -> None:
+        """Jump to the last row of the source"""
+        last = max(self.total_rows - 1, 0)
+        self._load_window(last - self.window_size + 1, last)
@@ -0,0 +1,117 @@
+import json
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# A fault is an HTTP status to answer with, "reset" to drop the connection
+# without answering, or ("delay", seconds) to answer normally but late
+Fault = Union[int, str, tuple]
+
+
+class FaultServer:
+    """Local stand-in for the records API that misbehaves on request
+
+    Serves GET /records?offset=&limit= as {"items": [...], "total": N},
+    with at most max_page items per page and an ETag that makes repeated
+    requests answer 304. Each request takes the next entry of faults
+    first, if any.
+    """
+
+    def __init__(self, total: int = 250, max_page: Optional[int] = None):
+        self.total = total
+        self.max_page = max_page
+        self.etag = '"v1"'
+        self.faults: List[Fault] = []
+        self.requests: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def hits(self) -> int:
+        return len(self.requests)
+
+    def start(self) -> "FaultServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def next_fault(self) -> Optional[Fault]:
+        with self._lock:
+            return self.faults.pop(0) if self.faults else None
+
+    def page(self, offset: int, limit: int) -> bytes:
+        if self.max_page is not None:
+            limit = min(limit, self.max_page)
+        items = [
+            {"id": i, "name": f"n{i}", "status": "active", "updated": "2024-01-01"}
+            for i in range(offset + 1, min(offset + limit, self.total) + 1)
+        ]
+        return json.dumps({"items": items, "total": self.total}).encode()
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                query = parse_qs(urlparse(self.path).query)
+                with server._lock:
+                    server.requests.append(
+                        {key: values[0] for key, values in query.items()}
+                    )
+                fault = server.next_fault()
+                if fault == "reset":
+                    # RST instead of FIN so the client sees a hard failure
+                    self.connection.setsockopt(
+                        socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0)
+                    )
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                if isinstance(fault, int):
+                    self._reply(fault, b"")
+                    return
+                if isinstance(fault, tuple):
+                    time.sleep(fault[1])
+                if self.headers.get("If-None-Match") == server.etag:
+                    self._reply(304, b"")
+                    return
+                offset = int(query.get("offset", ["0"])[0])
+                limit = int(query.get("limit", ["100"])[0])
+                self._reply(200, server.page(offset, limit))
+
+            def _reply(self, status: int, body: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", server.etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+@pytest.fixture
+def fault_server():
+    server = FaultServer().start()
+    yield server
+    server.stop()
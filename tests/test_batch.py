@@ -0,0 +1,41 @@
+import asyncio
+
+from pytools.services.batch import InvalidCommand, read_commands, run_batch
+
+
+class EchoService:
+    async def execute_command(self, command: str) -> str:
+        return command.upper()
+
+
+def test_reads_text_and_ndjson():
+    lines = ["# comment", "", "refresh", '{"command": "add x"}', '"summary"']
+    assert list(read_commands(lines)) == ["refresh", "add x", "summary"]
+
+
+def test_bad_lines_become_invalid_commands():
+    lines = ['{"command": "add x"', '{"cmd": "add y"}', '{"command": 3}', "refresh"]
+    commands = list(read_commands(lines, "auto"))
+    assert [isinstance(c, InvalidCommand) for c in commands] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    assert commands[0].error.startswith("Invalid JSON")
+    assert commands[1] == '{"cmd": "add y"}'
+
+
+def test_batch_reports_bad_lines_and_runs_the_rest():
+    lines = ['{"command": "add x"}', "{oops", '{"name": "y"}', '{"command": "stats"}']
+    results = []
+    stats = asyncio.run(
+        run_batch(EchoService(), read_commands(lines, "ndjson"), 2, results.append)
+    )
+    results.sort(key=lambda result: result.index)
+    assert [result.ok for result in results] == [True, False, False, True]
+    assert results[0].result == "ADD X"
+    assert results[3].result == "STATS"
+    assert '"ok": false' in results[1].to_json()
+    assert stats.count == 4
+    assert stats.errors == 2
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pytools.config.settings import CacheSettings
+from pytools.services.cache import CacheEntry, ResponseCache
+
+
+def make_cache(tmp_path, **overrides) -> ResponseCache:
+    return ResponseCache(CacheSettings(**overrides), tmp_path)
+
+
+def test_round_trip_through_disk(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("k", CacheEntry(body=b"{}", etag='"1"'))
+    reopened = make_cache(tmp_path)
+    entry = reopened.stale("k")
+    assert entry.body == b"{}"
+    assert entry.validators() == {"If-None-Match": '"1"'}
+
+
+def test_revalidation_does_not_modify_the_cached_entry(tmp_path):
+    cache = make_cache(tmp_path)
+    entry = CacheEntry(body=b"{}", stored_at=0.0)
+    cache.store("k", entry)
+    renewed = cache.revalidated("k", entry)
+    assert entry.stored_at == 0.0
+    assert renewed.stored_at > 0.0
+    assert cache.stale("k") is renewed
+
+
+def test_concurrent_use_keeps_size_and_lru_consistent(tmp_path):
+    cache = make_cache(tmp_path, memory_max_entries=16, disk_max_bytes=4000)
+
+    def work(i: int) -> None:
+        key = f"k{i % 40}"
+        cache.store(key, CacheEntry(body=b"x" * (50 + i % 7)))
+        entry = cache.stale(key)
+        if entry is not None:
+            cache.revalidated(key, entry)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(work, range(2000)))
+
+    on_disk = sum(p.stat().st_size for p in cache.disk.directory.glob("*.body"))
+    assert cache.disk.size == on_disk <= 4000
+    assert len(cache.memory) == 16
+    assert cache.stats.stores == 2000
+
+
+def test_unexpected_metadata_is_a_miss(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("k", CacheEntry(body=b"{}"))
+    cache.store("j", CacheEntry(body=b"[]"))
+    disk = make_cache(tmp_path).disk
+    _, meta_path = disk._paths("k")
+    meta_path.write_text('{"etag": null, "format": 2}')
+    _, other_path = disk._paths("j")
+    other_path.write_text('{"stored_at": "yesterday"}')
+    assert disk.get("k") is None
+    assert disk.get("j") is None
+    assert disk.size == 0
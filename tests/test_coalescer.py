@@ -0,0 +1,19 @@
+from pytools.widgets.coalescer import MAX_LISTED, _merge
+
+
+def test_information_shows_the_latest():
+    assert _merge("information", ["a"]) == "a"
+    assert _merge("information", ["a", "b", "c"]) == "c (+2 more)"
+
+
+def test_errors_list_each_distinct_message():
+    messages = ["disk full", "timeout", "disk full"]
+    assert _merge("error", messages) == "disk full (x2)\ntimeout"
+    assert _merge("warning", ["late", "late"]) == "late (x2)"
+
+
+def test_long_error_lists_are_capped():
+    messages = [f"error {i}" for i in range(MAX_LISTED + 3)]
+    lines = _merge("error", messages).split("\n")
+    assert len(lines) == MAX_LISTED + 1
+    assert lines[-1] == "... and 3 more"
@@ -0,0 +1,164 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from pytools.config import manager as manager_module
+from pytools.config import settings as settings_module
+from pytools.config.manager import ConfigError, ConfigManager
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    # Each test publishes its own snapshots; restore the global afterwards
+    monkeypatch.setattr(settings_module, "_settings", None)
+    monkeypatch.delenv("UI__REFRESH_RATE", raising=False)
+
+
+def write_config(path: Path, data: dict) -> None:
+    path.write_text(yaml.safe_dump(data))
+
+
+def make_manager(tmp_path: Path, data: dict) -> ConfigManager:
+    path = tmp_path / "config.yaml"
+    write_config(path, data)
+    return ConfigManager(path, env_file=tmp_path / ".env")
+
+
+def test_load_reads_the_yaml_file(tmp_path):
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    settings = manager.load()
+    assert settings.ui.refresh_rate == 1.5
+    assert settings_module.get_settings() is settings
+
+
+def test_check_notices_a_file_edit(tmp_path):
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    before = manager.load()
+    assert manager.check() is None
+    write_config(manager.path, {"ui": {"refresh_rate": 2.25}, "debug": False})
+    update = manager.check()
+    assert update is not None
+    assert update.sections == {"ui"}
+    assert update.previous is before
+    assert manager.settings.ui.refresh_rate == 2.25
+    # Unchanged sections are shared with the previous snapshot
+    assert manager.settings.api is before.api
+
+
+def test_update_publishes_the_changed_sections(tmp_path):
+    manager = make_manager(tmp_path, {})
+    manager.load()
+    received = []
+    manager.subscribe(received.append)
+    update = manager.update({"ui": {"refresh_rate": 3.0}})
+    assert received == [update]
+    assert update.version == 1
+    assert update.changed("ui")
+    assert update.changed("ui", "refresh_rate")
+    assert not update.changed("ui", "page_size")
+    assert not update.changed("api")
+    assert update.fields("ui") == {"refresh_rate"}
+    saved = yaml.safe_load(manager.path.read_text())
+    assert saved["ui"]["refresh_rate"] == 3.0
+
+
+def test_update_without_a_change_publishes_nothing(tmp_path):
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    manager.load()
+    received = []
+    manager.subscribe(received.append)
+    assert manager.update({"ui": {"refresh_rate": 1.5}}) is None
+    assert received == []
+
+
+def test_runtime_override_is_published_but_not_saved(tmp_path):
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    manager.load()
+    update = manager.update({"debug": True}, persist=False)
+    assert update.sections == {"debug"}
+    assert manager.settings.debug
+    assert "debug" not in yaml.safe_load(manager.path.read_text())
+    # A reload of the file keeps the override
+    write_config(manager.path, {"ui": {"refresh_rate": 2.5}})
+    manager.check()
+    assert manager.settings.debug
+    assert manager.settings.ui.refresh_rate == 2.5
+
+
+def test_published_snapshots_are_frozen(tmp_path):
+    manager = make_manager(tmp_path, {})
+    settings = manager.load()
+    with pytest.raises(ValueError):
+        settings.debug = True
+    with pytest.raises(ValueError):
+        settings.ui.show_debug = True
+
+
+def test_second_load_is_served_from_the_cache(tmp_path):
+    first = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    first.load()
+    assert not first.from_cache
+    assert first.cache_path.exists()
+    second = ConfigManager(first.path, env_file=tmp_path / ".env")
+    settings = second.load()
+    assert second.from_cache
+    assert settings.ui.refresh_rate == 1.5
+
+
+def test_cache_is_invalidated_by_a_file_edit(tmp_path):
+    make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}}).load()
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 2.75}})
+    assert manager.load().ui.refresh_rate == 2.75
+    assert not manager.from_cache
+
+
+def test_cache_is_invalidated_by_the_environment(tmp_path, monkeypatch):
+    make_manager(tmp_path, {}).load()
+    monkeypatch.setenv("UI__REFRESH_RATE", "4.5")
+    manager = ConfigManager(tmp_path / "config.yaml", env_file=tmp_path / ".env")
+    assert manager.load().ui.refresh_rate == 4.5
+    assert not manager.from_cache
+
+
+def test_cache_is_invalidated_by_the_settings_module(tmp_path, monkeypatch):
+    # The cache key includes the stat of settings.py next to manager.py
+    module_dir = tmp_path / "module"
+    module_dir.mkdir()
+    fake_settings = module_dir / "settings.py"
+    fake_settings.write_text("# v1\n")
+    monkeypatch.setattr(manager_module, "__file__", str(module_dir / "manager.py"))
+    make_manager(tmp_path, {}).load()
+    cached = ConfigManager(tmp_path / "config.yaml", env_file=tmp_path / ".env")
+    cached.load()
+    assert cached.from_cache
+    fake_settings.write_text("# version 2\n")
+    manager = ConfigManager(tmp_path / "config.yaml", env_file=tmp_path / ".env")
+    manager.load()
+    assert not manager.from_cache
+
+
+def test_invalid_edit_keeps_the_last_good_snapshot(tmp_path):
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    good = manager.load()
+    received = []
+    manager.subscribe(received.append)
+    write_config(manager.path, {"ui": {"refresh_rate": "fast"}})
+    with pytest.raises(ConfigError):
+        manager.check()
+    assert manager.settings is good
+    assert received == []
+    # The bad file is not read again until it changes once more
+    assert manager.check() is None
+    write_config(manager.path, {"ui": {"refresh_rate": 0.75}})
+    assert manager.check().changed("ui", "refresh_rate")
+    assert manager.settings.ui.refresh_rate == 0.75
+
+
+def test_invalid_update_is_not_written(tmp_path):
+    manager = make_manager(tmp_path, {"ui": {"refresh_rate": 1.5}})
+    manager.load()
+    with pytest.raises(ConfigError):
+        manager.update({"ui": {"refresh_rate": "fast"}})
+    assert yaml.safe_load(manager.path.read_text())["ui"]["refresh_rate"] == 1.5
+    assert manager.settings.ui.refresh_rate == 1.5
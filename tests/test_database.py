@@ -0,0 +1,170 @@
+import asyncio
+from datetime import date
+
+import polars as pl
+import pytest
+
+from pytools.config.settings import DatabaseConfig
+from pytools.services.database import IN_BATCH, ConnectionPool, Database
+from pytools.services.schema import frame_from_records
+
+
+@pytest.fixture
+def run(tmp_path):
+    """Run a coroutine against an open SQLite database in tmp_path"""
+    config = DatabaseConfig(driver="sqlite", sqlite_path="test.db", fetch_size=7)
+    db = Database(config, tmp_path)
+
+    def run(work):
+        async def main():
+            await db.open()
+            try:
+                return await work(db)
+            finally:
+                await db.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def records(*rows):
+    return frame_from_records(
+        {"id": i, "name": n, "status": "active", "updated": u} for i, n, u in rows
+    )
+
+
+def test_add_assigns_increasing_ids(run):
+    async def work(db):
+        first = await db.add("alpha")
+        second = await db.add("beta")
+        return first, second, await db.fetch_frame()
+
+    first, second, frame = run(work)
+    assert first.inserted.row(0, named=True)["id"] == 1
+    assert second.inserted.row(0, named=True)["id"] == 2
+    assert second.inserted.row(0, named=True)["updated"] == date.today()
+    assert frame.get_column("name").to_list() == ["alpha", "beta"]
+
+
+def test_add_continues_after_existing_ids(run):
+    async def work(db):
+        await db.write_frame(records((41, "x", date(2024, 1, 1))))
+        return await db.add("next")
+
+    assert run(work).inserted.row(0, named=True)["id"] == 42
+
+
+def test_delete_returns_deleted_rows(run):
+    async def work(db):
+        await db.write_frame(
+            records(*((i, f"n{i}", date(2024, 1, 1)) for i in range(1, 11)))
+        )
+        diff = await db.delete([3, 5, 5, 99])
+        return diff, await db.fetch_frame()
+
+    diff, frame = run(work)
+    assert sorted(diff.deleted.get_column("id").to_list()) == [3, 5]
+    assert frame.height == 8
+    assert 3 not in frame.get_column("id").to_list()
+
+
+def test_delete_in_batches(run):
+    count = IN_BATCH * 2 + 10
+
+    async def work(db):
+        await db.write_frame(
+            records(*((i, f"n{i}", date(2024, 1, 1)) for i in range(count)))
+        )
+        diff = await db.delete(range(count - 1))
+        return diff, await db.fetch_frame()
+
+    diff, frame = run(work)
+    assert diff.deleted.height == count - 1
+    assert frame.get_column("id").to_list() == [count - 1]
+
+
+def test_fetch_since_filters_on_updated(run):
+    async def work(db):
+        await db.write_frame(
+            records(
+                (1, "old", date(2023, 12, 31)),
+                (2, "edge", date(2024, 1, 1)),
+                (3, "new", date(2024, 6, 1)),
+            )
+        )
+        return (
+            await db.fetch_since(date(2024, 1, 1)),
+            await db.fetch_since(date(2025, 1, 1)),
+        )
+
+    since, none = run(work)
+    assert since.get_column("id").to_list() == [2, 3]
+    assert since.schema["updated"] == pl.Date
+    assert none.is_empty()
+
+
+def test_fetch_reads_across_chunks(run):
+    async def work(db):
+        await db.write_frame(
+            records(*((i, f"n{i}", date(2024, 1, 1)) for i in range(1, 31)))
+        )
+        return await db.fetch_frame(), await db.fetch_since(date(2024, 1, 1))
+
+    whole, since = run(work)
+    assert whole.get_column("id").to_list() == list(range(1, 31))
+    assert since.height == 30
+
+
+class FakeConnection:
+    def rollback(self) -> None:
+        pass
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+async def peak_checkouts(pool: ConnectionPool, jobs: int, resize_to=None) -> int:
+    active = peak = 0
+
+    async def job() -> None:
+        nonlocal active, peak
+        async with pool.acquire():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    tasks = [asyncio.create_task(job()) for _ in range(jobs)]
+    if resize_to is not None:
+        await asyncio.sleep(0.005)
+        pool.resize(resize_to)
+        # Count from once the checkouts made before the resize are done
+        await asyncio.sleep(0.015)
+        peak = active
+    await asyncio.gather(*tasks)
+    return peak
+
+
+def test_pool_never_exceeds_a_lowered_limit():
+    async def main():
+        pool = ConnectionPool(FakeConnection, size=4)
+        assert await peak_checkouts(pool, 20, resize_to=2) == 2
+        assert await peak_checkouts(pool, 20) == 2
+        assert pool.size <= 2
+
+    asyncio.run(main())
+
+
+def test_pool_grows_in_place():
+    async def main():
+        pool = ConnectionPool(FakeConnection, size=2)
+        assert await peak_checkouts(pool, 20, resize_to=5) == 5
+        pool.resize(3)
+        pool.resize(6)
+        assert await peak_checkouts(pool, 20) == 6
+
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+from datetime import date
+
+from pytools.services.diff import DataDiff, apply_diff, diff_frames, merge_diffs
+from pytools.services.schema import frame_from_records
+
+
+def frame(*rows):
+    return frame_from_records(
+        [
+            {"id": id, "name": name, "status": status, "updated": updated}
+            for id, name, status, updated in rows
+        ]
+    )
+
+
+def ids(frame):
+    return frame.get_column("id").to_list()
+
+
+def same_rows(a, b) -> bool:
+    return a.sort("id").equals(b.sort("id"))
+
+
+OLD = frame(
+    (1, "a", "active", date(2024, 1, 1)),
+    (2, "b", "active", date(2024, 1, 2)),
+    (3, "c", "inactive", None),
+)
+
+
+def test_insert_update_and_delete():
+    new = frame(
+        (1, "a", "active", date(2024, 1, 1)),
+        (2, "B", "active", date(2024, 1, 5)),
+        (4, "d", "active", None),
+    )
+    diff = diff_frames(OLD, new)
+    assert ids(diff.inserted) == [4]
+    assert ids(diff.updated) == [2]
+    assert ids(diff.deleted) == [3]
+    assert diff.updated.row(0) == (2, "B", "active", date(2024, 1, 5))
+    # replaced holds the previous values of the updated rows
+    assert diff.replaced.row(0) == (2, "b", "active", date(2024, 1, 2))
+    assert diff.summary() == "+1 ~1 -1"
+    assert same_rows(apply_diff(OLD, diff), new)
+
+
+def test_identical_frames_give_an_empty_diff():
+    assert diff_frames(OLD, OLD.clone()).is_empty()
+
+
+def test_from_and_to_an_empty_frame():
+    empty = OLD.clear()
+    assert ids(diff_frames(empty, OLD).inserted) == [1, 2, 3]
+    assert ids(diff_frames(OLD, empty).deleted) == [1, 2, 3]
+    assert apply_diff(OLD, diff_frames(OLD, empty)).is_empty()
+
+
+def test_changes_to_and_from_null_are_updates():
+    new = frame(
+        (1, "a", None, date(2024, 1, 1)),
+        (2, "b", "active", None),
+        (3, "c", "inactive", date(2024, 2, 1)),
+    )
+    diff = diff_frames(OLD, new)
+    assert ids(diff.updated) == [1, 2, 3]
+    assert diff.inserted.is_empty() and diff.deleted.is_empty()
+    assert same_rows(apply_diff(OLD, diff), new)
+    # Nulls on both sides are equal, not a change
+    assert diff_frames(new, new.clone()).is_empty()
+
+
+def test_repeated_ids_count_once_with_their_last_row():
+    old = frame((1, "a", "active", None), (1, "a2", "active", None))
+    new = frame((1, "z", "active", None), (2, "b", None, None), (2, "b2", None, None))
+    diff = diff_frames(old, new)
+    assert diff.updated.rows() == [(1, "z", "active", None)]
+    assert diff.replaced.rows() == [(1, "a2", "active", None)]
+    assert diff.inserted.rows() == [(2, "b2", None, None)]
+    assert same_rows(
+        apply_diff(frame((1, "a2", "active", None)), diff),
+        frame((1, "z", "active", None), (2, "b2", None, None)),
+    )
+
+
+def test_merge_of_insert_then_delete_cancels_out():
+    mid = frame(*OLD.rows(), (4, "d", "active", None))
+    merged = merge_diffs(diff_frames(OLD, mid), diff_frames(mid, OLD))
+    assert merged.is_empty()
+
+
+def test_merge_of_update_then_delete_reports_the_original_row():
+    mid = frame(*OLD.rows()[:1], (2, "B", "inactive", None), *OLD.rows()[2:])
+    new = frame(*OLD.rows()[:1], *OLD.rows()[2:])
+    merged = merge_diffs(diff_frames(OLD, mid), diff_frames(mid, new))
+    assert merged.updated.is_empty() and merged.replaced.is_empty()
+    assert merged.deleted.rows() == [OLD.row(1)]
+    assert same_rows(apply_diff(OLD, merged), new)
+
+
+def test_merge_has_the_net_effect_of_both_diffs():
+    mid = frame(
+        (1, "a1", "active", None),
+        (2, "b", "active", date(2024, 1, 2)),
+        (4, "d", None, None),
+    )
+    new = frame(
+        (1, "a2", "active", None), (4, "d2", "active", None), (5, "e", None, None)
+    )
+    merged = merge_diffs(diff_frames(OLD, mid), diff_frames(mid, new))
+    assert same_rows(apply_diff(OLD, merged), new)
+    assert sorted(ids(merged.inserted)) == [4, 5]
+    assert ids(merged.updated) == [1]
+    assert merged.replaced.rows() == [OLD.row(0)]
+    assert sorted(ids(merged.deleted)) == [2, 3]
+
+
+def test_merge_with_an_empty_diff():
+    diff = diff_frames(OLD, OLD.head(1))
+    assert merge_diffs(DataDiff(), diff) is diff
+    assert merge_diffs(diff, DataDiff()) is diff
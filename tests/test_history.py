@@ -0,0 +1,68 @@
+import threading
+
+from pytools.config.settings import HistorySettings
+from pytools.services.history import CommandHistory
+
+
+def make_history(tmp_path, lines=(), **overrides) -> CommandHistory:
+    path = tmp_path / "history"
+    path.write_text("".join(f"{line}\n" for line in lines))
+    return CommandHistory(path, HistorySettings(flush_interval=60, **overrides))
+
+
+def test_load_keeps_the_last_occurrence(tmp_path):
+    history = make_history(tmp_path, ["a", "b", "a", "c"])
+    history.load()
+    assert history.entries() == ["b", "a", "c"]
+    assert history.complete("B") == "b"
+    assert history.search("a") == (1, "a")
+
+
+def test_commands_added_before_load_are_replayed(tmp_path):
+    history = make_history(tmp_path, ["refresh", "summary"])
+    history.add("add early")
+    history.add("refresh")
+    assert history.entries() == []
+    history.load()
+    assert history.entries() == ["summary", "add early", "refresh"]
+    assert history.complete("add") == "add early"
+    history.close()
+
+
+def test_load_on_a_thread_while_adding(tmp_path):
+    history = make_history(tmp_path, [f"old {i}" for i in range(20000)])
+    loader = threading.Thread(target=history.load)
+    loader.start()
+    for i in range(2000):
+        history.add(f"new {i}")
+        history.complete("new")
+    loader.join()
+    entries = history.entries()
+    assert len(entries) == 22000
+    assert entries[-1] == "new 1999"
+    assert history.complete("new 19") == "new 1999"
+    assert history.complete("old 1999") == "old 19999"
+    history.close()
+
+
+def test_alternating_adds_and_searches(tmp_path):
+    history = make_history(tmp_path)
+    history.load()
+    history.add("seed")
+    history.search("seed")
+    corpus = history._corpus
+    added = []
+    for i in range(300):
+        # Repeats move an entry to the end; non-ASCII checks byte offsets
+        command = f"ÉCHO {i % 50} ünïcode" if i % 3 else f"ls dir{i}"
+        history.add(command)
+        added.append(command)
+        match = history.search("écho")
+        expected = next((c for c in reversed(added) if "écho" in c.lower()), None)
+        assert (match[1] if match else None) == expected
+        assert history.complete("ls d") == (
+            next((c for c in reversed(added) if c.startswith("ls d")), None)
+        )
+    # New entries were appended to the same buffer, not a rebuilt copy
+    assert history._corpus is corpus
+    history.close()
@@ -0,0 +1,62 @@
+import asyncio
+
+from pytools.config.settings import APISettings
+from pytools.services.http import HttpPool
+
+
+def fetch_all(server, page_size: int, **params):
+    pool = HttpPool(APISettings(base_url=server.url, multiplexed=False, hedge=False))
+
+    async def main():
+        try:
+            return await pool.get_paginated("/records", page_size, params)
+        finally:
+            await pool.close()
+
+    return asyncio.run(main())
+
+
+def ids(records):
+    return [record["id"] for record in records]
+
+
+def test_fetches_every_page(fault_server):
+    records = fetch_all(fault_server, 100)
+    assert ids(records) == list(range(1, 251))
+    offsets = sorted(int(r["offset"]) for r in fault_server.requests)
+    assert offsets == [0, 100, 200]
+    assert all(r["limit"] == "100" for r in fault_server.requests)
+
+
+def test_single_page(fault_server):
+    records = fetch_all(fault_server, 1000)
+    assert ids(records) == list(range(1, 251))
+    assert fault_server.hits == 1
+
+
+def test_page_boundary_on_total(fault_server):
+    fault_server.total = 200
+    records = fetch_all(fault_server, 100)
+    assert ids(records) == list(range(1, 201))
+    assert fault_server.hits == 2
+
+
+def test_empty_collection(fault_server):
+    fault_server.total = 0
+    assert fetch_all(fault_server, 100) == []
+    assert fault_server.hits == 1
+
+
+def test_server_capped_page_size(fault_server):
+    fault_server.max_page = 40
+    records = fetch_all(fault_server, 100)
+    assert ids(records) == list(range(1, 251))
+    offsets = sorted(int(r["offset"]) for r in fault_server.requests)
+    assert offsets == list(range(0, 250, 40))
+    assert all(r["limit"] == "40" for r in fault_server.requests[1:])
+
+
+def test_extra_params_are_sent_with_every_page(fault_server):
+    fetch_all(fault_server, 100, updated_since="2024-01-01")
+    assert fault_server.hits == 3
+    assert all(r["updated_since"] == "2024-01-01" for r in fault_server.requests)
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import date
+
+import polars as pl
+import pytest
+
+from pytools.services.ingest import (
+    RAW_SCHEMA,
+    Chunk,
+    iter_chunks,
+    parse_chunk,
+    plan_chunks,
+    validate,
+)
+
+
+def write(tmp_path, name: str, data: bytes):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return path
+
+
+def ranges(path, chunks):
+    data = path.read_bytes()
+    return [data[chunk.start : chunk.end] for chunk in chunks]
+
+
+def test_chunks_end_on_line_boundaries(tmp_path):
+    lines = [f'{{"id": "{i}", "name": "name {i}"}}\n'.encode() for i in range(20)]
+    path = write(tmp_path, "in.ndjson", b"".join(lines))
+    header, chunks = plan_chunks(path, 100)
+    assert header == b""
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    assert chunks[0].start == 0 and chunks[-1].end == path.stat().st_size
+    assert all(a.end == b.start for a, b in zip(chunks, chunks[1:]))
+    assert all(part.endswith(b"\n") for part in ranges(path, chunks))
+    assert b"".join(ranges(path, chunks)) == b"".join(lines)
+
+
+def test_chunk_size_smaller_than_a_line_gives_one_line_per_chunk(tmp_path):
+    path = write(tmp_path, "in.ndjson", b"first line\nsecond\nthird line here\n")
+    _, chunks = plan_chunks(path, 1)
+    assert ranges(path, chunks) == [b"first line\n", b"second\n", b"third line here\n"]
+
+
+def test_last_chunk_without_a_trailing_newline(tmp_path):
+    path = write(tmp_path, "in.ndjson", b"one\ntwo\nthree")
+    _, chunks = plan_chunks(path, 5)
+    assert ranges(path, chunks) == [b"one\ntwo\n", b"three"]
+
+
+def test_csv_header_is_kept_out_of_the_chunks(tmp_path):
+    path = write(tmp_path, "in.csv", b"id,name\n1,a\n2,b\n")
+    header, chunks = plan_chunks(path, 1, skip_header=True)
+    assert header == b"id,name\n"
+    assert ranges(path, chunks) == [b"1,a\n", b"2,b\n"]
+
+
+def test_empty_file_has_no_chunks(tmp_path):
+    path = write(tmp_path, "in.csv", b"id,name\n")
+    assert plan_chunks(path, 10, skip_header=True) == (b"id,name\n", [])
+
+
+def raw(**columns) -> pl.DataFrame:
+    height = len(next(iter(columns.values())))
+    data = {name: columns.get(name, [None] * height) for name in RAW_SCHEMA}
+    return pl.DataFrame(data, schema=RAW_SCHEMA)
+
+
+def test_validate_rejects_bad_ids_and_dates():
+    frame, invalid = validate(
+        raw(
+            id=["1", "x", None, "4", "5"],
+            name=["a", "b", "c", "d", None],
+            updated=["2024-01-02", "2024-01-02", None, "yesterday", None],
+        )
+    )
+    assert invalid == 3
+    assert frame.get_column("id").to_list() == [1, 5]
+    assert frame.get_column("updated").to_list() == [date(2024, 1, 2), None]
+
+
+def test_validate_requires_an_id_column():
+    with pytest.raises(ValueError, match="no id column"):
+        validate(pl.DataFrame({"name": ["a"]}))
+
+
+def parse_file(tmp_path, name: str, data: bytes, header: bytes = b""):
+    path = write(tmp_path, name, header + data)
+    fmt = "csv" if name.endswith(".csv") else "ndjson"
+    chunk = Chunk(0, len(header), len(header) + len(data))
+    return parse_chunk(path, fmt, chunk, header)
+
+
+def test_malformed_ndjson_lines_are_skipped(tmp_path):
+    result = parse_file(
+        tmp_path,
+        "in.ndjson",
+        b'{"id": "1", "name": "a"}\n'
+        b"not json\n"
+        b"[1, 2]\n"
+        b'{"id": "2", "name": "b"\n'
+        b"\xff\xfe\n"
+        b'{"id": "3", "name": "c"}\n',
+    )
+    assert result.frame.get_column("id").to_list() == [1, 3]
+    assert result.invalid == 4
+
+
+def test_malformed_csv_lines_are_skipped(tmp_path):
+    result = parse_file(
+        tmp_path,
+        "in.csv",
+        b'1,a\n2,"b\n3,c,extra\n4,"d"x\n\xff,e\n5,f\n',
+        header=b"id,name\n",
+    )
+    assert result.frame.get_column("id").to_list() == [1, 5]
+    assert result.invalid == 4
+
+
+def test_well_formed_chunk_counts_only_invalid_values(tmp_path):
+    result = parse_file(tmp_path, "in.csv", b"1,a\nx,b\n", header=b"id,name\n")
+    assert result.frame.get_column("id").to_list() == [1]
+    assert result.invalid == 1
+
+
+def test_iter_chunks_keeps_file_order_so_the_last_record_wins(tmp_path):
+    lines = [f'{{"id": "{i % 7}", "name": "v{i}"}}\n'.encode() for i in range(200)]
+    path = write(tmp_path, "in.ndjson", b"".join(lines))
+
+    async def collect():
+        return [result async for result in iter_chunks(path, chunk_size=64, workers=4)]
+
+    results = asyncio.run(collect())
+    assert len(results) > 8
+    assert [result.chunk.index for result in results] == list(range(len(results)))
+    merged = pl.concat([result.frame for result in results]).unique(
+        "id", keep="last", maintain_order=True
+    )
+    latest = {i % 7: f"v{i}" for i in range(200)}
+    assert dict(merged.select("id", "name").iter_rows()) == latest
@@ -0,0 +1,27 @@
+import json
+import logging
+import sys
+
+from pytools.utils.logger import JsonFormatter, RotatingBatchFile
+
+
+def test_json_formatter_includes_the_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.makeLogRecord({"msg": "failed", "exc_info": sys.exc_info()})
+    payload = json.loads(JsonFormatter().format(record))
+    assert payload["message"] == "failed"
+    assert "ValueError: boom" in payload["exc"]
+
+
+def test_rotation_counts_encoded_bytes(tmp_path):
+    path = tmp_path / "app.log"
+    log = RotatingBatchFile(path, max_bytes=100, backup_count=2, rotate_interval=None)
+    # 30 characters, 88 bytes in UTF-8
+    log.write(["€" * 29])
+    assert not path.with_name("app.log.1").exists()
+    log.write(["€" * 5])
+    log.close()
+    assert path.with_name("app.log.1").stat().st_size == 88 + 16
+    assert path.stat().st_size == 0
@@ -0,0 +1,113 @@
+import sys
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from pytools.config import settings as settings_module
+from pytools.config.settings import Settings
+from pytools.services import plugins
+from pytools.services.plugins import PluginRegistry, parse_spec
+
+
+@pytest.fixture
+def plugin_dir(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # No installed plugins unless a test provides some
+    monkeypatch.setattr(plugins, "entry_points", lambda group: [])
+    yield tmp_path
+    for name in [name for name in sys.modules if name.startswith("plug_")]:
+        del sys.modules[name]
+
+
+def write_module(directory, name: str, source: str) -> None:
+    (directory / f"{name}.py").write_text(source)
+
+
+def test_parse_spec():
+    spec = parse_spec(" command:hello = mod.sub:func ")
+    assert (spec.kind, spec.name, spec.target) == ("command", "hello", "mod.sub:func")
+    assert parse_spec("mod.plugin").kind == plugins.MODULE
+    with pytest.raises(ValueError):
+        parse_spec("widget:x=mod:obj")
+    with pytest.raises(ValueError):
+        parse_spec("command:=mod:obj")
+
+
+def test_settings_plugin_is_imported_on_first_lookup(plugin_dir):
+    write_module(
+        plugin_dir, "plug_hello", "async def hello(service, args):\n    return args\n"
+    )
+    registry = PluginRegistry()
+    registry.discover(["command:hello=plug_hello:hello"])
+    assert registry.names("command") == ["hello"]
+    assert "plug_hello" not in sys.modules
+    hello = registry.get("command", "hello")
+    assert hello is sys.modules["plug_hello"].hello
+    assert registry.specs["command", "hello"].loaded
+
+
+def test_plugins_default_to_the_settings_list(plugin_dir, monkeypatch):
+    write_module(
+        plugin_dir, "plug_source", "async def rows(service):\n    return None\n"
+    )
+    monkeypatch.setattr(
+        settings_module, "_settings", Settings(plugins=["source:rows=plug_source:rows"])
+    )
+    registry = PluginRegistry()
+    assert registry.names("source") == ["rows"]
+    assert registry.get("source", "rows") is not None
+
+
+def test_bad_plugins_are_logged_and_skipped(plugin_dir):
+    write_module(plugin_dir, "plug_partial", "value = 1\n")
+    registry = PluginRegistry()
+    registry.discover(
+        [
+            "command:missing=plug_no_such_module:run",
+            "command:noattr=plug_partial:run",
+            "not a valid = entry",
+            "command:ok=plug_partial:value",
+        ]
+    )
+    assert registry.names("command") == ["missing", "noattr", "ok"]
+    assert registry.get("command", "missing") is None
+    assert registry.get("command", "noattr") is None
+    assert "ModuleNotFoundError" in registry.specs["command", "missing"].error
+    assert "AttributeError" in registry.specs["command", "noattr"].error
+    assert registry.get("command", "ok") == 1
+
+
+def test_module_plugins_load_on_the_first_miss(plugin_dir):
+    write_module(
+        plugin_dir,
+        "plug_module",
+        "CALLS = []\n"
+        "def register(registry):\n"
+        "    CALLS.append(1)\n"
+        "    registry.add('screen', 'extra', object)\n",
+    )
+    registry = PluginRegistry()
+    registry.discover(["plug_module"])
+    # Only register() knows what a module provides, so it is not listed yet
+    assert registry.names("screen") == []
+    assert "plug_module" not in sys.modules
+    assert registry.get("screen", "extra") is object
+    assert registry.get("screen", "unknown") is None
+    assert sys.modules["plug_module"].CALLS == [1]
+
+
+def test_entry_points_are_discovered_and_settings_win(plugin_dir, monkeypatch):
+    write_module(plugin_dir, "plug_a", "def run(service, args):\n    return 'a'\n")
+    write_module(plugin_dir, "plug_b", "def run(service, args):\n    return 'b'\n")
+    installed = {
+        "pytools.commands": [
+            EntryPoint("run", "plug_b:run", "pytools.commands"),
+            EntryPoint("other", "plug_b:run", "pytools.commands"),
+        ]
+    }
+    monkeypatch.setattr(plugins, "entry_points", lambda group: installed.get(group, []))
+    registry = PluginRegistry()
+    registry.discover(["command:run=plug_a:run"])
+    assert registry.names("command") == ["other", "run"]
+    assert registry.get("command", "run")(None, "") == "a"
+    assert registry.get("command", "other")(None, "") == "b"
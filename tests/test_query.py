@@ -0,0 +1,87 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from pytools.services.query import DataView, ViewQuery, parse_query
+from pytools.services.schema import frame_from_records
+
+
+class StubService:
+    def __init__(self, frame):
+        self.frame = frame
+
+
+def dataset(rows: int = 400):
+    rng = random.Random(3)
+    return frame_from_records(
+        [
+            {
+                "id": i,
+                "name": rng.choice(["alpha", "beta", "gamma", "Alpine"]) + str(i % 7)
+                if i % 11
+                else None,
+                "status": rng.choice(["active", "inactive", None]),
+                "updated": date(2024, 1, 1) + timedelta(days=rng.randrange(60))
+                if i % 5
+                else None,
+            }
+            for i in range(1, rows + 1)
+        ]
+    )
+
+
+def fresh(service, query: ViewQuery):
+    return DataView(service).compute(query)
+
+
+def check(view, service, text: str):
+    query = parse_query(text)
+    result = view.apply(query)
+    expected = fresh(service, query)
+    assert result.rows.equals(expected.rows), text
+    assert result.filtered.equals(expected.filtered), text
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        # Typing narrows the search, then deleting widens it again
+        ["a", "al", "alp", "alph", "alp", "a", ""],
+        # Conditions added one at a time, then removed
+        ["status=active", "status=active id>=100", "status=active id>=100 name~al"],
+        ["name~a", "name~al id<300", "name~a id<300", "id<300"],
+        # The same filter under different sorts, and the sort dropped
+        ["sort:name a", "sort:name al", "sort:-updated al", "al", "alp", "sort:id alp"],
+        ["sort:-status status!=active", "sort:-status status!=active id>50", "id>50"],
+        [
+            "sort:updated name~a",
+            "sort:updated name~alp",
+            "name~alp",
+            "sort:-id name~alp",
+        ],
+    ],
+)
+def test_incremental_views_match_a_fresh_compute(steps):
+    service = StubService(dataset())
+    view = DataView(service)
+    for text in steps:
+        check(view, service, text)
+
+
+def test_narrowing_reuses_the_previous_result():
+    service = StubService(dataset())
+    view = DataView(service)
+    wide = view.apply(parse_query("al"))
+    narrow = view.compute(parse_query("alp"))
+    assert narrow.base is wide.base
+    assert narrow.filtered.height <= wide.filtered.height
+
+
+def test_a_new_dataset_is_filtered_from_scratch():
+    service = StubService(dataset())
+    view = DataView(service)
+    view.apply(parse_query("sort:id alpha"))
+    service.frame = dataset(200)
+    check(view, service, "sort:id alpha1")
+    assert view.row_count == fresh(service, parse_query("sort:id alpha1")).rows.height
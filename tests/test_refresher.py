@@ -0,0 +1,90 @@
+import asyncio
+
+from pytools.services.diff import DataDiff
+from pytools.services.refresher import AutoRefresher
+
+
+def run_refreshes(count: int, **options):
+    calls = []
+
+    async def refresh(full: bool) -> DataDiff:
+        calls.append(full)
+        return DataDiff()
+
+    async def main():
+        refresher = AutoRefresher(
+            refresh, lambda diff: None, interval=0.001, backoff=1.0, **options
+        )
+        refresher.start()
+        while len(calls) < count:
+            await asyncio.sleep(0.001)
+        await refresher.stop()
+        return refresher
+
+    refresher = asyncio.run(main())
+    return calls[:count], refresher
+
+
+def test_every_nth_refresh_is_full():
+    calls, refresher = run_refreshes(9, full_every=3)
+    assert calls == [False, False, True] * 3
+    assert refresher.stats.full >= 3
+
+
+def test_requested_full_refresh_restarts_the_count():
+    calls = []
+
+    async def main():
+        async def refresh(full: bool) -> DataDiff:
+            calls.append(full)
+            if len(calls) == 1:
+                refresher.trigger(full=True)
+            return DataDiff()
+
+        refresher = AutoRefresher(
+            refresh, lambda diff: None, interval=0.001, backoff=1.0, full_every=3
+        )
+        refresher.start()
+        while len(calls) < 5:
+            await asyncio.sleep(0.001)
+        await refresher.stop()
+
+    asyncio.run(main())
+    assert calls[:5] == [False, True, False, False, True]
+
+
+def test_no_full_refresh_by_default():
+    calls, _ = run_refreshes(6)
+    assert not any(calls)
+
+
+def test_failing_callbacks_do_not_stop_the_loop():
+    calls = []
+
+    async def refresh(full: bool) -> DataDiff:
+        calls.append(full)
+        if len(calls) % 2:
+            raise ConnectionError("source down")
+        return DataDiff()
+
+    def on_result(diff: DataDiff) -> None:
+        raise RuntimeError("screen is switching")
+
+    def on_error(error: Exception) -> None:
+        raise RuntimeError("cannot notify")
+
+    async def main():
+        refresher = AutoRefresher(
+            refresh, on_result, interval=0.001, backoff=1.0, on_error=on_error
+        )
+        refresher.start()
+        async with asyncio.timeout(5):
+            while len(calls) < 6:
+                await asyncio.sleep(0.001)
+        assert not refresher._task.done()
+        await refresher.stop()
+        return refresher
+
+    refresher = asyncio.run(main())
+    assert refresher.stats.runs >= 2
+    assert refresher.stats.errors >= 3
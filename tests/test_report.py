@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from click.testing import CliRunner
+
+from pytools.cli import cli
+from pytools.services.report import (
+    generate_report,
+    render_report,
+    shutdown_executor,
+)
+from pytools.services.schema import frame_from_records
+
+
+def test_split_puts_null_values_in_their_own_section(tmp_path):
+    frame = frame_from_records(
+        [
+            {"id": 1, "name": "a", "status": "active", "updated": "2024-01-01"},
+            {"id": 2, "name": "b", "status": None, "updated": "2024-01-01"},
+            {"id": 3, "name": "c", "status": "inactive", "updated": "2024-01-01"},
+        ]
+    )
+    try:
+        paths = asyncio.run(
+            generate_report(frame, tmp_path / "report.pdf", split_by="status")
+        )
+    finally:
+        shutdown_executor()
+    assert sorted(path.name for path in paths) == [
+        "report-active.pdf",
+        "report-inactive.pdf",
+        "report-none.pdf",
+    ]
+    assert all(path.stat().st_size > 0 for path in paths)
+
+
+def records(statuses):
+    return frame_from_records(
+        [
+            {"id": i, "name": f"n{i}", "status": status, "updated": "2024-01-01"}
+            for i, status in enumerate(statuses, 1)
+        ]
+    )
+
+
+def run_report(frame, output, **options):
+    try:
+        return asyncio.run(generate_report(frame, output, **options))
+    finally:
+        shutdown_executor()
+
+
+def test_sections_with_the_same_file_name_get_distinct_paths(tmp_path):
+    frame = records([None, "none", "a/b", "a_b", "A_B"])
+    paths = run_report(frame, tmp_path / "report.pdf", split_by="status")
+    assert [path.name for path in paths] == [
+        "report-A_B.pdf",
+        "report-a_b-2.pdf",
+        "report-a_b-3.pdf",
+        "report-none.pdf",
+        "report-none-2.pdf",
+    ]
+    assert all(path.exists() for path in paths)
+
+
+def test_large_reports_are_split_into_parts(tmp_path):
+    frame = records(["active"] * 5 + ["inactive"])
+    paths = run_report(frame, tmp_path / "report.pdf", part_rows=2)
+    assert [path.name for path in paths] == [
+        "report-part1.pdf",
+        "report-part2.pdf",
+        "report-part3.pdf",
+    ]
+    paths = run_report(frame, tmp_path / "report.pdf", split_by="status", part_rows=4)
+    assert [path.name for path in paths] == [
+        "report-active-part1.pdf",
+        "report-active-part2.pdf",
+        "report-inactive.pdf",
+    ]
+
+
+def test_render_reads_only_its_range_in_chunks(tmp_path):
+    source = tmp_path / "data.arrow"
+    records(["active"] * 10).write_ipc(source)
+    output = tmp_path / "out.pdf"
+    assert render_report(source, output, "t", chunk_size=3, rows=(2, 7)) == 7
+    assert render_report(source, output, "t", chunk_size=3) == 10
+    assert output.stat().st_size > 0
+
+
+def test_unknown_split_column_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Cannot split by"):
+        asyncio.run(
+            generate_report(
+                frame_from_records([]), tmp_path / "r.pdf", split_by="colour"
+            )
+        )
+
+
+def test_cli_rejects_unknown_split_column():
+    result = CliRunner().invoke(cli, ["report", "--split-by", "colour"])
+    assert result.exit_code == 2
+    assert "--split-by" in result.output
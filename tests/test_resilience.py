@@ -0,0 +1,310 @@
+import asyncio
+import random
+
+import pytest
+
+from pytools.config.settings import APISettings, CacheSettings
+from pytools.services.cache import ResponseCache
+from pytools.services.http import HttpPool
+from pytools.services.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    Resilience,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def retry_all(error: Exception) -> bool:
+    return True
+
+
+def api(**overrides) -> APISettings:
+    defaults = dict(
+        retries=3,
+        retry_backoff=0.0,
+        hedge=False,
+        breaker_threshold=3,
+        breaker_reset=10.0,
+        multiplexed=False,
+        timeout=5,
+    )
+    return APISettings(**{**defaults, **overrides})
+
+
+def test_backoff_stays_within_full_jitter_bounds():
+    resilience = Resilience(
+        api(retry_backoff=0.2, retry_max_backoff=1.0), retry_all, rng=random.Random(7)
+    )
+    for retry in range(8):
+        cap = min(1.0, 0.2 * 2**retry)
+        delays = [resilience.backoff(retry) for _ in range(200)]
+        assert all(0 <= delay <= cap for delay in delays)
+        # Full jitter spreads over the whole range, not just near the cap
+        assert min(delays) < cap / 4 and max(delays) > cap * 3 / 4
+
+
+def test_breaker_opens_after_threshold_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=3, reset_timeout=10.0, clock=clock)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(10.0)
+
+
+def test_breaker_half_open_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    clock.advance(10.0)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+
+
+def test_breaker_failed_probe_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=10.0, clock=clock)
+    breaker.record_failure()
+    clock.advance(10.0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.trips == 2
+    clock.advance(5.0)
+    assert not breaker.allow()
+
+
+def test_abandoned_probe_frees_the_half_open_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=1.0, clock=clock)
+    breaker.record_failure()
+    clock.advance(1.0)
+    assert breaker.allow()
+    breaker.abandon()
+    assert breaker.allow()
+
+
+def test_call_retries_retryable_errors():
+    resilience = Resilience(api(), lambda e: isinstance(e, ConnectionError))
+    attempts = []
+
+    async def attempt():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("flaky")
+        return "ok"
+
+    assert asyncio.run(resilience.call("ep", attempt)) == "ok"
+    assert len(attempts) == 3
+    assert resilience.stats.retries == 2
+    assert resilience.breaker("ep").state == CLOSED
+
+
+def test_call_does_not_retry_other_errors():
+    resilience = Resilience(api(), lambda e: isinstance(e, ConnectionError))
+    attempts = []
+
+    async def attempt():
+        attempts.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(resilience.call("ep", attempt))
+    assert len(attempts) == 1
+    assert resilience.breaker("ep").failures == 0
+
+
+def test_call_fails_fast_while_open():
+    clock = FakeClock()
+    resilience = Resilience(api(retries=0, breaker_threshold=1), retry_all, clock=clock)
+
+    async def fail():
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(resilience.call("ep", fail))
+    with pytest.raises(CircuitOpenError) as raised:
+        asyncio.run(resilience.call("ep", fail))
+    assert raised.value.retry_in == pytest.approx(10.0)
+    assert resilience.stats.rejected == 1
+
+
+def seed_latency(resilience: Resilience, seconds: float) -> None:
+    async def fast():
+        await asyncio.sleep(seconds)
+        return "warm"
+
+    async def warm():
+        for _ in range(resilience.api.hedge_min_samples):
+            await resilience.call("ep", fast)
+
+    asyncio.run(warm())
+
+
+def test_no_hedge_until_enough_samples():
+    resilience = Resilience(api(hedge=True, hedge_min_samples=5), retry_all)
+    assert resilience.hedge_delay("ep") is None
+    seed_latency(resilience, 0.0)
+    assert resilience.hedge_delay("ep") is not None
+
+
+def test_hedge_wins_when_primary_is_slow():
+    resilience = Resilience(
+        api(hedge=True, hedge_quantile=0.5, hedge_min_samples=5), retry_all
+    )
+    seed_latency(resilience, 0.01)
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        number = len(calls)
+        await asyncio.sleep(1.0 if number == 1 else 0.01)
+        return number
+
+    assert asyncio.run(resilience.call("ep", attempt)) == 2
+    assert resilience.stats.hedges == 1
+    assert resilience.stats.hedges_won == 1
+
+
+def test_hedge_loses_when_primary_finishes_first():
+    resilience = Resilience(
+        api(hedge=True, hedge_quantile=0.5, hedge_min_samples=5), retry_all
+    )
+    seed_latency(resilience, 0.01)
+    calls = []
+
+    async def attempt():
+        calls.append(1)
+        number = len(calls)
+        await asyncio.sleep(0.05 if number == 1 else 1.0)
+        return number
+
+    assert asyncio.run(resilience.call("ep", attempt)) == 1
+    assert resilience.stats.hedges == 1
+    assert resilience.stats.hedges_won == 0
+
+
+def run_pool(pool: HttpPool, work):
+    async def main():
+        try:
+            return await work(pool)
+        finally:
+            await pool.close()
+
+    return asyncio.run(main())
+
+
+def test_server_errors_and_resets_are_retried(fault_server):
+    fault_server.faults = [503, "reset", 500]
+    pool = HttpPool(api(base_url=fault_server.url, breaker_threshold=5))
+    page = run_pool(pool, lambda p: p.get_json("/records", {"offset": 0, "limit": 5}))
+    assert len(page["items"]) == 5
+    assert fault_server.hits == 4
+    assert pool.resilience.stats.retries == 3
+
+
+def test_gives_up_after_the_last_retry(fault_server):
+    fault_server.faults = [503] * 10
+    pool = HttpPool(api(base_url=fault_server.url, retries=2, breaker_threshold=10))
+    with pytest.raises(Exception) as raised:
+        run_pool(pool, lambda p: p.get_json("/records"))
+    assert not isinstance(raised.value, CircuitOpenError)
+    assert fault_server.hits == 3
+
+
+def test_client_errors_are_not_retried(fault_server):
+    fault_server.faults = [404]
+    pool = HttpPool(api(base_url=fault_server.url))
+    with pytest.raises(Exception):
+        run_pool(pool, lambda p: p.get_json("/records"))
+    assert fault_server.hits == 1
+
+
+def test_open_breaker_serves_stale_cache(fault_server, tmp_path):
+    cache = ResponseCache(CacheSettings(memory_ttl=0.0), tmp_path)
+    pool = HttpPool(
+        api(base_url=fault_server.url, retries=0, breaker_threshold=1), cache
+    )
+    params = {"offset": 0, "limit": 5}
+
+    async def work(pool: HttpPool):
+        fresh = await pool.get_json("/records", params)
+        fault_server.faults = [503] * 10
+        # The failure trips the breaker, so the cached copy is served
+        stale = await pool.get_json("/records", params)
+        hits = fault_server.hits
+        again = await pool.get_json("/records", params)
+        assert fault_server.hits == hits  # failed fast, no request sent
+        with pytest.raises(CircuitOpenError):
+            await pool.get_json("/records", {"offset": 50, "limit": 5})
+        return fresh, stale, again
+
+    fresh, stale, again = run_pool(pool, work)
+    assert fresh == stale == again
+    assert pool.resilience.stats.stale_served == 2
+
+
+def test_delayed_answer_is_hedged(fault_server):
+    pool = HttpPool(
+        api(
+            base_url=fault_server.url,
+            hedge=True,
+            hedge_quantile=0.5,
+            hedge_min_samples=5,
+        )
+    )
+
+    async def work(pool: HttpPool):
+        for offset in range(5):
+            await pool.get_json("/records", {"offset": offset, "limit": 1})
+        fault_server.faults = [("delay", 2.0)]
+        return await pool.get_json("/records", {"offset": 9, "limit": 1})
+
+    page = run_pool(pool, work)
+    assert page["items"][0]["id"] == 10
+    assert pool.resilience.stats.hedges_won == 1
+
+
+def test_breaker_recovers_once_the_server_does(fault_server):
+    pool = HttpPool(api(base_url=fault_server.url, retries=0, breaker_threshold=2))
+    clock = FakeClock()
+    pool.resilience.clock = clock
+    url = pool.url("/records")
+
+    async def work(pool: HttpPool):
+        fault_server.faults = [503, 503]
+        for _ in range(2):
+            with pytest.raises(Exception):
+                await pool.get_json("/records")
+        assert pool.resilience.breaker(url).state == OPEN
+        with pytest.raises(CircuitOpenError):
+            await pool.get_json("/records")
+        clock.advance(10.0)
+        assert pool.resilience.breaker(url).state == HALF_OPEN
+        return await pool.get_json("/records")
+
+    page = run_pool(pool, work)
+    assert page["total"] == 250
+    assert pool.resilience.breaker(url).state == CLOSED
+    assert fault_server.hits == 3
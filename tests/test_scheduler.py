@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from pytools.services.scheduler import CommandScheduler, JobState, Priority
+
+
+class StubService:
+    """Records commands and holds them until released"""
+
+    def __init__(self) -> None:
+        self.ran = []
+        self.release = asyncio.Event()
+
+    async def execute_command(self, command: str) -> str:
+        self.ran.append(command)
+        await self.release.wait()
+        return command
+
+
+def run(work):
+    return asyncio.run(work())
+
+
+def test_idempotent_commands_are_shared():
+    async def work():
+        scheduler = CommandScheduler(StubService(), workers=1)
+        assert scheduler.submit("refresh") is scheduler.submit("refresh")
+        assert scheduler.submit("summary") is scheduler.submit("summary")
+        assert scheduler.status.queued == 2
+
+    run(work)
+
+
+def test_mutating_commands_are_not_deduplicated():
+    async def work():
+        service = StubService()
+        scheduler = CommandScheduler(service, workers=1)
+        scheduler.start()
+        first = scheduler.submit("add alice")
+        second = scheduler.submit("add alice")
+        assert first is not second
+        service.release.set()
+        while not (first.finished and second.finished):
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        return service.ran
+
+    assert run(work) == ["add alice", "add alice"]
+
+
+def test_cancelled_jobs_free_their_queue_slot():
+    async def work():
+        scheduler = CommandScheduler(StubService(), workers=1, max_queue=2)
+        first = scheduler.submit("add a")
+        scheduler.submit("add b")
+        with pytest.raises(asyncio.QueueFull):
+            scheduler.submit("add c")
+        assert scheduler.cancel(first)
+        assert first.state == JobState.CANCELLED
+        third = scheduler.submit("add c")
+        assert scheduler.status.queued == 2
+        return third
+
+    assert run(work).state == JobState.QUEUED
+
+
+def test_cancelled_jobs_do_not_pile_up_in_the_queue():
+    async def work():
+        scheduler = CommandScheduler(StubService(), workers=1, max_queue=3)
+        for i in range(50):
+            scheduler.cancel(scheduler.submit(f"add {i}"))
+        return scheduler._queue.qsize()
+
+    assert run(work) <= 6
+
+
+def test_cancelled_job_is_skipped_by_workers():
+    async def work():
+        service = StubService()
+        service.release.set()
+        scheduler = CommandScheduler(service, workers=1)
+        scheduler.cancel(scheduler.submit("add skipped"))
+        done = scheduler.submit("add kept")
+        scheduler.start()
+        while not done.finished:
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+        return service.ran
+
+    assert run(work) == ["add kept"]
+
+
+class TimedService:
+    """Logs when each command starts and ends; `add slow` takes longer"""
+
+    def __init__(self) -> None:
+        self.log = []
+
+    async def execute_command(self, command: str) -> str:
+        self.log.append(("start", command))
+        await asyncio.sleep(0.05 if "slow" in command else 0.001)
+        self.log.append(("end", command))
+        return command
+
+
+def run_all(service, commands, workers=4):
+    async def work():
+        scheduler = CommandScheduler(service, workers=workers)
+        scheduler.start()
+        jobs = [scheduler.submit(command) for command in commands]
+        while not all(job.finished for job in jobs):
+            await asyncio.sleep(0.005)
+        await scheduler.stop()
+        return jobs
+
+    return run(work)
+
+
+def test_mutations_run_one_at_a_time_in_order():
+    service = TimedService()
+    run_all(service, ["add slow", "add b", "delete 1", "add c"])
+    assert service.log == [
+        (event, command)
+        for command in ["add slow", "add b", "delete 1", "add c"]
+        for event in ("start", "end")
+    ]
+
+
+def test_refresh_does_not_overtake_a_queued_mutation():
+    service = TimedService()
+    run_all(service, ["summary", "add slow", "refresh", "summary"])
+    log = service.log
+    # The reads submitted after the mutation start once it has ended
+    assert log.index(("start", "refresh")) > log.index(("end", "add slow"))
+    starts = [command for event, command in log if event == "start"]
+    assert starts.count("summary") == 2
+
+
+def test_refresh_still_jumps_ahead_of_reads():
+    async def work():
+        service = StubService()
+        scheduler = CommandScheduler(service, workers=1)
+        scheduler.submit("summary")
+        scheduler.submit("cache")
+        scheduler.submit("refresh")
+        service.release.set()
+        scheduler.start()
+        while scheduler.jobs:
+            await asyncio.sleep(0.005)
+        await scheduler.stop()
+        return service.ran
+
+    assert run(work) == ["refresh", "summary", "cache"]
+
+
+def test_mutations_ignore_priority():
+    async def work():
+        scheduler = CommandScheduler(StubService(), workers=1)
+        return scheduler.submit("add a", Priority.HIGH).priority
+
+    assert run(work) == Priority.NORMAL
@@ -0,0 +1,46 @@
+from pytools.services.store import LocalStore
+
+
+def reopen(store: LocalStore) -> LocalStore:
+    store.close()
+    return LocalStore(store.directory).open()
+
+
+def added_id(store: LocalStore, name: str) -> int:
+    return store.add(name).inserted.row(0, named=True)["id"]
+
+
+def test_add_delete_and_reopen(tmp_path):
+    store = LocalStore(tmp_path).open()
+    assert [added_id(store, n) for n in "abc"] == [1, 2, 3]
+    store.delete([2])
+    store = reopen(store)
+    assert store.frame.get_column("name").to_list() == ["a", "c"]
+    store.close()
+
+
+def test_ids_are_not_reused_after_clear(tmp_path):
+    store = LocalStore(tmp_path).open()
+    for name in "abc":
+        store.add(name)
+    assert store.clear().deleted.height == 3
+    assert added_id(store, "d") == 4
+    store.clear()
+    store = reopen(store)
+    assert added_id(store, "e") == 5
+    store.close()
+
+
+def test_ids_are_not_reused_after_compaction(tmp_path):
+    store = LocalStore(tmp_path).open()
+    for name in "abc":
+        store.add(name)
+    store.delete([3])
+    store.compact()
+    assert added_id(store, "d") == 4
+    store.clear()
+    store.compact()
+    store = reopen(store)
+    assert len(store) == 0
+    assert added_id(store, "e") == 5
+    store.close()
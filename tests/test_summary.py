@@ -0,0 +1,82 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from pytools.services.diff import diff_frames
+from pytools.services.schema import frame_from_records
+from pytools.services.summary import DataSummary
+
+STATUSES = ["active", "inactive", "pending", None]
+
+
+def record(rng: random.Random, i: int):
+    return {
+        "id": i,
+        "name": f"n{i}",
+        "status": rng.choice(STATUSES),
+        "updated": rng.choice(
+            [None, *(date(2024, 3, 1) + timedelta(days=d) for d in range(5))]
+        ),
+    }
+
+
+def dataset(rng: random.Random, ids):
+    return frame_from_records([record(rng, i) for i in ids])
+
+
+def assert_same(summary: DataSummary, expected: DataSummary) -> None:
+    assert summary.total == expected.total
+    assert summary.by_status == expected.by_status
+    assert summary.by_date == expected.by_date
+    assert summary.as_dict() == expected.as_dict()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_apply_matches_a_full_recount(seed):
+    rng = random.Random(seed)
+    old_records = [record(rng, i) for i in range(1, 201)]
+    # Every third row is kept, the rest re-rolled (including to and from
+    # null); every seventh is deleted and ids past 200 are new
+    new_records = [
+        old_records[i - 1] if i <= 200 and i % 3 == 0 else record(rng, i)
+        for i in range(1, 261)
+        if i % 7
+    ]
+    old, new = frame_from_records(old_records), frame_from_records(new_records)
+    summary = DataSummary.from_frame(old)
+    summary.apply(diff_frames(old, new))
+    assert_same(summary, DataSummary.from_frame(new))
+
+
+def test_apply_to_and_from_an_empty_dataset():
+    rng = random.Random(9)
+    frame = dataset(rng, range(1, 50))
+    empty = frame.clear()
+    summary = DataSummary.from_frame(empty)
+    summary.apply(diff_frames(empty, frame))
+    assert_same(summary, DataSummary.from_frame(frame))
+    summary.apply(diff_frames(frame, empty))
+    assert_same(summary, DataSummary.from_frame(empty))
+    assert summary.by_status == {} and summary.latest is None
+
+
+def test_null_status_and_date_are_counted():
+    frame = frame_from_records(
+        [
+            {"id": 1, "name": "a", "status": None, "updated": None},
+            {"id": 2, "name": "b", "status": "active", "updated": date(2024, 1, 2)},
+        ]
+    )
+    changed = frame_from_records(
+        [
+            {"id": 1, "name": "a", "status": "active", "updated": date(2024, 1, 3)},
+            {"id": 2, "name": "b", "status": None, "updated": None},
+        ]
+    )
+    summary = DataSummary.from_frame(frame)
+    assert summary.by_status == {None: 1, "active": 1}
+    summary.apply(diff_frames(frame, changed))
+    assert summary.by_status == {None: 1, "active": 1}
+    assert summary.by_date == {None: 1, date(2024, 1, 3): 1}
+    assert_same(summary, DataSummary.from_frame(changed))
@@ -0,0 +1,64 @@
+import asyncio
+
+import polars as pl
+from textual.app import App
+
+from pytools.services.diff import DataDiff
+from pytools.services.schema import COLUMNS, frame_from_records, to_display
+from pytools.widgets.table import PagedDataTable
+
+
+class FrameSource:
+    def __init__(self, frame: pl.DataFrame):
+        self.frame = frame
+
+    @property
+    def row_count(self) -> int:
+        return self.frame.height
+
+    def display_rows(self, offset=0, length=None):
+        return to_display(self.frame.slice(offset, length)).iter_rows()
+
+
+def records(ids):
+    return frame_from_records(
+        {"id": i, "name": f"n{i}", "status": "active", "updated": "2024-01-01"}
+        for i in ids
+    )
+
+
+def run_table(source, work):
+    class TableApp(App):
+        def compose(self):
+            yield PagedDataTable(source, page_size=10, prefetch=5)
+
+    async def main():
+        app = TableApp()
+        async with app.run_test() as pilot:
+            table = app.query_one(PagedDataTable)
+            for name in COLUMNS:
+                table.add_column(name, key=name)
+            table.reset()
+            await pilot.pause()
+            return work(table)
+
+    return asyncio.run(main())
+
+
+def test_null_and_repeated_ids_do_not_collide():
+    source = FrameSource(records([1, None, 2, None, 2, 3]))
+    assert run_table(source, lambda table: table.row_count) == 6
+
+
+def test_diff_updates_and_deletes_keyed_rows():
+    source = FrameSource(records([1, None, 2]))
+
+    def work(table):
+        changed = records([2]).with_columns(name=pl.lit("renamed"))
+        source.frame = records([None, 2]).with_columns(
+            name=pl.when(pl.col("id") == 2).then(pl.lit("renamed"))
+        )
+        table.apply_diff(DataDiff(updated=changed, deleted=records([1])))
+        return table.row_count, table.get_cell("2", "name")
+
+    assert run_table(source, work) == (2, "renamed")